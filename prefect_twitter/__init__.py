@@ -1,4 +1,4 @@
 from . import _version
-from .credentials import TwitterCredentials  # noqa
+from .credentials import TwitterCredentials, TwitterCredentialsPool  # noqa
 
 __version__ = _version.get_versions()["version"]
@@ -0,0 +1,551 @@
+"""An asyncio-native transport for the Twitter API v1.1 endpoints used by the tasks"""
+
+import io
+import mimetypes
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlencode
+
+import anyio
+import httpx
+import requests
+from anyio import to_thread
+from oauthlib.oauth1 import Client as OAuth1Client
+from requests.structures import CaseInsensitiveDict
+from tweepy.errors import (
+    BadRequest,
+    Forbidden,
+    HTTPException,
+    NotFound,
+    TooManyRequests,
+    TweepyException,
+    TwitterServerError,
+    Unauthorized,
+)
+
+if TYPE_CHECKING:
+    from io import IOBase
+    from pathlib import Path
+
+    from tweepy import API, Media, Status
+    from tweepy.parsers import Parser
+
+_FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+SUPPORTED_METHODS = frozenset(
+    {
+        "update_status",
+        "get_status",
+        "lookup_statuses",
+        "user_timeline",
+        "home_timeline",
+        "mentions_timeline",
+        "get_media_upload_status",
+        "media_upload",
+        "chunked_upload_init",
+        "chunked_upload_append",
+        "chunked_upload_finalize",
+    }
+)
+
+
+class _BufferReader(io.RawIOBase):
+    """
+    A file object over a buffer such as a `memoryview` segment, which httpx
+    streams in small pieces instead of copying the whole buffer to bytes.
+    """
+
+    def __init__(self, buffer: Any):
+        self._buffer = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        """
+        Reports that the buffer can be read.
+        """
+        return True
+
+    def seekable(self) -> bool:
+        """
+        Reports that the buffer can be read again from any position, e.g. when
+        a request is retried.
+        """
+        return True
+
+    def readinto(self, b: Any) -> int:
+        """
+        Copies the next bytes of the buffer into `b`, returning their number.
+        """
+        size = max(min(len(b), len(self._buffer) - self._position), 0)
+        b[:size] = self._buffer[self._position : self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Moves the read position, returning the new position.
+        """
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._position}.get(
+            whence, len(self._buffer)
+        )
+        self._position = base + offset
+        return self._position
+
+    def tell(self) -> int:
+        """
+        Gets the read position.
+        """
+        return self._position
+
+
+def _to_requests_response(response: httpx.Response) -> requests.Response:
+    """
+    Converts an httpx response into the requests response that tweepy's
+    exceptions and parsers expect.
+    """
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.reason = response.reason_phrase
+    converted.url = str(response.url)
+    converted.encoding = response.encoding
+    converted._content = response.content
+    return converted
+
+
+def _raise_for_status(response: requests.Response) -> None:
+    """
+    Raises the same tweepy exception `tweepy.API` raises for an error status.
+    """
+    status_code = response.status_code
+    if 200 <= status_code < 300:
+        return
+    if status_code == 400:
+        raise BadRequest(response)
+    if status_code == 401:
+        raise Unauthorized(response)
+    if status_code == 403:
+        raise Forbidden(response)
+    if status_code == 404:
+        raise NotFound(response)
+    if status_code == 429:
+        reset_time = response.headers.get("x-rate-limit-reset")
+        raise TooManyRequests(
+            response, reset_time=int(reset_time) if reset_time else None
+        )
+    if status_code >= 500:
+        raise TwitterServerError(response)
+    raise HTTPException(response)
+
+
+class AsyncTwitterClient:
+    """
+    Calls the Twitter API v1.1 on the running event loop with httpx, signing
+    each request with OAuth1, instead of running `tweepy.API` in a worker
+    thread. Method names and return values mirror `tweepy.API`, and
+    responses are parsed with the parser of the wrapped API.
+
+    Args:
+        api: The authenticated Tweepy API whose hosts and parser are used.
+        oauth_client: The OAuth1 client used to sign requests in user context.
+        bearer_token: The bearer token used instead of `oauth_client` for
+            app-only authentication.
+        limits: The connection pool limits of the underlying httpx client.
+        timeout: The timeouts of the underlying httpx client.
+        transport: An optional httpx transport, e.g. for testing.
+        on_response: An optional callable invoked with every response, e.g. to
+            track rate limits.
+    """
+
+    def __init__(
+        self,
+        api: "API",
+        oauth_client: Optional[OAuth1Client] = None,
+        bearer_token: Optional[str] = None,
+        limits: Optional[httpx.Limits] = None,
+        timeout: Optional[httpx.Timeout] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        on_response: Optional[Callable[[requests.Response], None]] = None,
+    ):
+        self.api = api
+        if (oauth_client is None) == (bearer_token is None):
+            raise ValueError("Exactly one of oauth_client or bearer_token is required")
+        self._oauth_client = oauth_client
+        self._bearer_token = bearer_token
+        self._on_response = on_response
+        self._client = httpx.AsyncClient(
+            limits=limits or httpx.Limits(),
+            timeout=timeout or httpx.Timeout(60, pool=None),
+            transport=transport,
+            headers={"User-Agent": api.user_agent},
+        )
+
+    @staticmethod
+    def supports(method: str) -> bool:
+        """
+        Checks whether a `tweepy.API` method is implemented by this client.
+
+        Args:
+            method: The name of the `tweepy.API` method.
+
+        Returns:
+            Whether the method can be called on this client.
+        """
+        return method in SUPPORTED_METHODS
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        data: Optional[Dict[str, Any]] = None,
+        files: Optional[Dict[str, Any]] = None,
+        upload_api: bool = False,
+        payload_type: Optional[str] = None,
+        payload_list: bool = False,
+        parser: Optional["Parser"] = None,
+    ) -> Any:
+        """
+        Sends a signed request to a v1.1 endpoint and parses the response.
+
+        Args:
+            method: The HTTP method.
+            endpoint: The endpoint path, e.g. `statuses/show`.
+            params: Query parameters; `None` values are dropped.
+            data: Form fields for the request body.
+            files: Multipart files for the request body.
+            upload_api: Whether to send the request to the upload host.
+            payload_type: The tweepy model type of the payload.
+            payload_list: Whether the payload is a list of models.
+            parser: The parser to use instead of the API's parser.
+
+        Returns:
+            The parsed payload.
+        """
+        host = self.api.upload_host if upload_api else self.api.host
+        query = {k: str(v) for k, v in (params or {}).items() if v is not None}
+        url = f"https://{host}/1.1/{endpoint}.json"
+        if query:
+            url = f"{url}?{urlencode(query)}"
+
+        body = None
+        headers = {}
+        if data and not files:
+            body = urlencode({k: str(v) for k, v in data.items()})
+            headers["Content-Type"] = _FORM_CONTENT_TYPE
+        if self._bearer_token is not None:
+            headers["Authorization"] = f"Bearer {self._bearer_token}"
+        else:
+            # multipart bodies are not part of the OAuth1 signature base string
+            url, headers, _ = self._oauth_client.sign(
+                url, http_method=method, body=body, headers=headers
+            )
+
+        try:
+            if files:
+                data = {k: str(v) for k, v in (data or {}).items()}
+                response = await self._client.request(
+                    method, url, headers=headers, data=data, files=files
+                )
+            else:
+                response = await self._client.request(
+                    method, url, headers=headers, content=body
+                )
+        except httpx.TransportError as exc:
+            raise TweepyException(f"Failed to send request: {exc}") from exc
+
+        response = _to_requests_response(response)
+        if self._on_response is not None:
+            self._on_response(response)
+        _raise_for_status(response)
+        if not payload_type:
+            return None
+        parser = parser or self.api.parser
+        # tweepy's parsers decode bytes as well, which skips a text decode
+        return parser.parse(
+            response.content,
+            api=self.api,
+            payload_list=payload_list,
+            payload_type=payload_type,
+        )
+
+    async def update_status(
+        self, status: Optional[str] = None, **kwargs: Any
+    ) -> "Status":
+        """
+        Async counterpart of `tweepy.API.update_status`.
+        """
+        if "media_ids" in kwargs and kwargs["media_ids"]:
+            kwargs["media_ids"] = ",".join(map(str, kwargs["media_ids"]))
+        return await self.request(
+            "POST",
+            "statuses/update",
+            params=dict(status=status, **kwargs),
+            payload_type="status",
+        )
+
+    async def get_status(
+        self, id: Union[int, str], *, parser: Optional["Parser"] = None, **kwargs: Any
+    ) -> "Status":
+        """
+        Async counterpart of `tweepy.API.get_status`.
+        """
+        return await self.request(
+            "GET",
+            "statuses/show",
+            params=dict(id=id, **kwargs),
+            payload_type="status",
+            parser=parser,
+        )
+
+    async def lookup_statuses(
+        self,
+        id: List[Union[int, str]],
+        *,
+        parser: Optional["Parser"] = None,
+        **kwargs: Any,
+    ) -> List["Status"]:
+        """
+        Async counterpart of `tweepy.API.lookup_statuses`.
+        """
+        return await self.request(
+            "GET",
+            "statuses/lookup",
+            params=dict(id=",".join(map(str, id)), **kwargs),
+            payload_type="status",
+            payload_list=True,
+            parser=parser,
+        )
+
+    async def user_timeline(
+        self, *, parser: Optional["Parser"] = None, **kwargs: Any
+    ) -> List["Status"]:
+        """
+        Async counterpart of `tweepy.API.user_timeline`.
+        """
+        return await self._get_timeline("statuses/user_timeline", parser, **kwargs)
+
+    async def home_timeline(
+        self, *, parser: Optional["Parser"] = None, **kwargs: Any
+    ) -> List["Status"]:
+        """
+        Async counterpart of `tweepy.API.home_timeline`.
+        """
+        return await self._get_timeline("statuses/home_timeline", parser, **kwargs)
+
+    async def mentions_timeline(
+        self, *, parser: Optional["Parser"] = None, **kwargs: Any
+    ) -> List["Status"]:
+        """
+        Async counterpart of `tweepy.API.mentions_timeline`.
+        """
+        return await self._get_timeline("statuses/mentions_timeline", parser, **kwargs)
+
+    async def _get_timeline(
+        self, endpoint: str, parser: Optional["Parser"], **kwargs: Any
+    ) -> List["Status"]:
+        """
+        Gets a page of statuses from a timeline endpoint.
+        """
+        return await self.request(
+            "GET",
+            endpoint,
+            params=kwargs,
+            payload_type="status",
+            payload_list=True,
+            parser=parser,
+        )
+
+    async def get_media_upload_status(
+        self,
+        media_id: Union[int, str],
+        *,
+        parser: Optional["Parser"] = None,
+        **kwargs: Any,
+    ) -> "Media":
+        """
+        Async counterpart of `tweepy.API.get_media_upload_status`.
+        """
+        return await self.request(
+            "GET",
+            "media/upload",
+            params=dict(command="STATUS", media_id=media_id, **kwargs),
+            upload_api=True,
+            payload_type="media",
+            parser=parser,
+        )
+
+    async def media_upload(
+        self,
+        filename: Union["Path", str],
+        *,
+        file: Optional["IOBase"] = None,
+        chunked: bool = False,
+        media_category: Optional[str] = None,
+        additional_owners: Optional[List[Union[int, str]]] = None,
+        **kwargs: Any,
+    ) -> "Media":
+        """
+        Async counterpart of `tweepy.API.media_upload`; videos always use
+        chunked upload.
+        """
+        file_type = mimetypes.guess_type(str(filename))[0] or ""
+        content = await to_thread.run_sync(self._read, filename, file)
+        if chunked or file_type.startswith("video/"):
+            return await self._chunked_upload(
+                filename,
+                content,
+                file_type=file_type,
+                media_category=media_category,
+                additional_owners=additional_owners,
+                **kwargs,
+            )
+
+        data = {}
+        if media_category is not None:
+            data["media_category"] = media_category
+        if additional_owners is not None:
+            data["additional_owners"] = ",".join(map(str, additional_owners))
+        return await self.request(
+            "POST",
+            "media/upload",
+            params=kwargs,
+            data=data,
+            files={"media": (str(filename), content)},
+            upload_api=True,
+            payload_type="media",
+        )
+
+    async def _chunked_upload(
+        self,
+        filename: Union["Path", str],
+        content: bytes,
+        *,
+        file_type: str,
+        media_category: Optional[str] = None,
+        additional_owners: Optional[List[Union[int, str]]] = None,
+        chunk_size: int = 1024 * 1024,
+        wait_for_async_finalize: bool = True,
+        **kwargs: Any,
+    ) -> "Media":
+        """
+        Uploads media with INIT, sequential APPEND and FINALIZE commands, like
+        `tweepy.API.chunked_upload` but taking the bytes to upload.
+        """
+        media = await self.chunked_upload_init(
+            len(content),
+            file_type,
+            media_category=media_category,
+            additional_owners=additional_owners,
+            **kwargs,
+        )
+        chunk_size = max(min(chunk_size, 5 * 1024 * 1024), -(-len(content) // 1000))
+        for segment_index, start in enumerate(range(0, len(content), chunk_size)):
+            await self.chunked_upload_append(
+                media.media_id,
+                (str(filename), content[start : start + chunk_size]),
+                segment_index,
+                **kwargs,
+            )
+        media = await self.chunked_upload_finalize(media.media_id, **kwargs)
+        if wait_for_async_finalize:
+            media = await self._wait_for_processing(media, **kwargs)
+        return media
+
+    async def chunked_upload_init(
+        self,
+        total_bytes: int,
+        media_type: str,
+        *,
+        media_category: Optional[str] = None,
+        additional_owners: Optional[List[Union[int, str]]] = None,
+        **kwargs: Any,
+    ) -> "Media":
+        """
+        Async counterpart of `tweepy.API.chunked_upload_init`.
+        """
+        data = {"command": "INIT", "total_bytes": total_bytes, "media_type": media_type}
+        if media_category is not None:
+            data["media_category"] = media_category
+        if additional_owners is not None:
+            data["additional_owners"] = ",".join(map(str, additional_owners))
+        return await self.request(
+            "POST",
+            "media/upload",
+            params=kwargs,
+            data=data,
+            upload_api=True,
+            payload_type="media",
+        )
+
+    async def chunked_upload_append(
+        self,
+        media_id: Union[int, str],
+        media: Tuple[str, Union[bytes, memoryview]],
+        segment_index: int,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Async counterpart of `tweepy.API.chunked_upload_append`; the segment
+        may be a `memoryview`, which is streamed without copying it first.
+        """
+        filename, content = media
+        if isinstance(content, memoryview):
+            media = (filename, _BufferReader(content))
+        data = {
+            "command": "APPEND",
+            "media_id": media_id,
+            "segment_index": segment_index,
+        }
+        await self.request(
+            "POST",
+            "media/upload",
+            params=kwargs,
+            data=data,
+            files={"media": media},
+            upload_api=True,
+        )
+
+    async def chunked_upload_finalize(
+        self, media_id: Union[int, str], **kwargs: Any
+    ) -> "Media":
+        """
+        Async counterpart of `tweepy.API.chunked_upload_finalize`.
+        """
+        return await self.request(
+            "POST",
+            "media/upload",
+            params=kwargs,
+            data={"command": "FINALIZE", "media_id": media_id},
+            upload_api=True,
+            payload_type="media",
+        )
+
+    async def _wait_for_processing(self, media: "Media", **kwargs: Any) -> "Media":
+        """
+        Polls the upload status of finalized media until Twitter has finished
+        processing it.
+        """
+        while getattr(media, "processing_info", None) and (
+            media.processing_info["state"] in ("pending", "in_progress")
+            and "error" not in media.processing_info
+        ):
+            await anyio.sleep(media.processing_info["check_after_secs"])
+            media = await self.get_media_upload_status(media.media_id, **kwargs)
+        return media
+
+    async def aclose(self) -> None:
+        """
+        Closes the underlying connection pool.
+        """
+        await self._client.aclose()
+
+    @staticmethod
+    def _read(filename: Union["Path", str], file: Optional["IOBase"]) -> bytes:
+        """
+        Reads the media to upload from the file object or from disk.
+        """
+        if file is not None:
+            return file.read()
+        with open(filename, "rb") as fp:
+            return fp.read()
@@ -0,0 +1,236 @@
+"""Parallel backfills of timelines split into time slices by status ID"""
+
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Literal, Optional, Union
+
+from prefect import get_run_logger, task
+
+from prefect_twitter.concurrency import gather
+from prefect_twitter.parsers import get_payload_id
+from prefect_twitter.records import Tweet
+from prefect_twitter.snowflake import plan_id_shards
+from prefect_twitter.tweets import stream_timeline_pages
+
+if TYPE_CHECKING:
+    from tweepy import Status
+
+    from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+
+
+def merge_statuses(
+    shards: Iterable[Iterable[Union["Status", Dict[str, Any], Tweet]]],
+) -> List[Union["Status", Dict[str, Any], Tweet]]:
+    """
+    Merges the statuses read from several shards, dropping duplicates, e.g.
+    from a shard read twice after a retry.
+
+    Args:
+        shards: The statuses of each shard.
+
+    Returns:
+        The distinct statuses, oldest first.
+
+    Example:
+        Merges the results of mapped shard reads.
+        ```python
+        from prefect_twitter.backfill import merge_statuses
+
+        statuses = merge_statuses(shard_statuses)
+        ```
+    """
+    merged = {}
+    for statuses in shards:
+        for status in statuses:
+            merged.setdefault(get_payload_id(status), status)
+    return [merged[status_id] for status_id in sorted(merged)]
+
+
+async def _read_shard(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    timeline: str,
+    since_id: int,
+    max_id: int,
+    compact: bool,
+    **kwargs: Any,
+) -> List[Union["Status", Dict[str, Any], Tweet]]:
+    """
+    Reads every status of a timeline between two IDs.
+    """
+    statuses = []
+    async for page in stream_timeline_pages(
+        twitter_credentials, timeline, since_id=since_id, max_id=max_id, **kwargs
+    ):
+        if compact:
+            page = [Tweet.from_status(status) for status in page]
+        statuses.extend(page)
+    return statuses
+
+
+@task
+async def backfill_shard(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    since_id: int,
+    max_id: int,
+    timeline: Literal["user", "home", "mentions", "search"] = "search",
+    count: int = 100,
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    compact: bool = False,
+    **kwargs: dict,
+) -> List[Union["Status", Dict[str, Any], Tweet]]:
+    """
+    Reads one shard of a backfill planned with
+    `prefect_twitter.snowflake.plan_id_shards`, so that shards can be mapped
+    over tasks and workers and combined with `merge_statuses`.
+
+    Args:
+        twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` spreads the reads across credentials.
+        since_id: The exclusive lower bound of the shard's status IDs.
+        max_id: The inclusive upper bound of the shard's status IDs.
+        timeline: The timeline to read: `user`, `home`, `mentions` or `search`.
+        count: The number of statuses to request per page.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to return the decoded JSON of the statuses as dicts.
+        compact: Whether to return `Tweet` records of the statuses.
+        kwargs: Additional keyword arguments to pass to the timeline method,
+            e.g. `q` for searches.
+    Returns:
+        The statuses of the shard, newest first.
+
+    Example:
+        Backfills a day of search results on several workers.
+        ```python
+        from datetime import datetime
+        from prefect import flow
+        from prefect_twitter import TwitterCredentialsPool
+        from prefect_twitter.backfill import backfill_shard, merge_statuses
+        from prefect_twitter.snowflake import plan_id_shards
+
+        @flow
+        def example_backfill_shard_flow():
+            twitter_credentials_pool = TwitterCredentialsPool.load("BLOCK_NAME")
+            shards = plan_id_shards(datetime(2022, 3, 17), datetime(2022, 3, 18), 24)
+            results = backfill_shard.map(
+                twitter_credentials_pool,
+                [since_id for since_id, _ in shards],
+                [max_id for _, max_id in shards],
+                q="prefect",
+                compact=True,
+            )
+            return merge_statuses(result.result() for result in results)
+
+        example_backfill_shard_flow()
+        ```
+    """  # noqa
+    if raw and compact:
+        raise ValueError("Only one of raw or compact can be set")
+    return await _read_shard(
+        twitter_credentials,
+        timeline,
+        since_id,
+        max_id,
+        compact,
+        count=count,
+        max_retries=max_retries,
+        raw=raw or compact,
+        **kwargs,
+    )
+
+
+@task
+async def backfill_timeline(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    start: datetime,
+    end: datetime,
+    timeline: Literal["user", "home", "mentions", "search"] = "search",
+    shards: int = 8,
+    count: int = 100,
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    compact: bool = False,
+    **kwargs: dict,
+) -> List[Union["Status", Dict[str, Any], Tweet]]:
+    """
+    Reads the statuses of a timeline created in a time range. Since status
+    IDs embed their creation time, the range is split into `shards` ID
+    ranges that are paged through concurrently instead of following one
+    cursor chain, so the backfill is bounded by rate limits rather than by
+    round trips. With a `TwitterCredentialsPool`, each page is requested
+    with the credentials that have the most quota left.
+
+    Args:
+        twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` spreads the reads across credentials.
+        start: The start of the time range, inclusive; naive times are UTC.
+        end: The end of the time range, exclusive; naive times are UTC.
+        timeline: The timeline to read: `user`, `home`, `mentions` or `search`.
+        shards: The number of ID ranges read concurrently.
+        count: The number of statuses to request per page.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to return the decoded JSON of the statuses as dicts.
+        compact: Whether to return `Tweet` records of the statuses.
+        kwargs: Additional keyword arguments to pass to the timeline method,
+            e.g. `q` for searches or `user_id` for user timelines.
+    Returns:
+        The distinct statuses created in the range, oldest first.
+
+    Example:
+        Backfills a week of a user's timeline.
+        ```python
+        from datetime import datetime
+        from prefect import flow
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.backfill import backfill_timeline
+
+        @flow
+        def example_backfill_timeline_flow():
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            statuses = backfill_timeline(
+                twitter_credentials,
+                datetime(2022, 3, 10),
+                datetime(2022, 3, 17),
+                timeline="user",
+                screen_name="PrefectIO",
+                count=200,
+                compact=True,
+            )
+            return statuses
+
+        example_backfill_timeline_flow()
+        ```
+    """
+    if raw and compact:
+        raise ValueError("Only one of raw or compact can be set")
+
+    logger = get_run_logger()
+    id_ranges = plan_id_shards(start, end, shards)
+    logger.info(
+        "Backfilling %s from %s to %s in %s shards.",
+        timeline,
+        start,
+        end,
+        len(id_ranges),
+    )
+
+    results = await gather(
+        partial(
+            _read_shard,
+            twitter_credentials,
+            timeline,
+            since_id,
+            max_id,
+            compact,
+            count=count,
+            max_retries=max_retries,
+            raw=raw or compact,
+            **kwargs,
+        )
+        for since_id, max_id in id_ranges
+    )
+    statuses = merge_statuses(results)
+    logger.info("Backfilled %s statuses.", len(statuses))
+    return statuses
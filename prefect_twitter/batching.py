@@ -0,0 +1,163 @@
+"""Coalescing of concurrent single-status lookups into bulk requests"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Tuple
+
+from prefect_twitter.parsers import get_payload_id
+
+if TYPE_CHECKING:
+    from tweepy import Status
+
+# statuses/lookup ignores parameters other than these, so calls using any
+# other parameter are not batched
+BATCHABLE_KWARGS = frozenset(
+    {
+        "trim_user",
+        "include_entities",
+        "include_ext_alt_text",
+        "include_card_uri",
+        "max_retries",
+        "raw",
+    }
+)
+
+
+class StatusBatcher:
+    """
+    Collects `get_status` calls made concurrently on one event loop and sends
+    them as a single `lookup_statuses` request once `window` seconds have
+    passed or `max_size` IDs are waiting, whichever comes first. Each caller
+    gets back its own status. IDs missing from the bulk response are fetched
+    individually, so callers see the same errors `get_status` raises.
+    `TwitterCredentials` runs its batchers on the background loop of
+    `prefect_twitter.concurrency`, so calls from every task run share them.
+
+    Args:
+        lookup: Coroutine function looking up a list of IDs with keyword
+            arguments, e.g. `lookup_statuses`.
+        fallback: Coroutine function getting a single ID with keyword
+            arguments, e.g. `get_status`.
+        window: Seconds to wait for more calls to join a batch.
+        max_size: The maximum number of IDs in a batch.
+    """
+
+    def __init__(
+        self,
+        lookup: Callable[..., Awaitable[List["Status"]]],
+        fallback: Callable[..., Awaitable["Status"]],
+        window: float = 0.01,
+        max_size: int = 100,
+    ):
+        self._lookup = lookup
+        self._fallback = fallback
+        self.window = window
+        self.max_size = max_size
+        self._pending: Dict[Tuple, Dict[int, List[asyncio.Future]]] = {}
+        self._tasks = set()
+
+    @staticmethod
+    def can_batch(**kwargs: Any) -> bool:
+        """
+        Checks whether a `get_status` call with these keyword arguments can
+        be answered from a bulk lookup.
+
+        Args:
+            **kwargs: The keyword arguments of the `get_status` call.
+
+        Returns:
+            Whether the call can be batched.
+        """
+        return BATCHABLE_KWARGS.issuperset(kwargs)
+
+    async def get_status(self, status_id: int, **kwargs: Any) -> "Status":
+        """
+        Gets a status as part of the next batch.
+
+        Args:
+            status_id: The ID of the status.
+            **kwargs: Keyword arguments to pass to the lookup; only calls with
+                equal keyword arguments share a batch.
+
+        Returns:
+            The status.
+        """
+        loop = asyncio.get_running_loop()
+        key = tuple(sorted(kwargs.items()))
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = {}
+            loop.call_later(self.window, self._flush, key, batch)
+
+        future = loop.create_future()
+        batch.setdefault(int(status_id), []).append(future)
+        if len(batch) >= self.max_size:
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key: Tuple, batch: Dict[int, List[asyncio.Future]]) -> None:
+        """
+        Sends a batch unless it has already been sent.
+        """
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        self._spawn(self._send(batch, dict(key)))
+
+    async def _send(
+        self, batch: Dict[int, List[asyncio.Future]], kwargs: Dict[str, Any]
+    ) -> None:
+        """
+        Looks up a batch and resolves the futures of its callers.
+        """
+        try:
+            statuses = await self._lookup(list(batch), **kwargs)
+        except asyncio.CancelledError:
+            for futures in batch.values():
+                for future in futures:
+                    future.cancel()
+            raise
+        except Exception as exc:
+            for futures in batch.values():
+                _resolve(futures, exception=exc)
+            return
+
+        found = {get_payload_id(status): status for status in statuses}
+        for status_id, futures in batch.items():
+            if status_id in found:
+                _resolve(futures, result=found[status_id])
+            else:
+                self._spawn(self._send_single(status_id, futures, kwargs))
+
+    async def _send_single(
+        self, status_id: int, futures: List[asyncio.Future], kwargs: Dict[str, Any]
+    ) -> None:
+        """
+        Gets a status missing from a bulk response on its own.
+        """
+        try:
+            status = await self._fallback(status_id, **kwargs)
+        except Exception as exc:
+            _resolve(futures, exception=exc)
+        else:
+            _resolve(futures, result=status)
+
+    def _spawn(self, coro: Awaitable) -> None:
+        """
+        Runs a coroutine in the background, keeping a reference until it ends.
+        """
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+
+def _resolve(futures: List[asyncio.Future], result: Any = None, exception=None):
+    """
+    Resolves the futures of the callers that are still waiting.
+    """
+    for future in futures:
+        if future.done():
+            continue
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
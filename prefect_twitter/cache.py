@@ -0,0 +1,171 @@
+"""In-process caches shared by the Twitter tasks"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded mapping that evicts the least recently used
+    entry once it holds more than `maxsize` entries, and optionally expires
+    entries `ttl` seconds after they were stored. Lookups are counted in
+    `hits` and `misses`.
+
+    Args:
+        maxsize: The maximum number of entries to hold.
+        on_evict: An optional callable invoked with the key and value of every
+            entry that is evicted, expired or invalidated.
+        ttl: The number of seconds entries stay valid; None keeps them until
+            they are evicted.
+
+    Example:
+        Cache values and evict the least recently used one.
+        ```python
+        from prefect_twitter.cache import LRUCache
+
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)  # evicts "b"
+        ```
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+        ttl: Optional[float] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._on_evict = on_evict
+        # maps keys to (expiry time, value) pairs, least recently used first
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Gets the value stored under a key, marking it as recently used.
+
+        Args:
+            key: The key to look up.
+            default: The value to return if the key is not cached or expired.
+
+        Returns:
+            The cached value, or `default` if the key is not cached or expired.
+        """
+        evicted = []
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING and self._is_expired(entry):
+                evicted.append((key, self._data.pop(key)[1]))
+                entry = _MISSING
+            if entry is _MISSING:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._data.move_to_end(key)
+        self._notify(evicted)
+        return default if entry is _MISSING else entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value under a key, evicting the least recently used entries
+        if the cache is full.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to store.
+        """
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        evicted = []
+        with self._lock:
+            previous = self._data.pop(key, _MISSING)
+            if previous is not _MISSING and previous[1] is not value:
+                evicted.append((key, previous[1]))
+            self._data[key] = (expires_at, value)
+            while len(self._data) > self.maxsize:
+                old_key, (_, old_value) = self._data.popitem(last=False)
+                evicted.append((old_key, old_value))
+        self._notify(evicted)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        Gets the value stored under a key, creating and storing it with
+        `factory` if it is not cached.
+
+        Args:
+            key: The key to look up.
+            factory: A callable that creates the value on a cache miss.
+
+        Returns:
+            The cached or newly created value.
+        """
+        with self._lock:
+            value = self.get(key, _MISSING)
+            if value is _MISSING:
+                value = factory()
+                self.set(key, value)
+            return value
+
+    def pop(self, key: Hashable) -> None:
+        """
+        Invalidates the entry stored under a key, if any.
+
+        Args:
+            key: The key to invalidate.
+        """
+        with self._lock:
+            entry = self._data.pop(key, _MISSING)
+        if entry is not _MISSING:
+            self._notify([(key, entry[1])])
+
+    def clear(self) -> None:
+        """
+        Invalidates every entry in the cache.
+        """
+        with self._lock:
+            evicted = [(key, value) for key, (_, value) in self._data.items()]
+            self._data.clear()
+        self._notify(evicted)
+
+    def _is_expired(self, entry) -> bool:
+        """
+        Checks whether an entry has outlived the TTL it was stored with.
+        """
+        expires_at = entry[0]
+        return expires_at is not None and time.monotonic() >= expires_at
+
+    def _notify(self, evicted):
+        """
+        Calls the eviction callback, outside of the lock, for evicted entries.
+        """
+        if self._on_evict is None:
+            return
+        for key, value in evicted:
+            self._on_evict(key, value)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Checks whether a key holds an unexpired value, without marking it as
+        recently used.
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            return entry is not _MISSING and not self._is_expired(entry)
+
+    def __len__(self) -> int:
+        """
+        Counts the entries held, including expired ones not yet evicted.
+        """
+        with self._lock:
+            return len(self._data)
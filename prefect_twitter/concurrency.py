@@ -0,0 +1,111 @@
+"""Concurrent execution of Twitter calls that fails like a single call"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, List, Optional
+
+import anyio
+
+_background_loop: Optional[asyncio.AbstractEventLoop] = None
+_background_loop_pid: Optional[int] = None
+_background_loop_lock = threading.Lock()
+
+
+async def gather(calls: Iterable[Callable[[], Awaitable[Any]]]) -> List[Any]:
+    """
+    Runs calls concurrently in a task group. If a call fails, the others are
+    cancelled and its exception is raised as is, rather than wrapped in the
+    `ExceptionGroup` a task group raises, so callers can keep catching
+    `TweepyException`.
+
+    Args:
+        calls: Functions returning the awaitables to run, e.g. partials of
+            async functions.
+
+    Returns:
+        The results of the calls, in the order of `calls`.
+
+    Example:
+        Looks up two batches of statuses at once.
+        ```python
+        from functools import partial
+        from prefect_twitter.concurrency import gather
+
+        batches = await gather(
+            partial(twitter_credentials.call_api, "lookup_statuses", batch)
+            for batch in ([1, 2], [3, 4])
+        )
+        ```
+    """
+    calls = list(calls)
+    results = [None] * len(calls)
+    errors = []
+
+    async def run(index, call):
+        """
+        Runs one call, cancelling the others if it is the first to fail.
+        """
+        try:
+            results[index] = await call()
+        except Exception as exc:
+            if not errors:
+                errors.append(exc)
+            tg.cancel_scope.cancel()
+
+    async with anyio.create_task_group() as tg:
+        for index, call in enumerate(calls):
+            tg.start_soon(run, index, call)
+    if errors:
+        raise errors[0]
+    return results
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Gets the event loop shared by every task run in this process, starting it
+    in a daemon thread on first use. Prefect runs each async task run on an
+    event loop of its own, so state that must be shared between concurrent
+    task runs or outlive one, such as the connection pools of async clients,
+    lives on this loop instead.
+
+    Returns:
+        The background event loop.
+    """
+    global _background_loop, _background_loop_pid
+    with _background_loop_lock:
+        # the loop's thread does not survive a fork
+        if _background_loop is None or _background_loop_pid != os.getpid():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever, name="prefect-twitter-loop", daemon=True
+            )
+            thread.start()
+            _background_loop, _background_loop_pid = loop, os.getpid()
+        return _background_loop
+
+
+async def run_in_background(coro: Coroutine[Any, Any, Any]) -> Any:
+    """
+    Runs a coroutine on `get_background_loop` and waits for its result on the
+    running event loop. Cancelling the caller cancels the coroutine.
+
+    Args:
+        coro: The coroutine to run.
+
+    Returns:
+        The result of the coroutine.
+
+    Example:
+        Gets a status with the async client shared across task runs.
+        ```python
+        from prefect_twitter.concurrency import run_in_background
+
+        client = twitter_credentials.get_async_client()
+        status = await run_in_background(client.get_status(1504591031626571777))
+        ```
+    """
+    loop = get_background_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
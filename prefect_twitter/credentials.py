@@ -1,14 +1,122 @@
 """Credential classes used to perform authenticated interactions with Twitter"""
 
+import asyncio
+import hashlib
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+import anyio
+import httpx
+import requests
+from oauthlib.oauth1 import Client as OAuth1Client
 from prefect.blocks.core import Block
 from pydantic import VERSION as PYDANTIC_VERSION
+from requests.adapters import HTTPAdapter
 
 if PYDANTIC_VERSION.startswith("2."):
     from pydantic.v1 import Field, SecretStr
 else:
     from pydantic import Field, SecretStr
 
-from tweepy import API, OAuth1UserHandler
+from tweepy import API, OAuth1UserHandler, OAuth2BearerHandler
+from tweepy.errors import TweepyException
+
+from prefect_twitter.async_client import AsyncTwitterClient
+from prefect_twitter.batching import StatusBatcher
+from prefect_twitter.cache import LRUCache
+from prefect_twitter.concurrency import get_background_loop, run_in_background
+from prefect_twitter.parsers import get_parser, get_payload_id
+from prefect_twitter.rate_limits import METHOD_ENDPOINTS, RateLimiter
+from prefect_twitter.retries import get_retry_delay
+from prefect_twitter.singleflight import SingleFlight
+from prefect_twitter.store import StatusStore
+
+API_CACHE_MAXSIZE = 32
+
+
+class _PersistentSession(requests.Session):
+    """
+    A requests Session that survives tweepy closing it after every request,
+    so pooled keep-alive connections are reused across calls.
+    """
+
+    def close(self):
+        """
+        Keeps the connection pool open; tweepy calls this after each request.
+        """
+
+    def shutdown(self):
+        """
+        Closes the connection pool for good.
+        """
+        super().close()
+
+
+def _shutdown_api(key: str, api: API) -> None:
+    """
+    Releases the connections held by an API evicted from the cache.
+    """
+    api.session.shutdown()
+
+
+def _close_async_client(key: str, client: AsyncTwitterClient) -> None:
+    """
+    Closes the connection pool of an async client evicted from the cache on
+    the background loop it lives on.
+    """
+    asyncio.run_coroutine_threadsafe(client.aclose(), get_background_loop())
+
+
+_api_cache = LRUCache(maxsize=API_CACHE_MAXSIZE, on_evict=_shutdown_api)
+_async_clients = LRUCache(maxsize=API_CACHE_MAXSIZE, on_evict=_close_async_client)
+_status_caches = LRUCache(maxsize=API_CACHE_MAXSIZE)
+_status_batchers = LRUCache(maxsize=API_CACHE_MAXSIZE)
+_single_flights = LRUCache(maxsize=API_CACHE_MAXSIZE)
+_status_stores = LRUCache(
+    maxsize=API_CACHE_MAXSIZE, on_evict=lambda key, store: store.close()
+)
+
+# methods of endpoints that accept app-only authentication
+APP_AUTH_METHODS = frozenset(
+    {"get_status", "lookup_statuses", "user_timeline", "search_tweets"}
+)
+
+# methods reading or writing the authenticating user's own account
+ACCOUNT_METHODS = frozenset({"update_status", "home_timeline", "mentions_timeline"})
+
+# methods whose requests may take effect again if repeated, so they are only
+# retried when Twitter cannot have received or processed them
+NON_IDEMPOTENT_METHODS = frozenset(
+    {
+        "update_status",
+        "media_upload",
+        "simple_upload",
+        "chunked_upload",
+        "chunked_upload_init",
+        "chunked_upload_finalize",
+    }
+)
+
+# read-only methods whose identical concurrent calls can share one request
+DEDUPLICATED_METHODS = frozenset(
+    {"get_status", "lookup_statuses", "get_media_upload_status"}
+)
+
+# methods whose statuses can be served from the status caches
+CACHED_METHODS = frozenset({"get_status", "lookup_statuses"})
+
+# sessions and async clients keep updating the rate limiter they were built
+# with, so rate limit state is kept per identity and never evicted
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+# worker thread pools bound the tweepy calls of every task run in the process,
+# so they are never evicted while calls may be waiting on them
+_thread_pools: Dict[str, ThreadPoolExecutor] = {}
+_thread_pools_lock = threading.Lock()
 
 
 class TwitterCredentials(Block):
@@ -23,6 +131,53 @@ class TwitterCredentials(Block):
         consumer_secret: This is also known as oauth_consumer_secret or API secret key.
         access_token: This is also known as oauth_token.
         access_token_secret: This is also known as oauth_token_secret.
+        bearer_token: The app's bearer token, used for app-only authentication.
+        read_auth_mode: How read endpoints that accept app-only authentication
+            are called: `user` uses the OAuth1 user context, `app` uses the
+            bearer token, and `auto` uses whichever has more rate limit quota
+            left, combining the user and app limits.
+        pool_connections: The number of per-host connection pools to keep.
+        pool_maxsize: The maximum number of connections kept per host.
+        keep_alive: Whether to keep connections open between requests.
+        connect_timeout: Seconds to wait for a connection to be established.
+        read_timeout: Seconds to wait for the server to send a response.
+        use_async_client: Whether tasks call Twitter with an asyncio-native
+            client on an event loop shared by every task run instead of
+            running tweepy in a thread.
+        max_worker_threads: The maximum number of worker threads calling tweepy
+            with these credentials at once, across every task run in the
+            process.
+        respect_rate_limits: Whether calls wait for the endpoint's rate limit
+            window to reset instead of being sent once it is spent.
+        max_retries: The number of times a call is retried after an HTTP 429,
+            a 5xx response or a connection error; posts and uploads are only
+            retried after an HTTP 429 or a failure to connect.
+        retry_backoff_factor: The maximum delay, in seconds, before the first
+            retry of a 5xx response or connection error; it doubles each retry.
+        retry_backoff_max: The largest delay, in seconds, between retries of
+            5xx responses and connection errors.
+        batch_get_status: Whether concurrent `get_status` calls, across every
+            task run in the process, are coalesced into bulk
+            `statuses/lookup` requests of up to 100 IDs.
+        batch_window: Seconds a `get_status` call waits for others to join its
+            batch.
+        deduplicate_requests: Whether identical concurrent read calls, across
+            every task run in the process, share one in-flight request.
+        cache_statuses: Whether statuses returned by `get_status` and
+            `lookup_statuses` are kept in memory and reused by later calls for
+            the same status.
+        status_cache_ttl: Seconds a cached status is reused before it is
+            fetched again.
+        status_cache_maxsize: The maximum number of statuses kept in memory;
+            the least recently used are evicted first.
+        status_store_path: The path of a SQLite database keeping fetched
+            statuses across flow runs and processes; None disables it.
+        status_store_max_age: Seconds a status kept on disk is reused before
+            it is fetched again.
+        status_store_max_entries: The maximum number of statuses kept on disk;
+            the oldest are deleted first.
+        json_library: The library responses are decoded with: `json`,
+            `orjson`, or `auto` to use orjson when it is installed.
 
     Example:
         Load stored Twitter credentials:
@@ -48,10 +203,161 @@ class TwitterCredentials(Block):
     access_token_secret: SecretStr = Field(
         ..., description="Ouath secret used to access the Twitter API."
     )
+    bearer_token: Optional[SecretStr] = Field(
+        default=None,
+        description="The app's bearer token, used for app-only authentication.",
+    )
+    read_auth_mode: Literal["user", "app", "auto"] = Field(
+        default="user",
+        description=(
+            "How read endpoints that accept app-only authentication are called: "
+            "with the user context, with the bearer token, or with whichever has "
+            "more rate limit quota left."
+        ),
+    )
+    pool_connections: int = Field(
+        default=10,
+        description="The number of per-host connection pools to keep.",
+    )
+    pool_maxsize: int = Field(
+        default=10,
+        description=(
+            "The maximum number of connections kept per host; concurrent "
+            "requests beyond this wait for a free connection."
+        ),
+    )
+    keep_alive: bool = Field(
+        default=True,
+        description="Whether to keep connections open between requests.",
+    )
+    connect_timeout: float = Field(
+        default=60,
+        description="Seconds to wait for a connection to be established.",
+    )
+    read_timeout: float = Field(
+        default=60,
+        description="Seconds to wait for the server to send a response.",
+    )
+    use_async_client: bool = Field(
+        default=False,
+        description=(
+            "Whether tasks call Twitter with an asyncio-native client on an "
+            "event loop shared by every task run instead of running tweepy in "
+            "a worker thread."
+        ),
+    )
+    max_worker_threads: int = Field(
+        default=10,
+        description=(
+            "The maximum number of worker threads calling tweepy with these "
+            "credentials at once, across every task run in the process."
+        ),
+    )
+    respect_rate_limits: bool = Field(
+        default=True,
+        description=(
+            "Whether calls wait for the endpoint's rate limit window to reset "
+            "instead of being sent once it is spent."
+        ),
+    )
+    max_retries: int = Field(
+        default=3,
+        description=(
+            "The number of times a call is retried after an HTTP 429, a 5xx "
+            "response or a connection error; posts and uploads are only "
+            "retried after an HTTP 429 or a failure to connect."
+        ),
+    )
+    retry_backoff_factor: float = Field(
+        default=1,
+        description=(
+            "The maximum delay, in seconds, before the first retry of a 5xx "
+            "response or connection error; it doubles with each retry."
+        ),
+    )
+    retry_backoff_max: float = Field(
+        default=60,
+        description=(
+            "The largest delay, in seconds, between retries of 5xx responses "
+            "and connection errors."
+        ),
+    )
+    batch_get_status: bool = Field(
+        default=False,
+        description=(
+            "Whether concurrent get_status calls, across every task run in the "
+            "process, are coalesced into bulk statuses/lookup requests of up "
+            "to 100 IDs."
+        ),
+    )
+    batch_window: float = Field(
+        default=0.01,
+        description="Seconds a get_status call waits for others to join its batch.",
+    )
+    deduplicate_requests: bool = Field(
+        default=True,
+        description=(
+            "Whether identical concurrent read calls, across every task run in "
+            "the process, share one request."
+        ),
+    )
+    cache_statuses: bool = Field(
+        default=False,
+        description=(
+            "Whether statuses returned by get_status and lookup_statuses are "
+            "kept in memory and reused by later calls for the same status."
+        ),
+    )
+    status_cache_ttl: float = Field(
+        default=300,
+        description="Seconds a cached status is reused before it is fetched again.",
+    )
+    status_cache_maxsize: int = Field(
+        default=1024,
+        description=(
+            "The maximum number of statuses kept in memory; the least recently "
+            "used are evicted first."
+        ),
+    )
+    status_store_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "The path of a SQLite database keeping fetched statuses across flow "
+            "runs and processes; leave empty to disable it."
+        ),
+    )
+    status_store_max_age: float = Field(
+        default=86400,
+        description=(
+            "Seconds a status kept on disk is reused before it is fetched again."
+        ),
+    )
+    status_store_max_entries: int = Field(
+        default=100000,
+        description=(
+            "The maximum number of statuses kept on disk; the oldest are "
+            "deleted first."
+        ),
+    )
+    json_library: Literal["auto", "json", "orjson"] = Field(
+        default="auto",
+        description=(
+            "The library responses are decoded with; auto uses orjson when it "
+            "is installed."
+        ),
+    )
 
-    def get_api(self) -> API:
+    def get_api(self, app_only: bool = False) -> API:
         """
-        Gets an authenticated Tweepy API.
+        Gets an authenticated Tweepy API. The API is cached process-wide, keyed
+        by a hash of the credential values, so repeated calls reuse one client
+        and its keep-alive connections. Its connection pool is sized by
+        `pool_connections` and `pool_maxsize` and is safe to share between the
+        worker threads the tasks run in.
+
+        Args:
+            app_only: Whether to authenticate with the bearer token instead of
+                the user context.
 
         Returns:
             An authenticated Tweepy API.
@@ -80,11 +386,766 @@ class TwitterCredentials(Block):
             example_get_api_flow()
             ```
         """
-        auth = OAuth1UserHandler(
-            self.consumer_key,
-            self.consumer_secret.get_secret_value(),
-            self.access_token,
-            self.access_token_secret.get_secret_value(),
+        return _api_cache.get_or_set(
+            self._get_cache_key(app_only), partial(self._build_api, app_only)
+        )
+
+    def get_async_client(self, app_only: bool = False) -> AsyncTwitterClient:
+        """
+        Gets an authenticated client that calls Twitter with httpx. The client
+        is shared by every task run in the process and lives on the event loop
+        of `prefect_twitter.concurrency.get_background_loop`, so its
+        connections are reused across task runs and closed when it is evicted;
+        await its coroutines with `run_in_background`. It shares the
+        connection pool settings of `get_api`.
+
+        Args:
+            app_only: Whether to authenticate with the bearer token instead of
+                the user context.
+
+        Returns:
+            An authenticated async Twitter client.
+
+        Example:
+            Gets the status of a Tweet without a worker thread.
+            ```python
+            from prefect import flow
+            from prefect_twitter import TwitterCredentials
+            from prefect_twitter.concurrency import run_in_background
+
+            @flow
+            async def example_get_async_client_flow():
+                twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+                client = twitter_credentials.get_async_client()
+                status = await run_in_background(
+                    client.get_status(1504591031626571777)
+                )
+                return status
+
+            example_get_async_client_flow()
+            ```
+        """
+        return _async_clients.get_or_set(
+            self._get_cache_key(app_only), partial(self._build_async_client, app_only)
+        )
+
+    def get_thread_pool(self) -> ThreadPoolExecutor:
+        """
+        Gets the pool of worker threads calling tweepy with these credentials.
+        It is shared by every task run in the process, so at most
+        `max_worker_threads` calls run at once however many task runs make
+        them, and it is separate from the default executor, so slow Twitter
+        calls do not starve other blocking calls.
+
+        Returns:
+            The thread pool of these credentials.
+
+        Example:
+            Runs a custom tweepy call in the credentials' thread pool.
+            ```python
+            import asyncio
+            from prefect import flow
+            from prefect_twitter import TwitterCredentials
+
+            @flow
+            async def example_get_thread_pool_flow():
+                twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+                api = twitter_credentials.get_api()
+                user = await asyncio.get_running_loop().run_in_executor(
+                    twitter_credentials.get_thread_pool(), api.verify_credentials
+                )
+                return user
+
+            example_get_thread_pool_flow()
+            ```
+        """
+        key = self._get_cache_key()
+        with _thread_pools_lock:
+            thread_pool = _thread_pools.get(key)
+            if thread_pool is None:
+                thread_pool = _thread_pools[key] = ThreadPoolExecutor(
+                    max_workers=self.max_worker_threads,
+                    thread_name_prefix="prefect-twitter",
+                )
+        return thread_pool
+
+    def get_rate_limiter(self, app_only: bool = False) -> RateLimiter:
+        """
+        Gets the rate limiter tracking the per-endpoint limits of these
+        credentials. It is shared by every block holding the same tokens, since
+        Twitter applies the limits per token.
+
+        Args:
+            app_only: Whether to get the limiter of the app-only limits, which
+                are tracked separately from the user context limits.
+
+        Returns:
+            The rate limiter of these credentials.
+
+        Example:
+            Checks how many status lookups are left in the current window.
+            ```python
+            from prefect_twitter import TwitterCredentials
+
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            rate_limiter = twitter_credentials.get_rate_limiter()
+            remaining = rate_limiter.remaining("statuses/show")
+            ```
+        """
+        key = self._get_identity_key(app_only)
+        with _rate_limiters_lock:
+            rate_limiter = _rate_limiters.get(key)
+            if rate_limiter is None:
+                rate_limiter = _rate_limiters[key] = RateLimiter()
+        return rate_limiter
+
+    def get_remaining_calls(self, method: str) -> float:
+        """
+        Gets the number of calls to the endpoint of a `tweepy.API` method left
+        in the current rate limit window, across the authentication contexts
+        `read_auth_mode` allows for it.
+
+        Args:
+            method: The name of the `tweepy.API` method, e.g. `get_status`.
+
+        Returns:
+            The remaining calls, or infinity if the limits are not known yet.
+        """
+        endpoint = METHOD_ENDPOINTS.get(method)
+        if endpoint is None:
+            return float("inf")
+        return sum(
+            self._get_remaining(endpoint, app_only)
+            for app_only in self._get_auth_contexts(method)
+        )
+
+    def get_status_cache(self) -> LRUCache:
+        """
+        Gets the in-process cache of statuses fetched with these credentials.
+        Entries are keyed by the status ID and the keyword arguments that
+        change the returned status, expire after `status_cache_ttl` seconds,
+        and are evicted least recently used first beyond
+        `status_cache_maxsize` entries.
+
+        Returns:
+            The status cache of these credentials.
+
+        Example:
+            Reports how often statuses were served from memory.
+            ```python
+            from prefect_twitter import TwitterCredentials
+
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            status_cache = twitter_credentials.get_status_cache()
+            print(status_cache.hits, status_cache.misses)
+            ```
+        """
+        return _status_caches.get_or_set(
+            self._get_cache_key(),
+            lambda: LRUCache(
+                maxsize=self.status_cache_maxsize, ttl=self.status_cache_ttl
+            ),
+        )
+
+    def get_status_store(self) -> StatusStore:
+        """
+        Gets the on-disk store of statuses at `status_store_path`, shared by
+        every process using the same path. Statuses are kept per user, since
+        what a user can see differs, and per set of keyword arguments.
+
+        Returns:
+            The status store of these credentials.
+
+        Example:
+            Counts the statuses kept on disk.
+            ```python
+            from prefect_twitter import TwitterCredentials
+
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            status_store = twitter_credentials.get_status_store()
+            print(len(status_store))
+            ```
+        """
+        if self.status_store_path is None:
+            raise ValueError("A status_store_path is required to use a status store")
+        key = (
+            self.status_store_path,
+            self.status_store_max_age,
+            self.status_store_max_entries,
+        )
+        return _status_stores.get_or_set(
+            key,
+            lambda: StatusStore(
+                self.status_store_path,
+                max_age=self.status_store_max_age,
+                max_entries=self.status_store_max_entries,
+            ),
         )
-        api = API(auth=auth)
+
+    async def call_api(
+        self,
+        method: str,
+        *args: Any,
+        max_retries: Optional[int] = None,
+        raw: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Calls a `tweepy.API` method without blocking the event loop, using the
+        async client when `use_async_client` is set and it supports the
+        method, and otherwise running tweepy in a worker thread of
+        `get_thread_pool`. If `respect_rate_limits` is set, the call
+        first waits for a token from `get_rate_limiter`.
+
+        HTTP 429s are retried once the rate limit resets, and 5xx responses
+        and connection errors are retried with jittered exponential backoff.
+        Methods in `NON_IDEMPOTENT_METHODS`, such as `update_status`, are
+        not retried after 5xx responses, read timeouts or dropped
+        connections, since the request may have taken effect; only HTTP
+        429s and failures to connect are retried for them.
+        If `batch_get_status` is set, concurrent `get_status` calls are sent
+        together as one `lookup_statuses` call. If `deduplicate_requests` is
+        set, identical concurrent calls to read-only methods share one
+        request and receive the same result object. If `cache_statuses` is
+        set, `get_status` and `lookup_statuses` calls are answered from
+        `get_status_cache` for statuses fetched recently, and if
+        `status_store_path` is set, from `get_status_store` for statuses
+        fetched by earlier flow runs; only the other statuses are requested.
+
+        Args:
+            method: The name of the `tweepy.API` method, e.g. `get_status`.
+            *args: Positional arguments to pass to the method.
+            max_retries: The retry budget of this call; defaults to the
+                `max_retries` of the credentials.
+            raw: Whether read methods such as `get_status` return the decoded
+                JSON response as dicts and lists instead of tweepy models.
+            **kwargs: Keyword arguments to pass to the method.
+
+        Returns:
+            The return value of the method.
+
+        Example:
+            Looks up a Tweet.
+            ```python
+            from prefect import flow
+            from prefect_twitter import TwitterCredentials
+
+            @flow
+            async def example_call_api_flow():
+                twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+                status = await twitter_credentials.call_api(
+                    "get_status", 1504591031626571777
+                )
+                return status
+
+            example_call_api_flow()
+            ```
+        """
+        if raw:
+            kwargs["raw"] = True
+        if method in CACHED_METHODS and (
+            self.cache_statuses or self.status_store_path is not None
+        ):
+            return await self._call_cached(
+                method, *args, max_retries=max_retries, **kwargs
+            )
+        return await self._call_deduplicated(
+            method, *args, max_retries=max_retries, **kwargs
+        )
+
+    async def _call_cached(
+        self,
+        method: str,
+        status_ids: Any,
+        max_retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Makes a status lookup, serving the statuses cached in memory or on disk
+        and fetching only the rest.
+        """
+        if method == "get_status":
+            ids = [int(status_ids)]
+        else:
+            ids = list(dict.fromkeys(int(status_id) for status_id in status_ids))
+        # the retry budget is not a keyword argument, so every one left other
+        # than the output format changes the statuses returned
+        raw = kwargs.get("raw", False)
+        variant = tuple(sorted(item for item in kwargs.items() if item[0] != "raw"))
+        cached = await self._get_cached_statuses(ids, variant, raw)
+        missing = [status_id for status_id in ids if status_id not in cached]
+
+        fetched = []
+        if missing and method == "get_status":
+            status = await self._call_deduplicated(
+                "get_status", status_ids, max_retries=max_retries, **kwargs
+            )
+            fetched = [status]
+        elif missing:
+            fetched = await self._call_deduplicated(
+                "lookup_statuses", missing, max_retries=max_retries, **kwargs
+            )
+        await self._cache_statuses(fetched, variant, raw)
+
+        if method == "get_status":
+            return cached[ids[0]] if cached else fetched[0]
+        return [cached[status_id] for status_id in ids if status_id in cached] + list(
+            fetched
+        )
+
+    async def _get_cached_statuses(
+        self, status_ids: List[int], variant: Tuple, raw: bool = False
+    ) -> Dict[int, Any]:
+        """
+        Gets the statuses cached in memory, then those stored on disk.
+        """
+        found = {}
+        if self.cache_statuses:
+            status_cache = self.get_status_cache()
+            for status_id in status_ids:
+                status = status_cache.get((status_id, variant, raw))
+                if status is not None:
+                    found[status_id] = status
+
+        missing = [status_id for status_id in status_ids if status_id not in found]
+        if self.status_store_path is None or not missing:
+            return found
+        payloads = await self._run_in_thread(
+            self.get_status_store().get_many,
+            self._get_identity_key(),
+            repr(variant),
+            missing,
+        )
+        api = self.get_api()
+        for status_id, payload in payloads.items():
+            if raw:
+                status = payload
+            else:
+                status = api.parser.model_factory.status.parse(api, payload)
+            found[status_id] = status
+            if self.cache_statuses:
+                status_cache.set((status_id, variant, raw), status)
+        return found
+
+    async def _cache_statuses(
+        self, statuses: List[Any], variant: Tuple, raw: bool = False
+    ) -> None:
+        """
+        Keeps fetched statuses in memory and on disk.
+        """
+        if not statuses:
+            return
+        if self.cache_statuses:
+            status_cache = self.get_status_cache()
+            for status in statuses:
+                status_cache.set((get_payload_id(status), variant, raw), status)
+        if self.status_store_path is not None:
+            await self._run_in_thread(
+                self.get_status_store().put_many,
+                self._get_identity_key(),
+                repr(variant),
+                [
+                    (get_payload_id(status), status if raw else status._json)
+                    for status in statuses
+                ],
+            )
+
+    async def _call_deduplicated(
+        self,
+        method: str,
+        *args: Any,
+        max_retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Makes a call, sharing the request of an identical call in flight.
+        """
+        if self.deduplicate_requests and method in DEDUPLICATED_METHODS:
+            # the calls are shared on the background loop, so identical calls
+            # from every task run in the process share one request
+            single_flight = _single_flights.get_or_set(
+                self._get_cache_key(), SingleFlight
+            )
+            key = repr((method, args, max_retries, sorted(kwargs.items())))
+            return await run_in_background(
+                single_flight.do(
+                    key,
+                    partial(
+                        self._call, method, *args, max_retries=max_retries, **kwargs
+                    ),
+                )
+            )
+        return await self._call(method, *args, max_retries=max_retries, **kwargs)
+
+    async def _call(
+        self,
+        method: str,
+        *args: Any,
+        max_retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Makes a call, batching it with others if possible.
+        """
+        if (
+            method == "get_status"
+            and self.batch_get_status
+            and StatusBatcher.can_batch(**kwargs)
+        ):
+            batcher = self._get_status_batcher()
+            return await run_in_background(
+                batcher.get_status(*args, max_retries=max_retries, **kwargs)
+            )
+        return await self._call_with_retries(
+            method, *args, max_retries=max_retries, **kwargs
+        )
+
+    async def _call_with_retries(
+        self,
+        method: str,
+        *args: Any,
+        max_retries: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Makes a call, retrying it as long as the retry policy allows.
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+        idempotent = method not in NON_IDEMPOTENT_METHODS
+        file = kwargs.get("file")
+        position = file.tell() if file is not None else None
+
+        attempt = 0
+        while True:
+            try:
+                return await self._dispatch(method, *args, **kwargs)
+            except TweepyException as exc:
+                delay = get_retry_delay(
+                    exc,
+                    attempt,
+                    self.retry_backoff_factor,
+                    self.retry_backoff_max,
+                    idempotent=idempotent,
+                )
+                if delay is None or attempt >= max_retries:
+                    raise
+            attempt += 1
+            await anyio.sleep(delay)
+            if position is not None:
+                file.seek(position)
+
+    async def _dispatch(
+        self, method: str, *args: Any, raw: bool = False, **kwargs: Any
+    ) -> Any:
+        """
+        Makes a single attempt at a call once the rate limiter allows it.
+        """
+        if raw:
+            kwargs["parser"] = get_parser(self.json_library, raw=True)
+        endpoint = METHOD_ENDPOINTS.get(method)
+        app_only = self._use_app_auth(method)
+        if self.respect_rate_limits and endpoint is not None:
+            await self.get_rate_limiter(app_only).acquire(endpoint)
+
+        if self.use_async_client and AsyncTwitterClient.supports(method):
+            client = self.get_async_client(app_only)
+            return await run_in_background(getattr(client, method)(*args, **kwargs))
+        api = self.get_api(app_only)
+        return await self._run_in_thread(getattr(api, method), *args, **kwargs)
+
+    async def _run_in_thread(self, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs a blocking call in `get_thread_pool` without blocking the loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.get_thread_pool(), partial(fn, *args, **kwargs)
+        )
+
+    def _get_status_batcher(self) -> StatusBatcher:
+        """
+        Gets the batcher coalescing `get_status` calls, which runs on the
+        background loop so calls from every task run share its batches.
+        """
+        return _status_batchers.get_or_set(
+            self._get_cache_key(),
+            lambda: StatusBatcher(
+                partial(self._call_with_retries, "lookup_statuses"),
+                partial(self._call_with_retries, "get_status"),
+                window=self.batch_window,
+            ),
+        )
+
+    def invalidate_api(self) -> None:
+        """
+        Discards the cached Tweepy API for these credentials, e.g. after the
+        tokens have been revoked; the next `get_api` call builds a new one.
+        """
+        for app_only in (False, True):
+            key = self._get_cache_key(app_only)
+            _api_cache.pop(key)
+            _async_clients.pop(key)
+            _status_caches.pop(key)
+            _status_batchers.pop(key)
+            with _thread_pools_lock:
+                _thread_pools.pop(key, None)
+            _single_flights.pop(key)
+
+    @staticmethod
+    def clear_api_cache() -> None:
+        """
+        Discards every cached Tweepy API in this process.
+        """
+        _api_cache.clear()
+        with _rate_limiters_lock:
+            _rate_limiters.clear()
+        _status_caches.clear()
+        _status_stores.clear()
+        _async_clients.clear()
+        with _thread_pools_lock:
+            _thread_pools.clear()
+        _status_batchers.clear()
+        _single_flights.clear()
+
+    def _get_cache_key(self, app_only: bool = False) -> str:
+        """
+        Hashes the field values so that the key changes with any of them
+        without holding secrets in plain text.
+        """
+        hasher = hashlib.sha256(b"app\0" if app_only else b"user\0")
+        for name in sorted(self.__fields__):
+            value = getattr(self, name)
+            if isinstance(value, SecretStr):
+                value = value.get_secret_value()
+            hasher.update(f"{name}={value!r}".encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    def _get_identity_key(self, app_only: bool = False) -> str:
+        """
+        Hashes the tokens that Twitter applies rate limits to; app-only limits
+        apply to the app as a whole.
+        """
+        if app_only:
+            identity = f"{self.consumer_key}\0app"
+        else:
+            identity = f"{self.consumer_key}\0{self.access_token}"
+        return hashlib.sha256(identity.encode()).hexdigest()
+
+    def _get_auth_contexts(self, method: str) -> List[bool]:
+        """
+        Lists whether each authentication context a method may be called with
+        is app-only.
+        """
+        if method not in APP_AUTH_METHODS or self.read_auth_mode == "user":
+            return [False]
+        if self.bearer_token is None:
+            raise ValueError(
+                f"A bearer_token is required when read_auth_mode is "
+                f"{self.read_auth_mode!r}"
+            )
+        if self.read_auth_mode == "app":
+            return [True]
+        return [False, True]
+
+    def _get_remaining(self, endpoint: str, app_only: bool) -> float:
+        """
+        Gets the calls left to an endpoint, or infinity if it is not known.
+        """
+        remaining = self.get_rate_limiter(app_only).remaining(endpoint)
+        return float("inf") if remaining is None else remaining
+
+    def _use_app_auth(self, method: str) -> bool:
+        """
+        Decides whether a call is made with app-only authentication, picking
+        the context with more quota left when `read_auth_mode` is `auto`.
+        """
+        auth_contexts = self._get_auth_contexts(method)
+        if len(auth_contexts) == 1:
+            return auth_contexts[0]
+        endpoint = METHOD_ENDPOINTS[method]
+        return self._get_remaining(endpoint, True) > self._get_remaining(
+            endpoint, False
+        )
+
+    def _build_api(self, app_only: bool = False) -> API:
+        """
+        Builds a new authenticated Tweepy API.
+        """
+        if app_only:
+            auth = OAuth2BearerHandler(self.bearer_token.get_secret_value())
+        else:
+            auth = OAuth1UserHandler(
+                self.consumer_key,
+                self.consumer_secret.get_secret_value(),
+                self.access_token,
+                self.access_token_secret.get_secret_value(),
+            )
+        api = API(
+            auth=auth,
+            parser=get_parser(self.json_library),
+            timeout=(self.connect_timeout, self.read_timeout),
+        )
+        api.session = self._build_session(app_only)
         return api
+
+    def _build_async_client(self, app_only: bool = False) -> AsyncTwitterClient:
+        """
+        Builds a new authenticated async client.
+        """
+        if app_only:
+            oauth_client = None
+            bearer_token = self.bearer_token.get_secret_value()
+        else:
+            oauth_client = OAuth1Client(
+                self.consumer_key,
+                client_secret=self.consumer_secret.get_secret_value(),
+                resource_owner_key=self.access_token,
+                resource_owner_secret=self.access_token_secret.get_secret_value(),
+            )
+            bearer_token = None
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+        )
+        timeout = httpx.Timeout(
+            self.read_timeout, connect=self.connect_timeout, pool=None
+        )
+        return AsyncTwitterClient(
+            self.get_api(app_only),
+            oauth_client,
+            bearer_token=bearer_token,
+            limits=limits,
+            timeout=timeout,
+            on_response=self.get_rate_limiter(app_only).update_from_response,
+        )
+
+    def _build_session(self, app_only: bool = False) -> _PersistentSession:
+        """
+        Builds a session whose pool blocks once `pool_maxsize` connections
+        per host are in use, bounding the number of open sockets.
+        """
+        session = _PersistentSession()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        session.hooks["response"].append(
+            self.get_rate_limiter(app_only).update_from_response
+        )
+        return session
+
+
+class TwitterCredentialsPool(Block):
+    """
+    Block used to spread calls across several Twitter apps or accounts. Each
+    call is made with the credentials that have the most rate limit quota
+    left for the endpoint, so read and upload throughput scales with the
+    number of credentials. A pool can be passed to `get_status` and
+    `media_upload` in place of `TwitterCredentials`. Tweets are never posted,
+    the home and mentions timelines never read, and upload statuses never
+    checked from a pool, since the account would be arbitrary; media
+    uploaded from a pool can be attached by the posting account if it is
+    listed in `additional_owners`.
+
+    Attributes:
+        credentials: The Twitter credentials to spread calls across.
+
+    Example:
+        Load a stored Twitter credentials pool:
+        ```python
+        from prefect_twitter import TwitterCredentialsPool
+        twitter_credentials_pool = TwitterCredentialsPool.load("BLOCK_NAME")
+        ```
+    """  # noqa E501
+
+    _block_type_name = "Twitter Credentials Pool"
+    _logo_url = "https://cdn.sanity.io/images/3ugk85nk/production/747aa724fedcefd1c1cec248ab7a5b518a1191cd-250x250.png"  # noqa
+    _documentation_url = "https://prefecthq.github.io/prefect-twitter/credentials/#prefect_twitter.credentials.TwitterCredentialsPool"  # noqa
+
+    credentials: List[TwitterCredentials] = Field(
+        ...,
+        min_items=1,
+        description="The Twitter credentials to spread calls across.",
+    )
+
+    def select_credentials(self, method: str) -> TwitterCredentials:
+        """
+        Selects the credentials with the most rate limit quota left for the
+        endpoint of a `tweepy.API` method. Credentials whose quota is not
+        known yet are preferred, and ties are broken at random.
+
+        Args:
+            method: The name of the `tweepy.API` method, e.g. `get_status`.
+
+        Returns:
+            The selected credentials.
+        """
+        endpoint = METHOD_ENDPOINTS.get(method)
+        if endpoint is None:
+            return random.choice(self.credentials)
+
+        quotas = [
+            credentials.get_remaining_calls(method) for credentials in self.credentials
+        ]
+        best = max(quotas)
+        return random.choice(
+            [c for c, quota in zip(self.credentials, quotas) if quota == best]
+        )
+
+    async def call_api(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Calls a `tweepy.API` method with the credentials selected by
+        `select_credentials`; see `TwitterCredentials.call_api`.
+
+        Args:
+            method: The name of the `tweepy.API` method, e.g. `get_status`.
+            *args: Positional arguments to pass to the method.
+            **kwargs: Keyword arguments to pass to
+                `TwitterCredentials.call_api`.
+
+        Returns:
+            The return value of the method.
+
+        Example:
+            Looks up a Tweet with the least used credentials.
+            ```python
+            from prefect import flow
+            from prefect_twitter import TwitterCredentialsPool
+
+            @flow
+            async def example_call_api_flow():
+                twitter_credentials_pool = TwitterCredentialsPool.load("BLOCK_NAME")
+                status = await twitter_credentials_pool.call_api(
+                    "get_status", 1504591031626571777
+                )
+                return status
+
+            example_call_api_flow()
+            ```
+        """
+        if method == "update_status":
+            raise ValueError(
+                "Tweets cannot be posted with a TwitterCredentialsPool; "
+                "use the TwitterCredentials of the posting account"
+            )
+        if method == "get_media_upload_status":
+            raise ValueError(
+                "The upload status of media can only be checked by the account "
+                "that uploaded it, so it cannot be checked with a "
+                "TwitterCredentialsPool; use the TwitterCredentials of that account"
+            )
+        if method in ACCOUNT_METHODS:
+            raise ValueError(
+                f"{method} reads the authenticating account, so it cannot be "
+                "called with a TwitterCredentialsPool; use the "
+                "TwitterCredentials of that account"
+            )
+        credentials = self.select_credentials(method)
+        return await credentials.call_api(method, *args, **kwargs)
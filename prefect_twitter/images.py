@@ -0,0 +1,143 @@
+"""Optimization of images before they are uploaded"""
+
+import io
+from typing import Literal, NamedTuple
+
+# Twitter rejects images larger than 5 MB
+MAX_IMAGE_BYTES = 5 * 1000 * 1000
+
+# the smallest longest edge images are downscaled to in order to fit a budget
+MIN_IMAGE_EDGE = 64
+
+
+class ImageOptions(NamedTuple):
+    """
+    How `optimize_image` resizes and re-encodes an image.
+
+    Attributes:
+        max_edge: The maximum length of the longest edge, in pixels.
+        max_bytes: The maximum size of the encoded image.
+        format: The format to encode the image in, `JPEG` or `WEBP`.
+        quality: The encoder quality to start from, from 1 to 100.
+        min_quality: The lowest encoder quality used before the image is
+            downscaled further to fit `max_bytes`.
+
+    Example:
+        Targets WebP images of at most 1 MB.
+        ```python
+        from prefect_twitter.images import ImageOptions
+
+        options = ImageOptions(max_bytes=1000000, format="WEBP")
+        ```
+    """
+
+    max_edge: int = 2048
+    max_bytes: int = MAX_IMAGE_BYTES
+    format: Literal["JPEG", "WEBP"] = "JPEG"
+    quality: int = 85
+    min_quality: int = 40
+
+
+def _import_pil():
+    """
+    Imports Pillow, which only image optimization needs.
+    """
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        raise ImportError(
+            "Pillow is required to optimize images; "
+            "install it with `pip install pillow`"
+        ) from None
+    return Image, ImageOps
+
+
+def _encode(image, options: ImageOptions, quality: int) -> bytes:
+    """
+    Encodes an image without its metadata, which is only written if passed.
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, options.format, quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def _encode_within_budget(image, options: ImageOptions):
+    """
+    Encodes an image at the highest quality that fits the byte budget, or
+    returns None if even the lowest quality does not fit.
+    """
+    low, high = options.min_quality, options.quality
+    best = None
+    while low <= high:
+        quality = (low + high) // 2
+        encoded = _encode(image, options, quality)
+        if len(encoded) <= options.max_bytes:
+            best = encoded
+            low = quality + 1
+        else:
+            high = quality - 1
+    return best
+
+
+def optimize_image(content: bytes, options: ImageOptions = ImageOptions()) -> bytes:
+    """
+    Downsizes an image to a longest edge and re-encodes it within a byte
+    budget, dropping metadata such as EXIF and embedded profiles. The image
+    is first rotated as its EXIF orientation says, since that is dropped
+    too. The highest quality that fits the budget is found by bisection,
+    and if none does, the image is downscaled further.
+
+    Animated images are returned unchanged, since re-encoding would keep
+    only their first frame. So are images that already fit `max_edge` and
+    `max_bytes` when re-encoding them does not make them smaller.
+
+    Decoding and encoding are CPU bound, so in async code this should run in
+    a worker thread, e.g. with `loop.run_in_executor`, as `media_upload`
+    does; Pillow releases the GIL while it works, so threads optimize images
+    in parallel without the startup cost of a worker process.
+
+    Args:
+        content: The encoded image, in any format Pillow reads.
+        options: How to resize and re-encode the image.
+
+    Returns:
+        The optimized image, encoded in `options.format`, or `content` if it
+            is left unchanged.
+
+    Example:
+        Shrinks a screenshot before uploading it.
+        ```python
+        from prefect_twitter.images import ImageOptions, optimize_image
+
+        with open("/path/to/screenshot.png", "rb") as fp:
+            content = optimize_image(fp.read(), ImageOptions(max_edge=1600))
+        ```
+    """
+    Image, ImageOps = _import_pil()
+    with Image.open(io.BytesIO(content)) as image:
+        if getattr(image, "is_animated", False):
+            return content
+        fits = len(content) <= options.max_bytes and (
+            max(image.size) <= options.max_edge
+        )
+        image = ImageOps.exif_transpose(image)
+        if options.format == "JPEG" and image.mode != "RGB":
+            # JPEG has no alpha channel, so transparency becomes white
+            background = Image.new("RGB", image.size, "white")
+            rgba = image.convert("RGBA")
+            background.paste(rgba, mask=rgba.getchannel("A"))
+            image = background
+        elif image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        image.thumbnail((options.max_edge, options.max_edge), Image.LANCZOS)
+
+        while True:
+            encoded = _encode_within_budget(image, options)
+            if encoded is not None:
+                return content if fits and len(encoded) >= len(content) else encoded
+            if max(image.size) <= MIN_IMAGE_EDGE:
+                raise ValueError(
+                    f"The image cannot be encoded within {options.max_bytes} bytes"
+                )
+            size = tuple(max(round(edge * 0.75), 1) for edge in image.size)
+            image = image.resize(size, Image.LANCZOS)
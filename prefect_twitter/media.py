@@ -1,27 +1,485 @@
 """This is a module for interacting with Twitter media"""
 
+import asyncio
+import hashlib
+import io
+import mimetypes
+import mmap
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
+import anyio
 from anyio import to_thread
 from prefect import get_run_logger, task
 
+from prefect_twitter.cache import LRUCache
+from prefect_twitter.concurrency import gather
+from prefect_twitter.images import ImageOptions, optimize_image
+from prefect_twitter.store import MediaStore
+
 if TYPE_CHECKING:
     from io import IOBase
 
     from tweepy import Media
 
-    from prefect_twitter import TwitterCredentials
+    from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+
+# the chunk size limits of the chunked upload endpoints
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 5 * 1024 * 1024
+MAX_SEGMENTS = 1000
+
+# media IDs expire a day after upload; reuse them for less, so there is time
+# left to post them
+MEDIA_ID_MAX_AGE = 23 * 60 * 60
+
+# upload arguments that do not change the uploaded media
+_TRANSFER_ARGUMENTS = frozenset({"chunk_size", "wait_for_async_finalize"})
+
+# image types the optimization applies to; GIFs are almost always animated,
+# and animated PNGs and WebPs are left as is by `optimize_image`
+_OPTIMIZED_TYPES = frozenset(
+    {"image/jpeg", "image/png", "image/webp", "image/bmp", "image/tiff"}
+)
+
+# maps (owner, variant, content hash) to (upload time, media ID)
+_media_ids = LRUCache(maxsize=1024, ttl=MEDIA_ID_MAX_AGE)
+_media_stores = LRUCache(maxsize=32, on_evict=lambda key, store: store.close())
+
+# Pillow releases the GIL while decoding, resizing and encoding, so images are
+# optimized in threads, which unlike worker processes start instantly and need
+# no `if __name__ == "__main__":` guard in the calling script
+_optimize_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 1, thread_name_prefix="prefect-twitter-images"
+)
+
+
+def get_chunk_size(total_bytes: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Clamps a chunk size to what Twitter accepts: at most 5 MiB per segment
+    and at most 1000 segments per upload.
+
+    Args:
+        total_bytes: The size of the media.
+        chunk_size: The requested chunk size.
+
+    Returns:
+        The chunk size to upload the media with.
+    """
+    return max(min(chunk_size, MAX_CHUNK_SIZE), -(-total_bytes // MAX_SEGMENTS), 1)
+
+
+class MediaSource:
+    """
+    A read-only view of media to upload that is not copied into memory.
+    Local files are memory-mapped, and in-memory buffers such as
+    `io.BytesIO` are viewed in place, so segments are `memoryview` slices
+    handed straight to the HTTP layer. Once a segment has been sent, its
+    pages can be dropped with `release`, so the resident memory of an
+    upload stays near the size of the segments in flight however large the
+    file is. File objects that are neither are read once as a fallback.
+
+    Args:
+        filename: The path of the media, read if `file` is not specified.
+        file: A file object to upload from its current position instead.
+
+    Example:
+        Gets the first megabyte of a video.
+        ```python
+        from prefect_twitter.media import MediaSource
+
+        with MediaSource("/path/to/prefection.mp4") as source:
+            segment = source.segment(0, 1024 * 1024)
+        ```
+    """
+
+    def __init__(self, filename: Union[Path, str], file: Optional["IOBase"] = None):
+        self._mmap = None
+        self._fp = None
+        self._buffer = None
+        self._view = None
+        try:
+            if file is None:
+                self._fp = file = open(filename, "rb")
+            offset = file.tell()
+            if hasattr(file, "getbuffer"):
+                self._buffer = file.getbuffer()
+            elif self._can_map(file):
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                if hasattr(self._mmap, "madvise"):
+                    self._mmap.madvise(mmap.MADV_SEQUENTIAL)
+                self._buffer = self._mmap
+            else:
+                self._buffer, offset = file.read(), 0
+            self._offset = offset
+            self._view = memoryview(self._buffer)[offset:]
+        except BaseException:
+            self.close()
+            raise
+
+    @staticmethod
+    def _can_map(file: "IOBase") -> bool:
+        """
+        Checks whether a file object is backed by a non-empty file on disk;
+        empty files cannot be memory-mapped.
+        """
+        try:
+            return os.fstat(file.fileno()).st_size > 0
+        except (AttributeError, OSError):
+            return False
+
+    def __len__(self) -> int:
+        """
+        Gets the size of the media, from the starting position of the file.
+        """
+        return len(self._view)
+
+    def segment(self, start: int, end: int) -> memoryview:
+        """
+        Gets a segment of the media without copying it.
+
+        Args:
+            start: The offset of the segment.
+            end: The offset after the segment.
+
+        Returns:
+            A view of the segment.
+        """
+        return self._view[start:end]
+
+    def release(self, start: int, end: int) -> None:
+        """
+        Drops the pages of a memory-mapped segment from resident memory; they
+        are read from disk again if the segment is used again.
+
+        Args:
+            start: The offset of the segment.
+            end: The offset after the segment.
+        """
+        if self._mmap is None or not hasattr(mmap, "MADV_DONTNEED"):
+            return
+        start = self._offset + max(start, 0)
+        end = min(self._offset + end, len(self._mmap))
+        # madvise needs a page-aligned start; the pages before it are simply
+        # read again if a neighbouring segment still needs them
+        aligned = start - start % mmap.PAGESIZE
+        if end > aligned:
+            self._mmap.madvise(mmap.MADV_DONTNEED, aligned, end - aligned)
+
+    def close(self) -> None:
+        """
+        Releases the view and closes the mapping and the file it opened.
+        """
+        if self._view is not None:
+            self._view.release()
+        if isinstance(self._buffer, memoryview):
+            self._buffer.release()
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # a segment is still referenced; the mapping is closed once
+                # it is garbage collected
+                pass
+        if self._fp is not None:
+            self._fp.close()
+
+    def __enter__(self) -> "MediaSource":
+        """
+        Returns the source itself, to be closed on exit.
+        """
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """
+        Closes the source.
+        """
+        self.close()
+
+
+def get_content_hash(
+    filename: Union[Path, str], file: Optional["IOBase"] = None
+) -> str:
+    """
+    Hashes the content of media without loading it into memory, leaving
+    the position of `file` unchanged.
+
+    Args:
+        filename: The path of the media, read if `file` is not specified.
+        file: A file object to hash from its current position instead.
+
+    Returns:
+        The SHA-256 hex digest of the content.
+
+    Example:
+        Hashes an image.
+        ```python
+        from prefect_twitter.media import get_content_hash
+
+        content_hash = get_content_hash("/path/to/prefection.jpg")
+        ```
+    """
+    position = file.tell() if file is not None else None
+    try:
+        with MediaSource(filename, file) as source:
+            return hashlib.sha256(source.segment(0, len(source))).hexdigest()
+    finally:
+        if position is not None:
+            file.seek(position)
+
+
+def clear_media_cache() -> None:
+    """
+    Forgets the media IDs reused by `media_upload` in this process and
+    closes the media stores; the stores on disk are kept.
+    """
+    _media_ids.clear()
+    _media_stores.clear()
+
+
+def _get_media_key(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    content_hash: str,
+    kwargs: Dict[str, Any],
+) -> Tuple[str, str, str]:
+    """
+    Gets the key of uploaded media: the accounts that may have uploaded it,
+    the arguments changing the media and the hash of its content.
+    """
+    members = getattr(twitter_credentials, "credentials", [twitter_credentials])
+    hasher = hashlib.sha256()
+    for credentials in members:
+        hasher.update(
+            f"{credentials.consumer_key}\0{credentials.access_token}\0".encode()
+        )
+    variant = repr(
+        sorted(
+            (name, value)
+            for name, value in kwargs.items()
+            if name not in _TRANSFER_ARGUMENTS
+        )
+    )
+    return hasher.hexdigest(), variant, content_hash
+
+
+def _get_media_store(path: str) -> MediaStore:
+    """
+    Gets the media store at a path, shared by the calls in this process.
+    """
+    return _media_stores.get_or_set(
+        (path, MEDIA_ID_MAX_AGE), lambda: MediaStore(path, max_age=MEDIA_ID_MAX_AGE)
+    )
+
+
+def _get_reusable_media_id(
+    key: Tuple[str, str, str], media_cache_path: Optional[str]
+) -> Optional[int]:
+    """
+    Gets the ID of media uploaded earlier with the same key, from memory or
+    from the media store, if it has not expired.
+    """
+    entry = _media_ids.get(key)
+    if entry is None and media_cache_path is not None:
+        entry = _get_media_store(media_cache_path).get(*key)
+        if entry is not None:
+            media_id, uploaded_at = entry
+            entry = (uploaded_at, media_id)
+            _media_ids.set(key, entry)
+    if entry is None or time.time() - entry[0] > MEDIA_ID_MAX_AGE:
+        return None
+    return entry[1]
+
+
+def _remember_media_id(
+    key: Tuple[str, str, str], media_id: int, media_cache_path: Optional[str]
+) -> None:
+    """
+    Records the ID of uploaded media in memory and in the media store.
+    """
+    uploaded_at = time.time()
+    _media_ids.set(key, (uploaded_at, media_id))
+    if media_cache_path is not None:
+        _get_media_store(media_cache_path).put(*key, media_id, uploaded_at)
+
+
+def _read_content(filename: Union[Path, str], file: Optional["IOBase"]) -> bytes:
+    """
+    Reads media from the file object or from disk.
+    """
+    if file is not None:
+        return file.read()
+    with open(filename, "rb") as fp:
+        return fp.read()
+
+
+async def _optimize_media(
+    filename: Union[Path, str], file: Optional["IOBase"], options: ImageOptions
+) -> Tuple[str, "IOBase"]:
+    """
+    Optimizes an image in a worker thread, returning the filename and file
+    to upload instead.
+    """
+    content = await to_thread.run_sync(_read_content, filename, file)
+    optimized = await asyncio.get_running_loop().run_in_executor(
+        _optimize_executor, optimize_image, content, options
+    )
+    if optimized == content:
+        get_run_logger().info("Uploading %s as is; it is already optimal", filename)
+        return str(filename), io.BytesIO(content)
+    get_run_logger().info(
+        "Optimized %s from %s to %s bytes", filename, len(content), len(optimized)
+    )
+    suffix = ".jpg" if options.format == "JPEG" else ".webp"
+    return str(Path(filename).with_suffix(suffix)), io.BytesIO(optimized)
+
+
+async def chunked_upload(
+    filename: Union[Path, str],
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    file: Optional["IOBase"] = None,
+    file_type: Optional[str] = None,
+    media_category: Optional[str] = None,
+    additional_owners: Optional[List[Union[int, str]]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_concurrent_segments: int = 4,
+    wait_for_async_finalize: bool = True,
+    max_retries: Optional[int] = None,
+) -> "Media":
+    """
+    Uploads media with the INIT, APPEND and FINALIZE commands, sending up to
+    `max_concurrent_segments` APPEND segments at once instead of one after
+    another, so large videos are not bound by the throughput of a single
+    connection. Each segment keeps the index of its position in the file and
+    is retried on its own, so a failed segment does not restart the upload.
+    Segments are read from a `MediaSource`, so the file is never loaded into
+    memory as a whole.
+    With a `TwitterCredentialsPool`, all commands use the same credentials,
+    since segments can only be appended by the account that started the
+    upload.
+
+    Args:
+        filename: The filename of the media, used for MIME type detection.
+        twitter_credentials: Credentials to use for authentication with Twitter.
+        file: A file object to upload instead of the file at `filename`.
+        file_type: The MIME type of the media; guessed from `filename` if
+            not specified.
+        media_category: The category of the media, e.g. `tweet_video`.
+        additional_owners: The IDs of other users allowed to use the media.
+        chunk_size: The size of each segment, clamped to what Twitter accepts.
+        max_concurrent_segments: The maximum number of segments uploaded at
+            once.
+        wait_for_async_finalize: Whether to wait until Twitter has finished
+            processing the media.
+        max_retries: The number of times to retry each rate limited or failed
+            request; defaults to the `max_retries` of the credentials.
+
+    Returns:
+        The uploaded media.
+
+    Example:
+        Uploads a video with eight concurrent segments.
+        ```python
+        from prefect import flow
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.media import chunked_upload
+
+        @flow
+        async def example_chunked_upload_flow():
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            media = await chunked_upload(
+                "/path/to/prefection.mp4",
+                twitter_credentials,
+                media_category="tweet_video",
+                max_concurrent_segments=8,
+            )
+            return media.media_id
+
+        example_chunked_upload_flow()
+        ```
+    """
+    if max_concurrent_segments < 1:
+        raise ValueError("max_concurrent_segments must be at least 1")
+    if hasattr(twitter_credentials, "select_credentials"):
+        twitter_credentials = twitter_credentials.select_credentials(
+            "chunked_upload_init"
+        )
+    if file_type is None:
+        file_type = mimetypes.guess_type(str(filename))[0]
+    if file_type is None:
+        raise ValueError(f"Could not determine the MIME type of {filename}")
+
+    source = await to_thread.run_sync(MediaSource, filename, file)
+    try:
+        total_bytes = len(source)
+        chunk_size = get_chunk_size(total_bytes, chunk_size)
+        media = await twitter_credentials.call_api(
+            "chunked_upload_init",
+            total_bytes,
+            file_type,
+            media_category=media_category,
+            additional_owners=additional_owners,
+            max_retries=max_retries,
+        )
+        media_id = media.media_id
+
+        limiter = anyio.CapacityLimiter(max_concurrent_segments)
+
+        async def append(segment_index):
+            """
+            Appends one segment once fewer than the maximum are in flight.
+            """
+            async with limiter:
+                start = segment_index * chunk_size
+                end = start + chunk_size
+                await twitter_credentials.call_api(
+                    "chunked_upload_append",
+                    media_id,
+                    (str(filename), source.segment(start, end)),
+                    segment_index,
+                    max_retries=max_retries,
+                )
+                source.release(start, end)
+
+        # segments are started in order, so they tend to complete in order;
+        # a segment failing after its retries cancels the others
+        await gather(
+            partial(append, segment_index)
+            for segment_index in range(-(-total_bytes // chunk_size))
+        )
+    finally:
+        source.close()
+
+    media = await twitter_credentials.call_api(
+        "chunked_upload_finalize", media_id, max_retries=max_retries
+    )
+    while wait_for_async_finalize and (
+        getattr(media, "processing_info", None)
+        and media.processing_info["state"] in ("pending", "in_progress")
+        and "error" not in media.processing_info
+    ):
+        await anyio.sleep(media.processing_info["check_after_secs"])
+        media = await twitter_credentials.call_api(
+            "get_media_upload_status", media_id, max_retries=max_retries
+        )
+    return media
 
 
 @task
 async def media_upload(
     filename: Union[Path, str],
-    twitter_credentials: "TwitterCredentials",
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
     file: Optional["IOBase"] = None,
     chunked: bool = False,
-    **kwargs: dict
+    max_retries: Optional[int] = None,
+    max_concurrent_segments: int = 4,
+    reuse_media: bool = False,
+    media_cache_path: Optional[str] = None,
+    optimize: Union[bool, ImageOptions] = False,
+    **kwargs: dict,
 ) -> int:
     """
     Uploads media to Twitter. Chunked media upload
@@ -31,12 +489,33 @@ async def media_upload(
         filename: The filename of the image to upload.
             This field is used for MIME type detection.
         twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` may be passed to spread calls across
+            several credentials.
         file: A file object to upload. If not specified, this task will attempt to
             locate and upload a file with the name specified in filename.
         chunked: Whether or not to use chunked media upload.
             Videos use chunked upload regardless of this parameter.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        max_concurrent_segments: The maximum number of segments of a chunked
+            upload sent at once; see `chunked_upload`.
+        reuse_media: Whether to return the ID of media uploaded earlier with
+            the same content, credentials and arguments instead of
+            uploading it again, as long as the ID has not expired.
+        media_cache_path: The path of a SQLite database keeping the IDs of
+            uploaded media, so that they are reused across flow runs when
+            `reuse_media` is set; by default they are only kept in memory.
+        optimize: Whether to resize and re-encode images before uploading
+            them, stripping their metadata; see `optimize_image`. Pass
+            `ImageOptions` to change the size, byte budget or format. The
+            work runs in a pool of worker threads shared by the process,
+            since Pillow releases the GIL, so no worker process is started
+            and scripts calling the flow at module level need no
+            `if __name__ == "__main__":` guard. GIFs and videos are uploaded
+            as is.
         kwargs: Additional keyword arguments to pass to
-            [media_upload](https://docs.tweepy.org/en/stable/api.html#tweepy.API.media_upload).
+            [media_upload](https://docs.tweepy.org/en/stable/api.html#tweepy.API.media_upload),
+            or to `chunked_upload` for chunked uploads.
     Returns:
         The media ID.
 
@@ -61,21 +540,207 @@ async def media_upload(
         example_media_upload_flow()
         ```
     """  # noqa
+    return await _upload_media(
+        filename,
+        twitter_credentials,
+        file=file,
+        chunked=chunked,
+        max_retries=max_retries,
+        max_concurrent_segments=max_concurrent_segments,
+        reuse_media=reuse_media,
+        media_cache_path=media_cache_path,
+        optimize=optimize,
+        **kwargs,
+    )
+
+
+@task
+async def media_upload_many(
+    media: List[Union[Path, str, Tuple[Union[Path, str], "IOBase"]]],
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    chunked: bool = False,
+    max_retries: Optional[int] = None,
+    max_concurrent_uploads: int = 4,
+    max_concurrent_segments: int = 4,
+    reuse_media: bool = False,
+    media_cache_path: Optional[str] = None,
+    optimize: Union[bool, ImageOptions] = False,
+    raise_on_error: bool = False,
+    **kwargs: dict,
+) -> List[Union[int, Exception]]:
+    """
+    Uploads several media concurrently, e.g. the images of one Tweet, so the
+    uploads take as long as the slowest one instead of their sum. The
+    requests still go through the rate limiter and thread pool of the
+    credentials. A failed upload does not cancel the others; its error is
+    returned in place of its media ID, unless `raise_on_error` is set.
+
+    Args:
+        media: The media to upload, each a filename or a pair of a filename,
+            used for MIME type detection, and a file object to upload.
+        twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` may be passed to spread calls across
+            several credentials.
+        chunked: Whether or not to use chunked media upload.
+            Videos use chunked upload regardless of this parameter.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        max_concurrent_uploads: The maximum number of media uploaded at once.
+        max_concurrent_segments: The maximum number of segments of each
+            chunked upload sent at once; see `chunked_upload`.
+        reuse_media: Whether to reuse the IDs of media uploaded earlier with
+            the same content; see `media_upload`.
+        media_cache_path: The path of a SQLite database keeping the IDs of
+            uploaded media; see `media_upload`.
+        optimize: Whether to resize and re-encode images before uploading
+            them; see `media_upload`.
+        raise_on_error: Whether to raise the error of the first failed
+            upload, in the order of `media`, once every upload has finished,
+            instead of returning it.
+        kwargs: Additional keyword arguments to pass to every upload; see
+            `media_upload`.
+    Returns:
+        The media ID of each upload, or the exception it failed with, in the
+            order of `media`.
+
+    Example:
+        Tweets a gallery of charts.
+        ```python
+        from prefect import flow
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.media import media_upload_many
+        from prefect_twitter.tweets import update_status
+
+        @flow
+        def example_media_upload_many_flow():
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            # a gallery missing a chart is not posted
+            media_ids = media_upload_many(
+                ["/path/to/daily.png", "/path/to/weekly.png", "/path/to/monthly.png"],
+                twitter_credentials,
+                raise_on_error=True,
+            )
+            status_id = update_status(
+                twitter_credentials, status="Our numbers", media_ids=media_ids
+            )
+            return status_id
+
+        example_media_upload_many_flow()
+        ```
+    """  # noqa
+    if max_concurrent_uploads < 1:
+        raise ValueError("max_concurrent_uploads must be at least 1")
     logger = get_run_logger()
-    logger.info("Uploading media named %s", filename)
+    limiter = anyio.CapacityLimiter(max_concurrent_uploads)
+    results: List[Union[int, Exception]] = [None] * len(media)
 
-    api = twitter_credentials.get_api()
-    partial_media = partial(
-        api.media_upload, filename=filename, file=file, chunked=chunked, **kwargs
-    )
-    media = await to_thread.run_sync(partial_media)
+    async def upload(index, item):
+        """
+        Uploads one item, recording its media ID or the error it failed with.
+        """
+        filename, file = item if isinstance(item, tuple) else (item, None)
+        async with limiter:
+            try:
+                results[index] = await _upload_media(
+                    filename,
+                    twitter_credentials,
+                    file=file,
+                    chunked=chunked,
+                    max_retries=max_retries,
+                    max_concurrent_segments=max_concurrent_segments,
+                    reuse_media=reuse_media,
+                    media_cache_path=media_cache_path,
+                    optimize=optimize,
+                    **kwargs,
+                )
+            except Exception as exc:
+                logger.warning("Failed to upload media named %s: %r", filename, exc)
+                results[index] = exc
+
+    async with anyio.create_task_group() as tg:
+        for index, item in enumerate(media):
+            tg.start_soon(upload, index, item)
+    if raise_on_error:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+
+async def _upload_media(
+    filename: Union[Path, str],
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    file: Optional["IOBase"] = None,
+    chunked: bool = False,
+    max_retries: Optional[int] = None,
+    max_concurrent_segments: int = 4,
+    reuse_media: bool = False,
+    media_cache_path: Optional[str] = None,
+    optimize: Union[bool, ImageOptions] = False,
+    **kwargs: Any,
+) -> int:
+    """
+    Uploads media, or reuses an earlier upload; see `media_upload`.
+    """
+    logger = get_run_logger()
+    options = ImageOptions() if optimize is True else optimize or None
+    file_type = kwargs.get("file_type") or mimetypes.guess_type(str(filename))[0]
+    if file_type not in _OPTIMIZED_TYPES:
+        options = None
+
+    if reuse_media:
+        # the original content is hashed, so reused media is not optimized again
+        content_hash = await to_thread.run_sync(get_content_hash, filename, file)
+        variant = kwargs if options is None else {**kwargs, "optimize": options}
+        key = _get_media_key(twitter_credentials, content_hash, variant)
+        media_id = await to_thread.run_sync(
+            _get_reusable_media_id, key, media_cache_path
+        )
+        if media_id is not None:
+            logger.info("Reusing media %s with the content of %s", media_id, filename)
+            return media_id
+
+    if options is not None:
+        filename, file = await _optimize_media(filename, file, options)
+        file_type = mimetypes.guess_type(filename)[0]
+        if "file_type" in kwargs:
+            kwargs["file_type"] = file_type
+
+    logger.info("Uploading media named %s", filename)
+    if chunked or (file_type or "").startswith("video/"):
+        media = await chunked_upload(
+            filename,
+            twitter_credentials,
+            file=file,
+            max_retries=max_retries,
+            max_concurrent_segments=max_concurrent_segments,
+            **kwargs,
+        )
+    else:
+        media = await twitter_credentials.call_api(
+            "media_upload",
+            filename=filename,
+            file=file,
+            chunked=chunked,
+            max_retries=max_retries,
+            **kwargs,
+        )
     media_id = media.media_id
+
+    # media that failed processing, or may still fail it, is not reused
+    processing_info = getattr(media, "processing_info", None)
+    if reuse_media and (
+        not processing_info or processing_info.get("state") == "succeeded"
+    ):
+        await to_thread.run_sync(_remember_media_id, key, media_id, media_cache_path)
     return media_id
 
 
 @task
 async def get_media_upload_status(
-    media_id: int, twitter_credentials: "TwitterCredentials"
+    media_id: int,
+    twitter_credentials: "TwitterCredentials",
+    max_retries: Optional[int] = None,
 ) -> "Media":
     """
     Check on the progress of a chunked media upload. If the upload has succeeded,
@@ -83,7 +748,10 @@ async def get_media_upload_status(
 
     Args:
         media_id: The ID of the media to check.
-        twitter_credentials: Credentials to use for authentication with Twitter.
+        twitter_credentials: Credentials of the account that uploaded the
+            media; a `TwitterCredentialsPool` cannot be used.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
 
     Returns:
         The Media object.
@@ -110,7 +778,7 @@ async def get_media_upload_status(
         example_get_media_upload_status_flow()
         ```
     """
-    api = twitter_credentials.get_api()
-    partial_get = partial(api.get_media_upload_status, media_id)
-    media = await to_thread.run_sync(partial_get)
+    media = await twitter_credentials.call_api(
+        "get_media_upload_status", media_id, max_retries=max_retries
+    )
     return media
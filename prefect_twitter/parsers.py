@@ -0,0 +1,142 @@
+"""Parsers turning Twitter API responses into the values returned by the tasks"""
+
+from typing import Any, Dict, Union
+
+from tweepy.errors import TweepyException
+from tweepy.parsers import JSONParser, ModelParser, Parser
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# decodes responses into plain dicts and lists instead of tweepy models
+RAW_PARSER = JSONParser()
+
+
+def _loads(payload: Union[str, bytes]) -> Any:
+    """
+    Decodes a JSON payload with orjson, raising the error tweepy raises.
+    """
+    try:
+        return orjson.loads(payload)
+    except orjson.JSONDecodeError as exc:
+        raise TweepyException(f"Failed to parse JSON payload: {exc}")
+
+
+def _split_cursors(json: Any, return_cursors: bool) -> Any:
+    """
+    Pairs a decoded payload with its cursors, like `tweepy.parsers.JSONParser`.
+    """
+    if return_cursors and isinstance(json, dict):
+        if "next" in json:
+            return json, json["next"]
+        elif "next_cursor" in json:
+            if "previous_cursor" in json:
+                return json, (json["previous_cursor"], json["next_cursor"])
+            return json, json["next_cursor"]
+    return json
+
+
+class OrjsonParser(JSONParser):
+    """
+    A `tweepy.parsers.JSONParser` decoding responses with orjson.
+    """
+
+    def parse(self, payload, *, return_cursors=False, **kwargs):
+        """
+        Decodes a response payload, paired with its cursors if
+        `return_cursors` is set.
+        """
+        if not payload:
+            return
+        return _split_cursors(_loads(payload), return_cursors)
+
+
+class OrjsonModelParser(ModelParser):
+    """
+    A `tweepy.parsers.ModelParser` decoding responses with orjson before
+    building tweepy models.
+    """
+
+    def parse(
+        self, payload, *, api=None, payload_list=False, payload_type=None, **kwargs
+    ):
+        """
+        Decodes a response payload into the tweepy models of `payload_type`,
+        paired with its cursors if `return_cursors` is set.
+        """
+        if payload_type is None:
+            return
+        try:
+            model = getattr(self.model_factory, payload_type)
+        except AttributeError:
+            raise TweepyException(f"No model for this payload type: {payload_type}")
+
+        json = OrjsonParser.parse(self, payload, **kwargs)
+        json, cursors = json if isinstance(json, tuple) else (json, None)
+        try:
+            if payload_list:
+                result = model.parse_list(api, json)
+            else:
+                result = model.parse(api, json)
+        except KeyError:
+            raise TweepyException(f"Unable to parse response payload: {json}") from None
+        return (result, cursors) if cursors else result
+
+
+_PARSERS: Dict[Any, Parser] = {
+    ("json", False): ModelParser(),
+    ("json", True): RAW_PARSER,
+}
+if orjson is not None:
+    _PARSERS[("orjson", False)] = OrjsonModelParser()
+    _PARSERS[("orjson", True)] = OrjsonParser()
+
+
+def get_parser(json_library: str = "auto", raw: bool = False) -> Parser:
+    """
+    Gets a shared parser decoding responses with a JSON library.
+
+    Args:
+        json_library: `json` for the standard library, `orjson` for orjson,
+            or `auto` for orjson if it is installed and json otherwise.
+        raw: Whether to get a parser returning dicts and lists instead of
+            tweepy models.
+
+    Returns:
+        The parser.
+
+    Example:
+        Builds a Tweepy API decoding responses with orjson.
+        ```python
+        from tweepy import API
+        from prefect_twitter.parsers import get_parser
+
+        api = API(parser=get_parser("orjson"))
+        ```
+    """
+    if json_library == "auto":
+        json_library = "json" if orjson is None else "orjson"
+    if json_library == "orjson" and orjson is None:
+        raise ImportError(
+            "orjson is required to parse responses with it; "
+            "install it with `pip install orjson`"
+        )
+    return _PARSERS[(json_library, raw)]
+
+
+def get_payload_id(payload: Union[Any, Dict[str, Any]]) -> int:
+    """
+    Gets the ID of a status, whether it was parsed into a tweepy model or
+    returned raw as a dict.
+
+    Args:
+        payload: The tweepy model or decoded dict.
+
+    Returns:
+        The ID of the status.
+    """
+    if isinstance(payload, dict):
+        return payload["id"]
+    return payload.id
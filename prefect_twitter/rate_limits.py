@@ -0,0 +1,172 @@
+"""Client-side scheduling of calls within Twitter's per-endpoint rate limits"""
+
+import threading
+import time
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+import anyio
+
+RATE_LIMIT_WINDOW = 15 * 60
+
+METHOD_ENDPOINTS = {
+    "update_status": "statuses/update",
+    "get_status": "statuses/show",
+    "lookup_statuses": "statuses/lookup",
+    "user_timeline": "statuses/user_timeline",
+    "home_timeline": "statuses/home_timeline",
+    "mentions_timeline": "statuses/mentions_timeline",
+    "search_tweets": "search/tweets",
+    "media_upload": "media/upload",
+    "get_media_upload_status": "media/upload",
+    "chunked_upload_init": "media/upload",
+    "chunked_upload_append": "media/upload",
+    "chunked_upload_finalize": "media/upload",
+}
+
+
+def endpoint_from_url(url: str) -> Optional[str]:
+    """
+    Gets the rate limited endpoint of a v1.1 request URL.
+
+    Args:
+        url: The request URL, e.g. `https://api.twitter.com/1.1/statuses/show.json`.
+
+    Returns:
+        The endpoint, e.g. `statuses/show`, or None if the URL is not a v1.1 URL.
+    """
+    path = urlparse(url).path
+    if not path.startswith("/1.1/"):
+        return None
+    endpoint = path[len("/1.1/") :]
+    if endpoint.endswith(".json"):
+        endpoint = endpoint[: -len(".json")]
+    return endpoint
+
+
+class _Bucket:
+    """
+    The tokens left for one endpoint in the current rate limit window.
+    """
+
+    __slots__ = ("limit", "remaining", "reset")
+
+    def __init__(self, limit: int, remaining: int, reset: float):
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = reset
+
+
+class RateLimiter:
+    """
+    A token bucket per endpoint, seeded from the `x-rate-limit-*` headers of
+    Twitter's responses. Calls wait for a token before being dispatched, so
+    once an endpoint's window is spent they sleep until it resets instead of
+    being rejected with HTTP 429. Endpoints without rate limit headers yet are
+    not throttled.
+
+    Example:
+        Waits for a token before calling an endpoint.
+        ```python
+        from prefect_twitter.rate_limits import RateLimiter
+
+        rate_limiter = RateLimiter()
+        await rate_limiter.acquire("statuses/show")
+        ```
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, endpoint: str) -> None:
+        """
+        Waits until a call to the endpoint is allowed and takes a token.
+
+        Args:
+            endpoint: The endpoint about to be called, e.g. `statuses/show`.
+        """
+        while True:
+            delay = self._reserve(endpoint)
+            if delay <= 0:
+                return
+            await anyio.sleep(delay)
+
+    def remaining(self, endpoint: str) -> Optional[int]:
+        """
+        Gets the number of calls to an endpoint left in its current window.
+
+        Args:
+            endpoint: The endpoint, e.g. `statuses/show`.
+
+        Returns:
+            The remaining calls, or None if the endpoint's limits are unknown.
+        """
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                return None
+            self._refill(bucket, time.time())
+            return bucket.remaining
+
+    def update(self, endpoint: str, headers: Mapping[str, str]) -> None:
+        """
+        Updates an endpoint's bucket from the rate limit headers of a response.
+
+        Args:
+            endpoint: The endpoint that was called.
+            headers: The response headers.
+        """
+        try:
+            limit = int(headers["x-rate-limit-limit"])
+            remaining = int(headers["x-rate-limit-remaining"])
+            reset = float(headers["x-rate-limit-reset"])
+        except (KeyError, TypeError, ValueError):
+            return
+
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None or bucket.reset != reset:
+                self._buckets[endpoint] = _Bucket(limit, remaining, reset)
+            else:
+                # calls reserved but still in flight are not reflected yet
+                bucket.limit = limit
+                bucket.remaining = min(bucket.remaining, remaining)
+
+    def update_from_response(self, response, *args, **kwargs) -> None:
+        """
+        Updates the bucket of the endpoint a response came from; usable as a
+        `requests` response hook.
+
+        Args:
+            response: A response with `url` and `headers` attributes.
+        """
+        endpoint = endpoint_from_url(str(response.url))
+        if endpoint is not None:
+            self.update(endpoint, response.headers)
+
+    def _reserve(self, endpoint: str) -> float:
+        """
+        Takes a token if one is available, returning 0, or otherwise returns
+        the seconds until the endpoint's window resets.
+        """
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                return 0
+            now = time.time()
+            self._refill(bucket, now)
+            if bucket.remaining > 0:
+                bucket.remaining -= 1
+                return 0
+            return bucket.reset - now
+
+    @staticmethod
+    def _refill(bucket: _Bucket, now: float) -> None:
+        """
+        Starts a new window for a bucket whose reset time has passed; the
+        next response corrects the provisional reset time.
+        """
+        if now >= bucket.reset:
+            bucket.remaining = bucket.limit
+            bucket.reset = now + RATE_LIMIT_WINDOW
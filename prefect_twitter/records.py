@@ -0,0 +1,107 @@
+"""Compact records of the Tweet fields pipelines use, cheap to store as results"""
+
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Union
+
+
+class Tweet(NamedTuple):
+    """
+    An immutable record of the fields of a status that pipelines use. Unlike
+    a `tweepy.Status`, it holds no nested models, API reference or copy of
+    the JSON, and it pickles as a plain tuple, so Prefect persists it as a
+    small result quickly.
+
+    Attributes:
+        id: The ID of the status.
+        text: The text of the status; the full text in extended mode.
+        author_id: The ID of the user who posted the status.
+        created_at: When the status was posted.
+        retweet_count: The number of times the status was retweeted.
+        favorite_count: The number of times the status was liked.
+        reply_count: The number of replies, if the response includes it.
+        quote_count: The number of quotes, if the response includes it.
+        media_keys: The keys of the media attached to the status.
+
+    Example:
+        Converts a status into a record.
+        ```python
+        from prefect_twitter.records import Tweet
+
+        tweet = Tweet.from_status(status)
+        print(tweet.id, tweet.text)
+        ```
+    """
+
+    id: int
+    text: str
+    author_id: Optional[int]
+    created_at: Optional[datetime]
+    retweet_count: int = 0
+    favorite_count: int = 0
+    reply_count: Optional[int] = None
+    quote_count: Optional[int] = None
+    media_keys: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_status(cls, status: Union[Any, Dict[str, Any]]) -> "Tweet":
+        """
+        Builds a record from a status, either a tweepy model or a raw dict.
+
+        Args:
+            status: The `tweepy.Status` or its decoded JSON.
+
+        Returns:
+            The record of the status.
+        """
+        if not isinstance(status, dict):
+            status = status._json
+        created_at = status.get("created_at")
+        if created_at is not None:
+            created_at = parsedate_to_datetime(created_at)
+        user = status.get("user") or {}
+        entities = status.get("extended_entities") or status.get("entities") or {}
+        return cls(
+            id=status["id"],
+            text=status.get("full_text") or status.get("text") or "",
+            author_id=user.get("id"),
+            created_at=created_at,
+            retweet_count=status.get("retweet_count", 0),
+            favorite_count=status.get("favorite_count", 0),
+            reply_count=status.get("reply_count"),
+            quote_count=status.get("quote_count"),
+            media_keys=tuple(
+                media.get("media_key") or media["id_str"]
+                for media in entities.get("media", ())
+            ),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Gets the fields of the record as a JSON-serializable dict.
+
+        Returns:
+            The fields, with `created_at` as an ISO 8601 string.
+        """
+        fields = self._asdict()
+        if self.created_at is not None:
+            fields["created_at"] = self.created_at.isoformat()
+        fields["media_keys"] = list(self.media_keys)
+        return fields
+
+    @classmethod
+    def from_dict(cls, fields: Dict[str, Any]) -> "Tweet":
+        """
+        Builds a record from the output of `to_dict`.
+
+        Args:
+            fields: The fields of the record.
+
+        Returns:
+            The record.
+        """
+        fields = dict(fields)
+        if fields.get("created_at") is not None:
+            fields["created_at"] = datetime.fromisoformat(fields["created_at"])
+        fields["media_keys"] = tuple(fields.get("media_keys", ()))
+        return cls(**fields)
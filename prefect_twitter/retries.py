@@ -0,0 +1,166 @@
+"""Retry delays for rate limited, failed and dropped Twitter API calls"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+import requests
+from tweepy.errors import TooManyRequests, TweepyException, TwitterServerError
+from urllib3.exceptions import ConnectTimeoutError
+
+_CONNECTION_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    httpx.TransportError,
+    ConnectionError,
+)
+
+# errors raised before a request was sent, so retrying cannot repeat it
+_CONNECT_ERRORS = (
+    requests.ConnectTimeout,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+)
+
+
+def is_connection_error(exc: BaseException) -> bool:
+    """
+    Checks whether a tweepy exception was caused by a dropped or timed out
+    connection; tweepy wraps these in a plain `TweepyException`.
+
+    Args:
+        exc: The exception raised by the call.
+
+    Returns:
+        Whether the call failed before a response was received.
+    """
+    cause = exc.__cause__ or exc.__context__
+    return isinstance(cause, _CONNECTION_ERRORS)
+
+
+def is_connect_error(exc: BaseException) -> bool:
+    """
+    Checks whether a tweepy exception was caused by a failure to establish
+    the connection, in which case the request never reached Twitter. Errors
+    after the connection was made, such as read timeouts and resets, are not
+    connect errors, since Twitter may have processed the request.
+
+    Args:
+        exc: The exception raised by the call.
+
+    Returns:
+        Whether the call failed before its request was sent.
+    """
+    cause = exc.__cause__ or exc.__context__
+    if isinstance(cause, _CONNECT_ERRORS):
+        return True
+    if isinstance(cause, requests.ConnectionError) and cause.args:
+        # requests wraps the urllib3 error, whose reason is the failure
+        reason = getattr(cause.args[0], "reason", None)
+        return isinstance(reason, ConnectTimeoutError)
+    return False
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """
+    Parses a `Retry-After` header, given either in seconds or as an HTTP
+    date, into the seconds to wait; returns None if it is malformed.
+    """
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None or retry_at.tzinfo is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0)
+
+
+def get_rate_limit_reset_delay(exc: TooManyRequests) -> Optional[float]:
+    """
+    Gets the seconds until the rate limit that rejected a call resets.
+
+    Args:
+        exc: The exception raised for the HTTP 429 response.
+
+    Returns:
+        The seconds to wait, or None if the response has no reset headers.
+    """
+    headers = getattr(exc.response, "headers", None) or {}
+    if headers.get("retry-after"):
+        delay = _parse_retry_after(headers["retry-after"])
+        if delay is not None:
+            return delay
+    reset_time = headers.get("x-rate-limit-reset") or exc.reset_time
+    try:
+        reset_time = float(reset_time) if reset_time else None
+    except ValueError:
+        reset_time = None
+    if reset_time is not None:
+        # the reset is a whole second, so wait out the second it falls in
+        return max(reset_time - time.time(), 0) + 1
+    return None
+
+
+def get_backoff_delay(attempt: int, backoff_factor: float, backoff_max: float) -> float:
+    """
+    Gets an exponential backoff delay with full jitter, so that concurrent
+    callers failing together do not retry together.
+
+    Args:
+        attempt: The number of retries already made.
+        backoff_factor: The delay ceiling, in seconds, of the first retry.
+        backoff_max: The largest delay ceiling, in seconds.
+
+    Returns:
+        The seconds to wait.
+    """
+    return random.uniform(0, min(backoff_max, backoff_factor * 2**attempt))
+
+
+def get_retry_delay(
+    exc: BaseException,
+    attempt: int,
+    backoff_factor: float,
+    backoff_max: float,
+    idempotent: bool = True,
+) -> Optional[float]:
+    """
+    Gets how long to wait before retrying a failed call. HTTP 429s wait until
+    the rate limit resets, while 5xx responses and connection errors back off
+    exponentially; any other error is not retried.
+
+    Calls that are not idempotent, such as posting a Tweet, may have taken
+    effect when a 5xx response, read timeout or reset connection is seen,
+    so they are only retried after HTTP 429s and errors establishing the
+    connection, which Twitter rejects or never receives.
+
+    Args:
+        exc: The exception raised by the call.
+        attempt: The number of retries already made.
+        backoff_factor: The delay ceiling, in seconds, of the first retry.
+        backoff_max: The largest delay ceiling, in seconds.
+        idempotent: Whether repeating the call has the same effect as making
+            it once.
+
+    Returns:
+        The seconds to wait, or None if the call should not be retried.
+    """
+    if isinstance(exc, TooManyRequests):
+        delay = get_rate_limit_reset_delay(exc)
+        if delay is not None:
+            return delay
+    elif not isinstance(exc, TweepyException):
+        return None
+    elif not idempotent:
+        if not is_connect_error(exc):
+            return None
+    elif not isinstance(exc, TwitterServerError) and not is_connection_error(exc):
+        return None
+    return get_backoff_delay(attempt, backoff_factor, backoff_max)
@@ -0,0 +1,63 @@
+"""Deduplication of identical Twitter API calls that are in flight at once"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers asking for the same
+    key on one event loop. The first caller starts the call and later callers
+    await its result, so identical requests made during a fan-out are sent
+    once. Once the call finishes, the next caller starts a new one.
+    `TwitterCredentials` runs its calls through a single flight on the
+    background loop of `prefect_twitter.concurrency`, so identical calls from
+    every task run share them.
+
+    Example:
+        Fetches a status once for two concurrent callers.
+        ```python
+        import asyncio
+        from prefect_twitter.singleflight import SingleFlight
+
+        single_flight = SingleFlight()
+        status, same_status = await asyncio.gather(
+            single_flight.do("42", lambda: client.get_status(42)),
+            single_flight.do("42", lambda: client.get_status(42)),
+        )
+        ```
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Awaits the in-flight call for a key, starting it if there is none.
+
+        Args:
+            key: The key identifying identical calls.
+            fn: Coroutine function making the call.
+
+        Returns:
+            The result of the shared call.
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(fn())
+            call.add_done_callback(lambda _: self._forget(key, call))
+        # a cancelled caller must not cancel the call for the others
+        return await asyncio.shield(call)
+
+    def _forget(self, key: Hashable, call: asyncio.Future) -> None:
+        """
+        Removes a finished call so the next caller starts a new one.
+        """
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def __len__(self) -> int:
+        """
+        Counts the calls in flight.
+        """
+        return len(self._calls)
@@ -0,0 +1,242 @@
+"""Conversions between status IDs and the times embedded in them"""
+
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# milliseconds since the Unix epoch at which snowflake timestamps start
+TWITTER_EPOCH_MS = 1288834974657
+
+# the low bits of a snowflake hold the worker and sequence numbers
+TIMESTAMP_SHIFT = 22
+
+
+def _import_numpy():
+    """
+    Imports NumPy, which only the vectorized conversions need.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy is required for vectorized snowflake conversions; "
+            "install it with `pip install numpy`"
+        ) from None
+    return numpy
+
+
+def _to_milliseconds(time: datetime) -> int:
+    """
+    Gets the milliseconds since the Unix epoch of a time; naive times are UTC.
+    """
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return round(time.timestamp() * 1000)
+
+
+def snowflake_to_datetime(status_id: int) -> datetime:
+    """
+    Gets the time a status was created from its ID.
+
+    Args:
+        status_id: The ID of a status created since November 2010.
+
+    Returns:
+        The creation time, in UTC, to the millisecond.
+
+    Example:
+        Gets the creation time of a Tweet.
+        ```python
+        from prefect_twitter.snowflake import snowflake_to_datetime
+
+        created_at = snowflake_to_datetime(1504591031626571777)
+        ```
+    """
+    milliseconds = (int(status_id) >> TIMESTAMP_SHIFT) + TWITTER_EPOCH_MS
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc)
+
+
+def datetime_to_snowflake(time: datetime) -> int:
+    """
+    Gets the lowest status ID that can be created at a time, so that
+    statuses created at or after it have IDs at least as large.
+
+    Args:
+        time: The time; naive times are taken to be UTC.
+
+    Returns:
+        The lowest status ID of that millisecond.
+
+    Example:
+        Gets the ID bounding the statuses created in 2022.
+        ```python
+        from datetime import datetime
+        from prefect_twitter.snowflake import datetime_to_snowflake
+
+        since_id = datetime_to_snowflake(datetime(2022, 1, 1)) - 1
+        ```
+    """
+    return max(_to_milliseconds(time) - TWITTER_EPOCH_MS, 0) << TIMESTAMP_SHIFT
+
+
+def plan_id_shards(
+    start: datetime, end: datetime, shards: int
+) -> List[Tuple[int, int]]:
+    """
+    Splits a time range into equal time slices and gets the `since_id` and
+    `max_id` bounds of each, so that the slices can be read concurrently.
+    The slices cover the range without overlapping, since `since_id` is
+    exclusive and `max_id` inclusive.
+
+    Args:
+        start: The start of the range, inclusive.
+        end: The end of the range, exclusive.
+        shards: The number of slices.
+
+    Returns:
+        The `(since_id, max_id)` pairs of the slices, newest first.
+
+    Example:
+        Splits a day into hourly shards.
+        ```python
+        from datetime import datetime
+        from prefect_twitter.snowflake import plan_id_shards
+
+        shards = plan_id_shards(datetime(2022, 3, 17), datetime(2022, 3, 18), 24)
+        ```
+    """
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    if end <= start:
+        raise ValueError("end must be after start")
+    step = (end - start) / shards
+    bounds = [datetime_to_snowflake(start + step * i) for i in range(shards)]
+    bounds.append(datetime_to_snowflake(end))
+    pairs = [(max(low - 1, 1), high - 1) for low, high in zip(bounds, bounds[1:])]
+    # slices shorter than a millisecond collapse to the same bounds
+    return [pair for pair in reversed(pairs) if pair[0] < pair[1]]
+
+
+def snowflakes_to_datetime64(status_ids: Any) -> "np.ndarray":
+    """
+    Gets the creation times of many statuses from their IDs in one
+    vectorized pass, without building a Python object per ID.
+
+    Args:
+        status_ids: An array-like of status IDs, as integers or strings.
+
+    Returns:
+        The creation times, as a `datetime64[ms]` array in UTC.
+
+    Example:
+        Gets the creation times of a column of IDs.
+        ```python
+        from prefect_twitter.snowflake import snowflakes_to_datetime64
+
+        created_at = snowflakes_to_datetime64(dataframe["id"].to_numpy())
+        ```
+    """
+    np = _import_numpy()
+    status_ids = np.asarray(status_ids, dtype=np.int64)
+    milliseconds = (status_ids >> TIMESTAMP_SHIFT) + TWITTER_EPOCH_MS
+    return milliseconds.astype("datetime64[ms]")
+
+
+def datetime64_to_snowflakes(times: Any) -> "np.ndarray":
+    """
+    Gets the lowest status ID of each of many times in one vectorized pass;
+    the counterpart of `datetime_to_snowflake`.
+
+    Args:
+        times: An array-like of times in UTC, e.g. a `datetime64` array.
+
+    Returns:
+        The lowest status IDs of the times, as an `int64` array.
+
+    Example:
+        Gets the ID bounds of each day of March 2022.
+        ```python
+        import numpy as np
+        from prefect_twitter.snowflake import datetime64_to_snowflakes
+
+        days = np.arange("2022-03-01", "2022-04-01", dtype="datetime64[D]")
+        bounds = datetime64_to_snowflakes(days)
+        ```
+    """
+    np = _import_numpy()
+    milliseconds = np.asarray(times, dtype="datetime64[ms]").astype(np.int64)
+    return np.maximum(milliseconds - TWITTER_EPOCH_MS, 0) << TIMESTAMP_SHIFT
+
+
+def snowflakes_in_range(
+    status_ids: Any, start: datetime, end: datetime
+) -> "np.ndarray":
+    """
+    Checks which statuses were created in a time range, comparing the IDs
+    against the range's ID bounds instead of decoding every ID.
+
+    Args:
+        status_ids: An array-like of status IDs, as integers or strings.
+        start: The start of the range, inclusive; naive times are UTC.
+        end: The end of the range, exclusive; naive times are UTC.
+
+    Returns:
+        A boolean mask of the statuses created in the range.
+
+    Example:
+        Keeps the statuses created on one day.
+        ```python
+        from datetime import datetime
+        from prefect_twitter.snowflake import snowflakes_in_range
+
+        mask = snowflakes_in_range(ids, datetime(2022, 3, 17), datetime(2022, 3, 18))
+        ids = ids[mask]
+        ```
+    """
+    np = _import_numpy()
+    status_ids = np.asarray(status_ids, dtype=np.int64)
+    return (status_ids >= datetime_to_snowflake(start)) & (
+        status_ids < datetime_to_snowflake(end)
+    )
+
+
+def bucket_snowflakes(
+    status_ids: Any, width: timedelta, origin: Optional[datetime] = None
+) -> "np.ndarray":
+    """
+    Assigns statuses to fixed-width time buckets by their creation times,
+    e.g. to count statuses per hour.
+
+    Args:
+        status_ids: An array-like of status IDs, as integers or strings.
+        width: The width of each bucket, at least a millisecond.
+        origin: The start of bucket 0; naive times are UTC. Defaults to the
+            snowflake epoch.
+
+    Returns:
+        The bucket index of each status, as an `int64` array; statuses
+            created before `origin` get negative indices.
+
+    Example:
+        Counts statuses per hour of one day.
+        ```python
+        from datetime import datetime, timedelta
+        import numpy as np
+        from prefect_twitter.snowflake import bucket_snowflakes
+
+        buckets = bucket_snowflakes(
+            ids, timedelta(hours=1), origin=datetime(2022, 3, 17)
+        )
+        counts = np.bincount(buckets[(buckets >= 0) & (buckets < 24)], minlength=24)
+        ```
+    """
+    np = _import_numpy()
+    width_ms = width // timedelta(milliseconds=1)
+    if width_ms < 1:
+        raise ValueError("width must be at least a millisecond")
+    origin_ms = TWITTER_EPOCH_MS if origin is None else _to_milliseconds(origin)
+    status_ids = np.asarray(status_ids, dtype=np.int64)
+    milliseconds = (status_ids >> TIMESTAMP_SHIFT) + TWITTER_EPOCH_MS
+    return (milliseconds - origin_ms) // width_ms
@@ -0,0 +1,282 @@
+"""Persistent on-disk storage of statuses and media IDs shared across flow runs"""
+
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# the size cap is enforced once this many statuses have been written
+PRUNE_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statuses (
+    status_id INTEGER NOT NULL,
+    owner TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (status_id, owner, variant)
+);
+CREATE INDEX IF NOT EXISTS statuses_fetched_at ON statuses (fetched_at);
+"""
+
+_MEDIA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    content_hash TEXT NOT NULL,
+    owner TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    uploaded_at REAL NOT NULL,
+    media_id INTEGER NOT NULL,
+    PRIMARY KEY (content_hash, owner, variant)
+);
+CREATE INDEX IF NOT EXISTS media_uploaded_at ON media (uploaded_at);
+"""
+
+
+class StatusStore:
+    """
+    A SQLite database of status payloads, so statuses fetched by one process
+    are reused by later ones instead of spending rate limit again. Rows are
+    keyed by status ID, the credentials that fetched them and the variant of
+    keyword arguments they were fetched with, and indexed by fetch time.
+    Statuses older than `max_age` seconds are treated as missing, and the
+    oldest rows are deleted once more than `max_entries` are stored.
+
+    The database runs in WAL mode, so several worker processes can read it
+    while one writes.
+
+    Args:
+        path: The path of the database file; it is created if missing.
+        max_age: Seconds a stored status is served before it is stale.
+        max_entries: The maximum number of statuses to keep.
+
+    Example:
+        Stores a status payload and reads it back.
+        ```python
+        from prefect_twitter.store import StatusStore
+
+        store = StatusStore("statuses.db")
+        store.put_many("owner", "[]", [(42, {"id": 42, "text": "Hello"})])
+        payloads = store.get_many("owner", "[]", [42])
+        ```
+    """
+
+    def __init__(self, path: str, max_age: float = 86400, max_entries: int = 100000):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self.prune()
+
+    def get_many(
+        self, owner: str, variant: str, status_ids: Iterable[int]
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Gets the payloads of the statuses that are stored and not stale.
+
+        Args:
+            owner: The key of the credentials that fetched the statuses.
+            variant: The encoded keyword arguments the statuses were fetched with.
+            status_ids: The IDs of the statuses.
+
+        Returns:
+            The payloads of the stored statuses by ID; missing and stale
+            statuses are left out.
+        """
+        status_ids = list(status_ids)
+        if not status_ids:
+            return {}
+        placeholders = ", ".join("?" * len(status_ids))
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status_id, payload FROM statuses "
+                "WHERE owner = ? AND variant = ? AND fetched_at >= ? "
+                f"AND status_id IN ({placeholders})",
+                (owner, variant, time.time() - self.max_age, *status_ids),
+            ).fetchall()
+        return {status_id: json.loads(payload) for status_id, payload in rows}
+
+    def put_many(
+        self, owner: str, variant: str, payloads: Iterable[Tuple[int, Dict[str, Any]]]
+    ) -> None:
+        """
+        Stores status payloads, replacing earlier copies.
+
+        Args:
+            owner: The key of the credentials that fetched the statuses.
+            variant: The encoded keyword arguments the statuses were fetched with.
+            payloads: Pairs of status IDs and their payloads.
+        """
+        fetched_at = time.time()
+        rows: List[Tuple] = [
+            (status_id, owner, variant, fetched_at, json.dumps(payload))
+            for status_id, payload in payloads
+        ]
+        if not rows:
+            return
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO statuses VALUES (?, ?, ?, ?, ?)", rows
+                )
+            self._writes += len(rows)
+            prune = self._writes >= PRUNE_INTERVAL
+        if prune:
+            self.prune()
+
+    def prune(self) -> None:
+        """
+        Deletes stale statuses and the oldest statuses beyond `max_entries`.
+        """
+        with self._lock:
+            self._writes = 0
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM statuses WHERE fetched_at < ?",
+                    (time.time() - self.max_age,),
+                )
+                self._connection.execute(
+                    "DELETE FROM statuses WHERE rowid IN ("
+                    "SELECT rowid FROM statuses ORDER BY fetched_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        """
+        Counts the stored statuses, including stale ones not yet pruned.
+        """
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT COUNT(*) FROM statuses"
+            ).fetchone()
+        return count
+
+
+class MediaStore:
+    """
+    A SQLite database of the IDs of uploaded media by content hash, so media
+    uploaded by one process is reused by later ones instead of uploaded
+    again. Rows are keyed by content hash, the credentials that uploaded the
+    media and the variant of upload arguments, such as `media_category`.
+    Twitter media IDs expire a day after upload, so IDs older than `max_age`
+    seconds are treated as missing and deleted.
+
+    The database runs in WAL mode, so several worker processes can read it
+    while one writes.
+
+    Args:
+        path: The path of the database file; it is created if missing.
+        max_age: Seconds a media ID is reused after its upload.
+
+    Example:
+        Stores a media ID and reads it back.
+        ```python
+        from prefect_twitter.store import MediaStore
+
+        store = MediaStore("media.db")
+        store.put("owner", "[]", "4a5e1e4b", 1443668738906234883)
+        media_id, uploaded_at = store.get("owner", "[]", "4a5e1e4b")
+        ```
+    """
+
+    def __init__(self, path: str, max_age: float = 82800):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_MEDIA_SCHEMA)
+        self.prune()
+
+    def get(
+        self, owner: str, variant: str, content_hash: str
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Gets the ID of media uploaded with the same content, if it is still
+        valid, and when it was uploaded.
+
+        Args:
+            owner: The key of the credentials that uploaded the media.
+            variant: The encoded arguments the media was uploaded with.
+            content_hash: The hash of the content of the media.
+
+        Returns:
+            The media ID and its upload time, or None if the media is missing
+            or expired.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT media_id, uploaded_at FROM media "
+                "WHERE content_hash = ? AND owner = ? AND variant = ? "
+                "AND uploaded_at >= ?",
+                (content_hash, owner, variant, time.time() - self.max_age),
+            ).fetchone()
+        return None if row is None else tuple(row)
+
+    def put(
+        self,
+        owner: str,
+        variant: str,
+        content_hash: str,
+        media_id: int,
+        uploaded_at: Optional[float] = None,
+    ) -> None:
+        """
+        Stores the ID of uploaded media, replacing an earlier upload.
+
+        Args:
+            owner: The key of the credentials that uploaded the media.
+            variant: The encoded arguments the media was uploaded with.
+            content_hash: The hash of the content of the media.
+            media_id: The ID of the media.
+            uploaded_at: When the media was uploaded; defaults to now.
+        """
+        if uploaded_at is None:
+            uploaded_at = time.time()
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO media VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, owner, variant, uploaded_at, media_id),
+                )
+
+    def prune(self) -> None:
+        """
+        Deletes expired media IDs.
+        """
+        with self._lock:
+            with self._connection:
+                self._connection.execute(
+                    "DELETE FROM media WHERE uploaded_at < ?",
+                    (time.time() - self.max_age,),
+                )
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        """
+        Counts the stored media IDs, including expired ones not yet pruned.
+        """
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM media").fetchone()
+        return count
@@ -0,0 +1,304 @@
+"""Incremental syncing of timelines from checkpoints kept between flow runs"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Union
+
+from anyio import to_thread
+from prefect import get_run_logger, task
+
+from prefect_twitter.parsers import get_payload_id
+from prefect_twitter.records import Tweet
+from prefect_twitter.tweets import stream_timeline_pages
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+if TYPE_CHECKING:
+    from tweepy import Status
+
+    from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+
+# every flow run opens its own store, so stores on one path share its lock
+_path_locks: Dict[str, threading.Lock] = {}
+_path_locks_lock = threading.Lock()
+
+
+def _get_path_lock(path: str) -> threading.Lock:
+    """
+    Gets the lock serializing the threads of this process that write a path.
+    """
+    with _path_locks_lock:
+        lock = _path_locks.get(path)
+        if lock is None:
+            lock = _path_locks[path] = threading.Lock()
+        return lock
+
+
+@contextmanager
+def _lock_file(path: str):
+    """
+    Holds an exclusive OS lock on a `.lock` file next to a path, so that
+    writers in other processes wait; the path itself cannot be locked,
+    since replacing it swaps the file.
+    """
+    with open(f"{path}.lock", "a+b") as fp:
+        if os.name == "nt":
+            fp.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ten seconds
+                    continue
+            try:
+                yield
+            finally:
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+class CheckpointStore:
+    """
+    A JSON file holding the checkpoint of each synced stream, written
+    atomically so a crash mid-write never corrupts earlier checkpoints.
+    A checkpoint records the newest status ID synced, as `since_id`, and the
+    ID ranges known to be missing, as `gaps`, each a `[since_id, max_id]`
+    pair bounding the missing statuses.
+
+    Writes read, update and replace the file under a lock shared by every
+    store on the same path in the process and an OS lock on a `.lock` file
+    next to it, so concurrent flow runs and processes do not lose each
+    other's checkpoints.
+
+    Args:
+        path: The path of the state file; it is created on the first write.
+
+    Example:
+        Reads the checkpoint of a stream.
+        ```python
+        from prefect_twitter.sync import CheckpointStore
+
+        checkpoint_store = CheckpointStore("twitter_sync_state.json")
+        checkpoint = checkpoint_store.get("mentions")
+        ```
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = _get_path_lock(os.path.abspath(path))
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets the checkpoint of a stream.
+
+        Args:
+            key: The key of the stream.
+
+        Returns:
+            The checkpoint, or None if the stream has not been synced.
+        """
+        with self._lock:
+            return self._read().get(key)
+
+    def set(self, key: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Stores the checkpoint of a stream, keeping those of other streams.
+
+        Args:
+            key: The key of the stream.
+            checkpoint: The checkpoint to store.
+        """
+        with self._lock, _lock_file(self.path):
+            state = self._read()
+            state[key] = checkpoint
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as fp:
+                    json.dump(state, fp, indent=2, sort_keys=True)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads every checkpoint from the state file.
+        """
+        try:
+            with open(self.path) as fp:
+                return json.load(fp)
+        except FileNotFoundError:
+            return {}
+
+
+def get_stream_key(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    timeline: str,
+    **kwargs: Any,
+) -> str:
+    """
+    Gets the key a stream's checkpoint is stored under, which differs per
+    timeline, per timeline arguments such as `user_id`, and per credentials,
+    since the statuses visible to each account differ.
+
+    Args:
+        twitter_credentials: The credentials the stream is read with.
+        timeline: The timeline of the stream, e.g. `mentions`.
+        **kwargs: The keyword arguments the timeline is read with.
+
+    Returns:
+        The key of the stream.
+    """
+    members = getattr(twitter_credentials, "credentials", [twitter_credentials])
+    hasher = hashlib.sha256()
+    for credentials in members:
+        hasher.update(
+            f"{credentials.consumer_key}\0{credentials.access_token}\0".encode()
+        )
+    arguments = ",".join(f"{name}={value}" for name, value in sorted(kwargs.items()))
+    return f"{timeline}:{arguments}:{hasher.hexdigest()[:16]}"
+
+
+@task
+async def sync_timeline(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    timeline: Literal["user", "home", "mentions", "search"] = "mentions",
+    state_path: str = "twitter_sync_state.json",
+    count: int = 200,
+    max_pages: int = 5,
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    compact: bool = False,
+    **kwargs: dict,
+) -> List[Union["Status", Dict[str, Any], Tweet]]:
+    """
+    Fetches the statuses added to a timeline since the last sync, using the
+    `since_id` checkpoint kept in a local state file per stream and
+    credentials. The first sync fetches the newest statuses and starts the
+    checkpoint, so later syncs cost requests in proportion to new statuses
+    only.
+
+    If more than `max_pages` pages of new statuses have accumulated, the
+    unread range is recorded as a gap and a warning is logged; later syncs
+    spend pages left over after fetching new statuses on filling gaps,
+    newest first. The checkpoint is only advanced once the fetch succeeded,
+    so a failed sync is repeated rather than skipped.
+
+    Args:
+        twitter_credentials: Credentials to use for authentication with Twitter.
+        timeline: The timeline to sync: `user`, `home`, `mentions` or `search`.
+        state_path: The path of the JSON file keeping the checkpoints.
+        count: The number of statuses to request per page, up to 200.
+        max_pages: The maximum number of pages to request per sync.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to return the decoded JSON of the statuses as dicts.
+        compact: Whether to return `Tweet` records of the statuses.
+        kwargs: Additional keyword arguments to pass to the timeline method,
+            e.g. `user_id` or `screen_name` for user timelines or `q` for
+            searches.
+    Returns:
+        The statuses fetched by this sync, oldest first.
+
+    Example:
+        Processes new mentions on every scheduled run.
+        ```python
+        from prefect import flow
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.sync import sync_timeline
+
+        @flow
+        def example_sync_timeline_flow():
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            mentions = sync_timeline(twitter_credentials, "mentions", compact=True)
+            return mentions
+
+        example_sync_timeline_flow()
+        ```
+    """
+    if raw and compact:
+        raise ValueError("Only one of raw or compact can be set")
+
+    logger = get_run_logger()
+    checkpoint_store = CheckpointStore(state_path)
+    key = get_stream_key(twitter_credentials, timeline, **kwargs)
+    checkpoint = await to_thread.run_sync(checkpoint_store.get, key) or {}
+    since_id = checkpoint.get("since_id")
+    gaps = [list(gap) for gap in checkpoint.get("gaps", [])]
+    pages_left = max_pages
+
+    async def fetch_range(range_since_id, range_max_id):
+        """
+        Fetches the statuses between two IDs within the page budget left,
+        and whether the range was read to the end.
+        """
+        nonlocal pages_left
+        statuses = []
+        pages = stream_timeline_pages(
+            twitter_credentials,
+            timeline,
+            count=count,
+            since_id=range_since_id,
+            max_id=range_max_id,
+            max_pages=pages_left,
+            max_retries=max_retries,
+            raw=raw or compact,
+            **kwargs,
+        )
+        complete = False
+        async for page in pages:
+            pages_left -= 1
+            if not page:
+                complete = True
+            statuses.extend(page)
+        return statuses, complete
+
+    statuses, complete = await fetch_range(since_id, None)
+    if statuses:
+        newest_id = get_payload_id(statuses[0])
+        oldest_id = get_payload_id(statuses[-1])
+        # the range below the oldest status is empty if it follows since_id
+        if since_id is not None and not complete and oldest_id - 1 > since_id:
+            gaps.insert(0, [since_id, oldest_id - 1])
+            logger.warning(
+                "More than %s pages of new statuses accumulated; statuses "
+                "between %s and %s will be fetched by later syncs.",
+                max_pages,
+                since_id,
+                oldest_id,
+            )
+        since_id = newest_id
+
+    for gap in list(gaps):
+        if pages_left <= 0:
+            break
+        filled, complete = await fetch_range(*gap)
+        statuses.extend(filled)
+        if filled:
+            gap[1] = get_payload_id(filled[-1]) - 1
+        if complete or gap[1] <= gap[0]:
+            gaps.remove(gap)
+
+    logger.info("Synced %s statuses; %s gaps remain.", len(statuses), len(gaps))
+    await to_thread.run_sync(
+        checkpoint_store.set, key, {"since_id": since_id, "gaps": gaps}
+    )
+    statuses.sort(key=get_payload_id)
+    if compact:
+        return [Tweet.from_status(status) for status in statuses]
+    return statuses
@@ -1,15 +1,39 @@
 """This is a module for interacting with Twitter tweets"""
 
+import asyncio
 from functools import partial
-from typing import TYPE_CHECKING, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
 
-from anyio import to_thread
 from prefect import get_run_logger, task
 
+from prefect_twitter.concurrency import gather
+from prefect_twitter.parsers import get_payload_id
+from prefect_twitter.records import Tweet
+
 if TYPE_CHECKING:
     from tweepy import Status
 
-    from prefect_twitter import TwitterCredentials
+    from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+
+# the maximum number of IDs statuses/lookup accepts per request
+STATUS_LOOKUP_BATCH_SIZE = 100
+
+# the tweepy.API methods reading each kind of timeline
+TIMELINE_METHODS = {
+    "user": "user_timeline",
+    "home": "home_timeline",
+    "mentions": "mentions_timeline",
+    "search": "search_tweets",
+}
 
 
 @task
@@ -17,6 +41,7 @@ async def update_status(
     twitter_credentials: "TwitterCredentials",
     status: Optional[str] = None,
     media_ids: Optional[List[Union[int, str]]] = None,
+    max_retries: Optional[int] = None,
     **kwargs: dict
 ) -> int:
     """
@@ -27,6 +52,8 @@ async def update_status(
         status: Text of the Tweet being created. This field is required
             if media_ids is not present.
         media_ids: A list of Media IDs being attached to the Tweet.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
         kwargs: Additional keyword arguments to pass to
             [update_status](https://docs.tweepy.org/en/stable/api.html#tweepy.API.update_status).
     Returns:
@@ -86,28 +113,46 @@ async def update_status(
     if not status and not media_ids:  # `not` checks for None and []
         raise ValueError("One of text or media_ids must be provided")
 
-    api = twitter_credentials.get_api()
-    partial_update = partial(
-        api.update_status, status=status, media_ids=media_ids, **kwargs
+    status = await twitter_credentials.call_api(
+        "update_status",
+        status=status,
+        media_ids=media_ids,
+        max_retries=max_retries,
+        **kwargs,
     )
-    status = await to_thread.run_sync(partial_update)
     return status.id
 
 
 @task
 async def get_status(
-    status_id: int, twitter_credentials: "TwitterCredentials", **kwargs: dict
-) -> "Status":
+    status_id: int,
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    compact: bool = False,
+    **kwargs: dict
+) -> Union["Status", Dict[str, Any], Tweet]:
     """
-    Returns a single status specified by the ID parameter.
+    Returns a single status specified by the ID parameter. The status is
+    fetched with app-only authentication if the credentials' `read_auth_mode`
+    allows it.
 
     Args:
         status_id: The ID of the status.
         twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` may be passed to spread calls across
+            several credentials.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to return the decoded JSON of the status as a dict, which
+            is cheaper to build and hold than a Status object.
+        compact: Whether to return a `Tweet` record of the fields pipelines
+            use, which is much smaller to persist as a result.
         kwargs: Additional keyword arguments to pass to
             [get_status](https://docs.tweepy.org/en/stable/api.html#tweepy.API.get_status).
     Returns:
-        The Status object.
+        The Status object, its JSON as a dict if `raw` is set, or a `Tweet`
+            if `compact` is set.
 
     Example:
         Tweets an update with just text.
@@ -131,7 +176,269 @@ async def get_status(
         example_get_status_flow()
         ```
     """
-    api = twitter_credentials.get_api()
-    partial_get = partial(api.get_status, status_id, **kwargs)
-    status = await to_thread.run_sync(partial_get)
-    return status
+    if raw and compact:
+        raise ValueError("Only one of raw or compact can be set")
+
+    status = await twitter_credentials.call_api(
+        "get_status", status_id, max_retries=max_retries, raw=raw or compact, **kwargs
+    )
+    return Tweet.from_status(status) if compact else status
+
+
+@task
+async def get_statuses(
+    status_ids: List[Union[int, str]],
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    compact: bool = False,
+    **kwargs: dict
+) -> List[Optional[Union["Status", Dict[str, Any], Tweet]]]:
+    """
+    Returns the statuses specified by a list of IDs. The IDs are looked up in
+    batches of 100 per request, and the batches are sent concurrently within
+    the credentials' thread and rate limits.
+
+    Args:
+        status_ids: The IDs of the statuses.
+        twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` may be passed to spread calls across
+            several credentials.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to return the decoded JSON of the statuses as dicts, which
+            are cheaper to build and hold than Status objects.
+        compact: Whether to return `Tweet` records of the fields pipelines
+            use, which are much smaller to persist as a result.
+        kwargs: Additional keyword arguments to pass to
+            [lookup_statuses](https://docs.tweepy.org/en/stable/api.html#tweepy.API.lookup_statuses).
+    Returns:
+        The Status objects, dicts if `raw` is set, or `Tweet` records if
+            `compact` is set, in the order of
+            `status_ids`, with None in place of statuses that were not found,
+            e.g. because they were deleted.
+
+    Example:
+        Gets several statuses at once.
+        ```python
+        from prefect import flow
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.tweets import get_statuses
+
+        @flow
+        def example_get_statuses_flow():
+            twitter_credentials = TwitterCredentials(
+                consumer_key=consumer_key,
+                consumer_secret=consumer_secret,
+                access_token=access_token,
+                access_token_secret=access_token_secret
+            )
+            status_ids = [1504591031626571777, 1443668738906234883]
+            statuses = get_statuses(status_ids, twitter_credentials)
+            return statuses
+
+        example_get_statuses_flow()
+        ```
+    """  # noqa
+    if raw and compact:
+        raise ValueError("Only one of raw or compact can be set")
+
+    logger = get_run_logger()
+    unique_ids = list(dict.fromkeys(int(status_id) for status_id in status_ids))
+    batches = [
+        unique_ids[i : i + STATUS_LOOKUP_BATCH_SIZE]
+        for i in range(0, len(unique_ids), STATUS_LOOKUP_BATCH_SIZE)
+    ]
+    logger.info("Looking up %s statuses in %s requests.", len(unique_ids), len(batches))
+
+    statuses = {}
+
+    async def lookup(batch):
+        """
+        Looks up one batch of statuses and adds them to `statuses`.
+        """
+        results = await twitter_credentials.call_api(
+            "lookup_statuses",
+            batch,
+            max_retries=max_retries,
+            raw=raw or compact,
+            **kwargs,
+        )
+        if compact:
+            results = [Tweet.from_status(status) for status in results]
+        statuses.update((get_payload_id(status), status) for status in results)
+
+    await gather(partial(lookup, batch) for batch in batches)
+
+    missing_ids = [status_id for status_id in unique_ids if status_id not in statuses]
+    if missing_ids:
+        logger.warning(
+            "%s of %s statuses were not found: %s",
+            len(missing_ids),
+            len(unique_ids),
+            missing_ids,
+        )
+    return [statuses.get(int(status_id)) for status_id in status_ids]
+
+
+async def stream_timeline(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    timeline: Literal["user", "home", "mentions", "search"] = "user",
+    count: int = 200,
+    since_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    compact: bool = False,
+    **kwargs: dict
+) -> AsyncIterator[Union["Status", Dict[str, Any], Tweet]]:
+    """
+    Iterates over the statuses of a timeline, newest first, paging back with
+    `max_id`. The next page is requested while the statuses of the current
+    one are being consumed, and at most two pages are held at once. Since
+    tasks cannot yield, this is a helper to call from flows and tasks.
+
+    Args:
+        twitter_credentials: Credentials to use for authentication with Twitter.
+            A `TwitterCredentialsPool` may be passed to read user timelines
+            and search results.
+        timeline: The timeline to read: `user` for the timeline of the user
+            given by `user_id` or `screen_name`, `home` for the authenticating
+            user's home timeline, `mentions` for their mentions, or `search`
+            for the recent statuses matching the query `q`.
+        count: The number of statuses to request per page, up to 200, or up
+            to 100 for searches.
+        since_id: Only statuses newer than this ID are returned.
+        max_id: Only statuses at least as old as this ID are returned.
+        max_pages: The maximum number of pages to read; by default, pages are
+            read until the timeline is exhausted.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to yield the decoded JSON of the statuses as dicts.
+        compact: Whether to yield `Tweet` records of the statuses.
+        kwargs: Additional keyword arguments to pass to the timeline method,
+            e.g. `user_id` or `screen_name` for [user_timeline](https://docs.tweepy.org/en/stable/api.html#tweepy.API.user_timeline).
+    Yields:
+        The statuses, as Status objects, dicts if `raw` is set, or `Tweet`
+            records if `compact` is set.
+
+    Example:
+        Counts the recent mentions of the authenticating user.
+        ```python
+        from prefect import flow
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.tweets import stream_timeline
+
+        @flow
+        async def example_stream_timeline_flow():
+            twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+            mentions = 0
+            async for status in stream_timeline(
+                twitter_credentials, "mentions", max_pages=5, compact=True
+            ):
+                mentions += 1
+            return mentions
+
+        example_stream_timeline_flow()
+        ```
+    """  # noqa
+    if raw and compact:
+        raise ValueError("Only one of raw or compact can be set")
+    pages = stream_timeline_pages(
+        twitter_credentials,
+        timeline,
+        count=count,
+        since_id=since_id,
+        max_id=max_id,
+        max_pages=max_pages,
+        max_retries=max_retries,
+        raw=raw or compact,
+        **kwargs,
+    )
+    try:
+        async for page in pages:
+            for status in page:
+                yield Tweet.from_status(status) if compact else status
+    finally:
+        await pages.aclose()
+
+
+async def stream_timeline_pages(
+    twitter_credentials: Union["TwitterCredentials", "TwitterCredentialsPool"],
+    timeline: Literal["user", "home", "mentions", "search"] = "user",
+    count: int = 200,
+    since_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    raw: bool = False,
+    **kwargs: dict
+) -> AsyncIterator[List[Union["Status", Dict[str, Any]]]]:
+    """
+    Iterates over the pages of a timeline, newest first, like
+    `stream_timeline`. The next page is requested as soon as the current one
+    is yielded, and the last page yielded is empty if the timeline was read
+    to its end rather than cut short by `max_pages`.
+
+    Args:
+        twitter_credentials: Credentials to use for authentication with Twitter.
+        timeline: The timeline to read: `user`, `home`, `mentions` or `search`.
+        count: The number of statuses to request per page, up to 200.
+        since_id: Only statuses newer than this ID are returned.
+        max_id: Only statuses at least as old as this ID are returned.
+        max_pages: The maximum number of pages to read.
+        max_retries: The number of times to retry rate limited or failed
+            requests; defaults to the `max_retries` of the credentials.
+        raw: Whether to yield the decoded JSON of the statuses as dicts.
+        kwargs: Additional keyword arguments to pass to the timeline method.
+    Yields:
+        The pages of statuses.
+
+    Example:
+        Reads the first two pages of a user's timeline.
+        ```python
+        from prefect_twitter import TwitterCredentials
+        from prefect_twitter.tweets import stream_timeline_pages
+
+        twitter_credentials = TwitterCredentials.load("BLOCK_NAME")
+        async for page in stream_timeline_pages(
+            twitter_credentials, screen_name="PrefectIO", max_pages=2
+        ):
+            print(len(page))
+        ```
+    """
+    method = TIMELINE_METHODS[timeline]
+
+    async def fetch_page(page_max_id):
+        """
+        Fetches the page of statuses at or below `page_max_id`.
+        """
+        page = await twitter_credentials.call_api(
+            method,
+            count=count,
+            since_id=since_id,
+            max_id=page_max_id,
+            max_retries=max_retries,
+            raw=raw,
+            **kwargs,
+        )
+        # raw search results wrap the statuses in an object
+        return page["statuses"] if isinstance(page, dict) else page
+
+    next_page = asyncio.ensure_future(fetch_page(max_id))
+    pages = 0
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = None
+            pages += 1
+            if page and (max_pages is None or pages < max_pages):
+                # max_id is inclusive, so continue below the oldest status
+                next_page = asyncio.ensure_future(
+                    fetch_page(get_payload_id(page[-1]) - 1)
+                )
+            yield page
+    finally:
+        if next_page is not None:
+            next_page.cancel()
@@ -2,6 +2,8 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from prefect_twitter import TwitterCredentials
+
 
 class APIMock:
     def media_upload(self, filename, **kwargs):
@@ -16,12 +18,29 @@ class APIMock:
     def get_status(self, status_id=None, **kwargs):
         return status_id
 
+    def lookup_statuses(self, id, parser=None, **kwargs):
+        if parser is not None:
+            return [{"id": status_id} for status_id in id if status_id % 7]
+        return [MagicMock(id=status_id) for status_id in id if status_id % 7]
+
     def get_media_upload_status(self, media_id=None, **kwargs):
         return media_id
 
 
 @pytest.fixture
 def twitter_credentials(monkeypatch):
-    credentials_mock = MagicMock()
-    credentials_mock.get_api.side_effect = APIMock
-    return credentials_mock
+    monkeypatch.setattr(
+        TwitterCredentials, "get_api", lambda self, app_only=False: APIMock()
+    )
+    return TwitterCredentials(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_api_cache():
+    yield
+    TwitterCredentials.clear_api_cache()
@@ -0,0 +1,175 @@
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+import pytest
+from oauthlib.oauth1 import Client as OAuth1Client
+from tweepy import API
+from tweepy.errors import NotFound, TweepyException
+
+from prefect_twitter.async_client import AsyncTwitterClient
+from prefect_twitter.parsers import RAW_PARSER
+
+
+def _make_client(handler):
+    oauth_client = OAuth1Client(
+        "consumer_key",
+        client_secret="consumer_secret",
+        resource_owner_key="access_token",
+        resource_owner_secret="access_token_secret",
+    )
+    return AsyncTwitterClient(
+        API(), oauth_client, transport=httpx.MockTransport(handler)
+    )
+
+
+async def test_async_client_get_status():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={"id": 42, "text": "prefection"})
+
+    client = _make_client(handler)
+    status = await client.get_status(42, trim_user=True)
+    await client.aclose()
+
+    assert status.id == 42
+    assert status.text == "prefection"
+    request = requests[0]
+    assert request.url.path == "/1.1/statuses/show.json"
+    assert parse_qs(urlparse(str(request.url)).query) == {
+        "id": ["42"],
+        "trim_user": ["True"],
+    }
+    assert request.headers["Authorization"].startswith("OAuth ")
+
+
+async def test_async_client_update_status_media_ids():
+    def handler(request):
+        assert request.method == "POST"
+        assert request.url.params["media_ids"] == "1,2"
+        return httpx.Response(200, json={"id": 7})
+
+    client = _make_client(handler)
+    status = await client.update_status("text", media_ids=[1, 2])
+    assert status.id == 7
+
+
+async def test_async_client_media_upload(tmp_path):
+    path = tmp_path / "prefection.jpg"
+    path.write_bytes(b"image")
+
+    def handler(request):
+        assert request.url.host == "upload.twitter.com"
+        assert b"image" in request.content
+        return httpx.Response(200, json={"media_id": 1, "media_id_string": "1"})
+
+    client = _make_client(handler)
+    media = await client.media_upload(path)
+    assert media.media_id == 1
+
+
+async def test_async_client_chunked_media_upload():
+    commands = []
+
+    def handler(request):
+        if request.headers["Content-Type"].startswith("multipart"):
+            commands.append("APPEND")
+            return httpx.Response(204)
+        form = parse_qs(request.content.decode())
+        commands.append(form["command"][0])
+        return httpx.Response(200, json={"media_id": 1, "media_id_string": "1"})
+
+    client = _make_client(handler)
+    with open(__file__, "rb") as file:
+        media = await client.media_upload("video.mp4", file=file, chunk_size=1024)
+    assert media.media_id == 1
+    assert commands[0] == "INIT"
+    assert commands[-1] == "FINALIZE"
+    assert set(commands[1:-1]) == {"APPEND"}
+
+
+async def test_async_client_chunked_upload_append_memoryview():
+    bodies = []
+
+    def handler(request):
+        bodies.append(request.read())
+        return httpx.Response(204)
+
+    client = _make_client(handler)
+    segment = memoryview(b"0123456789")[2:8]
+    await client.chunked_upload_append(1, ("video.mp4", segment), 0)
+    assert b"\r\n\r\n234567\r\n" in bodies[0]
+
+
+async def test_async_client_raises_tweepy_errors():
+    def handler(request):
+        return httpx.Response(
+            404, json={"errors": [{"code": 144, "message": "No status found"}]}
+        )
+
+    client = _make_client(handler)
+    with pytest.raises(NotFound, match="No status found") as exc_info:
+        await client.get_status(42)
+    assert exc_info.value.api_codes == [144]
+
+
+async def test_async_client_transport_error():
+    def handler(request):
+        raise httpx.ConnectError("boom")
+
+    client = _make_client(handler)
+    with pytest.raises(TweepyException, match="Failed to send request"):
+        await client.get_status(42)
+
+
+def test_async_client_supports():
+    assert AsyncTwitterClient.supports("get_status")
+    assert not AsyncTwitterClient.supports("request")
+
+
+async def test_async_client_bearer_token():
+    def handler(request):
+        assert request.headers["Authorization"] == "Bearer bearer_token"
+        return httpx.Response(200, json={"id": 42})
+
+    client = AsyncTwitterClient(
+        API(), bearer_token="bearer_token", transport=httpx.MockTransport(handler)
+    )
+    status = await client.get_status(42)
+    assert status.id == 42
+
+
+def test_async_client_requires_one_auth():
+    with pytest.raises(ValueError, match="Exactly one of"):
+        AsyncTwitterClient(API())
+
+
+async def test_async_client_lookup_statuses():
+    def handler(request):
+        assert request.url.params["id"] == "1,2"
+        return httpx.Response(200, json=[{"id": 1}, {"id": 2}])
+
+    client = _make_client(handler)
+    statuses = await client.lookup_statuses([1, 2])
+    assert [status.id for status in statuses] == [1, 2]
+
+
+async def test_async_client_raw_parser():
+    def handler(request):
+        return httpx.Response(200, json=[{"id": 1}, {"id": 2}])
+
+    client = _make_client(handler)
+    statuses = await client.lookup_statuses([1, 2], parser=RAW_PARSER)
+    assert statuses == [{"id": 1}, {"id": 2}]
+
+
+async def test_async_client_timelines():
+    def handler(request):
+        assert request.url.params["max_id"] == "5"
+        return httpx.Response(200, json=[{"id": 5}, {"id": 4}])
+
+    client = _make_client(handler)
+    for method in ("user_timeline", "home_timeline", "mentions_timeline"):
+        statuses = await getattr(client, method)(max_id=5, since_id=None)
+        assert [status.id for status in statuses] == [5, 4]
@@ -0,0 +1,101 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from prefect import flow
+from tweepy.errors import TweepyException
+
+from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+from prefect_twitter.backfill import backfill_shard, backfill_timeline, merge_statuses
+from prefect_twitter.records import Tweet
+from prefect_twitter.snowflake import datetime_to_snowflake, plan_id_shards
+
+START = datetime(2022, 3, 17)
+STATUS_IDS = [
+    datetime_to_snowflake(START + timedelta(minutes=37 * i)) + i for i in range(40)
+]
+
+
+class SearchAPIMock:
+    def __init__(self):
+        self.requests = []
+
+    def search_tweets(self, q, count, since_id=None, max_id=None, parser=None):
+        self.requests.append((since_id, max_id))
+        matches = [
+            status_id
+            for status_id in reversed(STATUS_IDS)
+            if since_id < status_id and (max_id is None or status_id <= max_id)
+        ]
+        if parser is not None:
+            return {"statuses": [{"id": status_id} for status_id in matches[:count]]}
+        return [MagicMock(id=status_id) for status_id in matches[:count]]
+
+
+def test_merge_statuses():
+    statuses = merge_statuses([[{"id": 3}, {"id": 1}], [{"id": 2}, {"id": 3}]])
+    assert statuses == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+def test_backfill_timeline(twitter_credentials, monkeypatch):
+    api = SearchAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    end = START + timedelta(hours=12)
+
+    @flow
+    def test_flow():
+        return backfill_timeline(
+            twitter_credentials, START, end, shards=4, count=5, q="prefect"
+        )
+
+    statuses = test_flow()
+    assert [status.id for status in statuses] == [
+        status_id for status_id in STATUS_IDS if status_id < datetime_to_snowflake(end)
+    ]
+    assert {since_id for since_id, _ in api.requests} == {
+        since_id for since_id, _ in plan_id_shards(START, end, 4)
+    }
+
+
+def test_backfill_timeline_raises_shard_errors(twitter_credentials, monkeypatch):
+    api = SearchAPIMock()
+    search_tweets = api.search_tweets
+    failing_since_id = plan_id_shards(START, START + timedelta(hours=12), 4)[1][0]
+
+    def fail_shard(q, count, since_id=None, **kwargs):
+        if since_id == failing_since_id:
+            raise TweepyException("Invalid query")
+        return search_tweets(q, count, since_id=since_id, **kwargs)
+
+    monkeypatch.setattr(api, "search_tweets", fail_shard)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        return backfill_timeline(
+            twitter_credentials,
+            START,
+            START + timedelta(hours=12),
+            shards=4,
+            count=5,
+            q="prefect",
+        )
+
+    with pytest.raises(TweepyException, match="Invalid query"):
+        test_flow()
+
+
+def test_backfill_shard_credentials_pool(twitter_credentials, monkeypatch):
+    api = SearchAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    pool = TwitterCredentialsPool(credentials=[twitter_credentials])
+    since_id, max_id = plan_id_shards(START, START + timedelta(hours=2), 1)[0]
+
+    @flow
+    def test_flow():
+        return backfill_shard(pool, since_id, max_id, q="prefect", compact=True)
+
+    assert test_flow() == [
+        Tweet(id=status_id, text="", author_id=None, created_at=None)
+        for status_id in reversed(STATUS_IDS[:4])
+    ]
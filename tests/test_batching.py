@@ -0,0 +1,71 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from prefect_twitter.batching import StatusBatcher
+
+
+class Lookups:
+    def __init__(self, missing=()):
+        self.batches = []
+        self.singles = []
+        self.missing = set(missing)
+
+    async def lookup(self, ids, **kwargs):
+        self.batches.append((ids, kwargs))
+        return [MagicMock(id=i) for i in ids if i not in self.missing]
+
+    async def fallback(self, status_id, **kwargs):
+        self.singles.append(status_id)
+        raise LookupError(status_id)
+
+
+async def test_status_batcher_coalesces_concurrent_calls():
+    lookups = Lookups()
+    batcher = StatusBatcher(lookups.lookup, lookups.fallback)
+    statuses = await asyncio.gather(*(batcher.get_status(i) for i in (1, 2, 2, 3)))
+    assert [status.id for status in statuses] == [1, 2, 2, 3]
+    assert lookups.batches == [([1, 2, 3], {})]
+
+
+async def test_status_batcher_max_size():
+    lookups = Lookups()
+    batcher = StatusBatcher(lookups.lookup, lookups.fallback, window=60, max_size=2)
+    await asyncio.gather(*(batcher.get_status(i) for i in range(4)))
+    assert [ids for ids, _ in lookups.batches] == [[0, 1], [2, 3]]
+
+
+async def test_status_batcher_groups_by_kwargs():
+    lookups = Lookups()
+    batcher = StatusBatcher(lookups.lookup, lookups.fallback)
+    await asyncio.gather(batcher.get_status(1, trim_user=True), batcher.get_status(2))
+    assert sorted(lookups.batches, key=lambda batch: len(batch[1])) == [
+        ([2], {}),
+        ([1], {"trim_user": True}),
+    ]
+
+
+async def test_status_batcher_falls_back_for_missing_ids():
+    lookups = Lookups(missing={2})
+    batcher = StatusBatcher(lookups.lookup, lookups.fallback)
+    results = await asyncio.gather(
+        batcher.get_status(1), batcher.get_status(2), return_exceptions=True
+    )
+    assert results[0].id == 1
+    assert isinstance(results[1], LookupError)
+    assert lookups.singles == [2]
+
+
+async def test_status_batcher_propagates_lookup_errors():
+    async def lookup(ids, **kwargs):
+        raise RuntimeError("boom")
+
+    batcher = StatusBatcher(lookup, Lookups().fallback)
+    with pytest.raises(RuntimeError, match="boom"):
+        await asyncio.gather(batcher.get_status(1), batcher.get_status(2))
+
+
+def test_status_batcher_can_batch():
+    assert StatusBatcher.can_batch(trim_user=True, max_retries=None)
+    assert not StatusBatcher.can_batch(include_my_retweet=True)
@@ -0,0 +1,63 @@
+import pytest
+
+from prefect_twitter.cache import LRUCache
+
+
+def test_lru_cache_evicts_least_recently_used():
+    evicted = []
+    cache = LRUCache(maxsize=2, on_evict=lambda key, value: evicted.append(key))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert evicted == ["b"]
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_lru_cache_get_or_set():
+    cache = LRUCache()
+    assert cache.get_or_set("a", lambda: 1) == 1
+    assert cache.get_or_set("a", lambda: 2) == 1
+
+
+def test_lru_cache_pop_and_clear():
+    evicted = []
+    cache = LRUCache(on_evict=lambda key, value: evicted.append(key))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.pop("a")
+    cache.pop("missing")
+    assert evicted == ["a"]
+    cache.clear()
+    assert evicted == ["a", "b"]
+    assert cache.get("b") is None
+
+
+def test_lru_cache_invalid_maxsize():
+    with pytest.raises(ValueError, match="maxsize must be at least 1"):
+        LRUCache(maxsize=0)
+
+
+def test_lru_cache_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("prefect_twitter.cache.time.monotonic", lambda: now[0])
+    evicted = []
+    cache = LRUCache(ttl=10, on_evict=lambda key, value: evicted.append(key))
+    cache.set("a", 1)
+    now[0] += 9
+    assert cache.get("a") == 1
+    now[0] += 1
+    assert "a" not in cache
+    assert cache.get("a") is None
+    assert evicted == ["a"]
+    assert len(cache) == 0
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache()
+    cache.get("a")
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    assert (cache.hits, cache.misses) == (2, 1)
@@ -0,0 +1,77 @@
+import asyncio
+
+import anyio
+import pytest
+from tweepy.errors import TweepyException
+
+from prefect_twitter.concurrency import gather, get_background_loop, run_in_background
+
+
+async def test_gather_keeps_order():
+    async def call(value, delay):
+        await anyio.sleep(delay)
+        return value
+
+    assert await gather([lambda: call(1, 0.02), lambda: call(2, 0)]) == [1, 2]
+
+
+async def test_gather_raises_first_error_and_cancels_others():
+    cancelled = []
+
+    async def fail():
+        raise TweepyException("Failed")
+
+    async def wait():
+        try:
+            await anyio.sleep(10)
+        except anyio.get_cancelled_exc_class():
+            cancelled.append(True)
+            raise
+
+    with pytest.raises(TweepyException, match="Failed"):
+        await gather([wait, fail, fail])
+    assert cancelled == [True]
+
+
+async def _get_running_loop():
+    return asyncio.get_running_loop()
+
+
+async def test_run_in_background_runs_on_background_loop():
+    loop = await run_in_background(_get_running_loop())
+    assert loop is get_background_loop()
+    assert loop is not asyncio.get_running_loop()
+
+
+def test_run_in_background_shares_loop_across_loops():
+    async def get_loop():
+        return await run_in_background(_get_running_loop())
+
+    assert asyncio.run(get_loop()) is asyncio.run(get_loop())
+
+
+async def test_run_in_background_raises_errors():
+    async def fail():
+        raise TweepyException("Failed")
+
+    with pytest.raises(TweepyException, match="Failed"):
+        await run_in_background(fail())
+
+
+async def test_run_in_background_cancels_coroutine():
+    cancelled = []
+
+    async def wait():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    with anyio.move_on_after(0.05):
+        await run_in_background(wait())
+    for _ in range(100):
+        if cancelled:
+            break
+        await asyncio.sleep(0.01)
+    assert cancelled == [True]
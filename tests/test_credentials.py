@@ -1,6 +1,18 @@
-from tweepy import API
+import asyncio
+import io
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock
 
-from prefect_twitter import TwitterCredentials
+import pytest
+import requests
+from tweepy import API, OAuth2BearerHandler
+from tweepy.errors import TweepyException, TwitterServerError
+from tweepy.models import Status
+
+from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+from prefect_twitter.credentials import API_CACHE_MAXSIZE
+from prefect_twitter.parsers import get_parser
 
 
 def test_twitter_credentials_get_api():
@@ -16,3 +28,424 @@ def test_twitter_credentials_get_api():
     )
     api = twitter_credentials.get_api()
     assert isinstance(api, API)
+
+
+def _make_credentials(**overrides):
+    fields = dict(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+    )
+    fields.update(overrides)
+    return TwitterCredentials(**fields)
+
+
+def test_twitter_credentials_get_api_cached():
+    api = _make_credentials().get_api()
+    assert _make_credentials().get_api() is api
+    assert _make_credentials(access_token="other").get_api() is not api
+
+
+def test_twitter_credentials_get_api_keeps_session_open():
+    api = _make_credentials().get_api()
+    adapter = api.session.get_adapter("https://api.twitter.com")
+    api.session.close()
+    assert api.session.get_adapter("https://api.twitter.com") is adapter
+    assert api.session.adapters
+
+
+def test_twitter_credentials_invalidate_api(monkeypatch):
+    twitter_credentials = _make_credentials()
+    api = twitter_credentials.get_api()
+    shutdown = MagicMock()
+    monkeypatch.setattr(api.session, "shutdown", shutdown)
+    twitter_credentials.invalidate_api()
+    shutdown.assert_called_once()
+    assert twitter_credentials.get_api() is not api
+
+
+def test_twitter_credentials_clear_api_cache():
+    api = _make_credentials().get_api()
+    TwitterCredentials.clear_api_cache()
+    assert _make_credentials().get_api() is not api
+
+
+def test_twitter_credentials_get_api_session_config():
+    api = _make_credentials(
+        pool_connections=2,
+        pool_maxsize=50,
+        keep_alive=False,
+        connect_timeout=3,
+        read_timeout=30,
+    ).get_api()
+    adapter = api.session.get_adapter("https://api.twitter.com")
+    assert adapter._pool_connections == 2
+    assert adapter._pool_maxsize == 50
+    assert adapter._pool_block is True
+    assert api.session.headers["Connection"] == "close"
+    assert api.timeout == (3, 30)
+
+
+async def test_twitter_credentials_call_api_thread(monkeypatch):
+    twitter_credentials = _make_credentials()
+    api = MagicMock()
+    api.get_status.return_value = "status"
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    assert await twitter_credentials.call_api("get_status", 42) == "status"
+    api.get_status.assert_called_once_with(42)
+
+
+async def test_twitter_credentials_call_api_async_client(monkeypatch):
+    twitter_credentials = _make_credentials(use_async_client=True)
+    client = MagicMock()
+    client.get_status = AsyncMock(return_value="status")
+    monkeypatch.setattr(
+        TwitterCredentials, "get_async_client", lambda self, app_only=False: client
+    )
+    assert await twitter_credentials.call_api("get_status", 42) == "status"
+    client.get_status.assert_awaited_once_with(42)
+
+
+async def test_twitter_credentials_get_async_client_cached():
+    client = _make_credentials().get_async_client()
+    assert _make_credentials().get_async_client() is client
+    assert client.api is _make_credentials().get_api()
+
+
+async def test_twitter_credentials_closes_evicted_async_clients():
+    credentials = _make_credentials()
+    client = credentials.get_async_client()
+    credentials.invalidate_api()
+    for _ in range(100):
+        if client._client.is_closed:
+            break
+        await asyncio.sleep(0.01)
+    assert client._client.is_closed
+    assert credentials.get_async_client() is not client
+
+
+def test_twitter_credentials_async_client_shared_across_loops():
+    async def get_async_client():
+        return _make_credentials().get_async_client()
+
+    assert asyncio.run(get_async_client()) is asyncio.run(get_async_client())
+
+
+def test_twitter_credentials_get_thread_pool():
+    thread_pool = _make_credentials(max_worker_threads=3).get_thread_pool()
+    assert thread_pool._max_workers == 3
+    assert _make_credentials(max_worker_threads=3).get_thread_pool() is thread_pool
+    assert _make_credentials().get_thread_pool() is not thread_pool
+
+
+async def test_twitter_credentials_call_api_uses_thread_pool(monkeypatch):
+    twitter_credentials = _make_credentials(max_worker_threads=1)
+    threads = []
+    api = MagicMock()
+    api.get_status.side_effect = lambda status_id: threads.append(
+        threading.current_thread().name
+    )
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    await twitter_credentials.call_api("get_status", 42)
+    assert threads[0].startswith("prefect-twitter")
+
+
+def test_twitter_credentials_get_rate_limiter():
+    rate_limiter = _make_credentials().get_rate_limiter()
+    assert _make_credentials(pool_maxsize=1).get_rate_limiter() is rate_limiter
+    other_rate_limiter = _make_credentials(access_token="other").get_rate_limiter()
+    assert other_rate_limiter is not rate_limiter
+    api = _make_credentials().get_api()
+    assert rate_limiter.update_from_response in api.session.hooks["response"]
+
+
+def test_twitter_credentials_rate_limiters_are_not_evicted():
+    rate_limiter = _make_credentials().get_rate_limiter()
+    for index in range(API_CACHE_MAXSIZE + 1):
+        _make_credentials(access_token=f"other{index}").get_rate_limiter()
+    assert _make_credentials().get_rate_limiter() is rate_limiter
+
+
+async def test_twitter_credentials_call_api_respects_rate_limits(monkeypatch):
+    twitter_credentials = _make_credentials()
+    acquire = AsyncMock()
+    monkeypatch.setattr(twitter_credentials.get_rate_limiter(), "acquire", acquire)
+    monkeypatch.setattr(
+        TwitterCredentials, "get_api", lambda self, app_only=False: MagicMock()
+    )
+    await twitter_credentials.call_api("get_status", 42)
+    await twitter_credentials.call_api("verify_credentials")
+    acquire.assert_awaited_once_with("statuses/show")
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("prefect_twitter.credentials.anyio.sleep", sleep)
+    return sleeps
+
+
+def _server_error():
+    response = requests.Response()
+    response.status_code = 503
+    response.reason = "Service Unavailable"
+    response._content = b"{}"
+    return TwitterServerError(response)
+
+
+async def test_twitter_credentials_call_api_does_not_retry_posts(monkeypatch, no_sleep):
+    twitter_credentials = _make_credentials(max_retries=2)
+    api = MagicMock()
+    api.update_status.side_effect = [_server_error(), "status"]
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    with pytest.raises(TwitterServerError):
+        await twitter_credentials.call_api("update_status", "text")
+    assert api.update_status.call_count == 1
+    assert no_sleep == []
+
+
+async def test_twitter_credentials_call_api_retries(monkeypatch, no_sleep):
+    twitter_credentials = _make_credentials(max_retries=2)
+    api = MagicMock()
+    api.get_status.side_effect = [_server_error(), _server_error(), "status"]
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    assert await twitter_credentials.call_api("get_status", 42) == "status"
+    assert len(no_sleep) == 2
+
+
+async def test_twitter_credentials_call_api_retry_budget(monkeypatch, no_sleep):
+    twitter_credentials = _make_credentials(max_retries=2)
+    api = MagicMock()
+    api.get_status.side_effect = _server_error()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    with pytest.raises(TwitterServerError):
+        await twitter_credentials.call_api("get_status", 42, max_retries=0)
+    assert api.get_status.call_count == 1
+
+
+async def test_twitter_credentials_call_api_rewinds_file(monkeypatch, no_sleep):
+    twitter_credentials = _make_credentials()
+    reads = []
+
+    def media_upload(filename, file):
+        reads.append(file.read())
+        if len(reads) == 1:
+            raise TweepyException("Failed to send request") from (
+                requests.ConnectTimeout("Connect timed out")
+            )
+        return "media"
+
+    api = MagicMock()
+    api.media_upload.side_effect = media_upload
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    file = io.BytesIO(b"image")
+    await twitter_credentials.call_api("media_upload", filename="a.png", file=file)
+    assert reads == [b"image", b"image"]
+
+
+def _rate_limit_headers(remaining):
+    return {
+        "x-rate-limit-limit": "900",
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(time.time() + 60),
+    }
+
+
+def test_twitter_credentials_pool_select_credentials():
+    busy = _make_credentials(access_token="busy")
+    idle = _make_credentials(access_token="idle")
+    busy.get_rate_limiter().update("statuses/show", _rate_limit_headers(1))
+    idle.get_rate_limiter().update("statuses/show", _rate_limit_headers(500))
+    pool = TwitterCredentialsPool(credentials=[busy, idle])
+    assert pool.select_credentials("get_status").access_token == "idle"
+
+    unknown = _make_credentials(access_token="unknown")
+    pool = TwitterCredentialsPool(credentials=[busy, idle, unknown])
+    assert pool.select_credentials("get_status").access_token == "unknown"
+
+
+async def test_twitter_credentials_pool_call_api(twitter_credentials):
+    pool = TwitterCredentialsPool(credentials=[twitter_credentials])
+    assert await pool.call_api("get_status", 42) == 42
+
+
+async def test_twitter_credentials_pool_update_status():
+    pool = TwitterCredentialsPool(credentials=[_make_credentials()])
+    with pytest.raises(ValueError, match="Tweets cannot be posted"):
+        await pool.call_api("update_status", status="Prefect!")
+
+
+async def test_twitter_credentials_pool_get_media_upload_status():
+    pool = TwitterCredentialsPool(credentials=[_make_credentials()])
+    with pytest.raises(ValueError, match="account that uploaded it"):
+        await pool.call_api("get_media_upload_status", 42)
+
+
+def test_twitter_credentials_get_api_app_only():
+    twitter_credentials = _make_credentials(bearer_token="bearer_token")
+    api = twitter_credentials.get_api(app_only=True)
+    assert isinstance(api.auth, OAuth2BearerHandler)
+    assert api is not twitter_credentials.get_api()
+    app_rate_limiter = twitter_credentials.get_rate_limiter(app_only=True)
+    assert app_rate_limiter is not twitter_credentials.get_rate_limiter()
+
+
+@pytest.mark.parametrize(
+    "read_auth_mode,method,app_only",
+    [
+        ("user", "get_status", False),
+        ("app", "get_status", True),
+        ("app", "update_status", False),
+    ],
+)
+async def test_twitter_credentials_call_api_read_auth_mode(
+    monkeypatch, read_auth_mode, method, app_only
+):
+    twitter_credentials = _make_credentials(
+        bearer_token="bearer_token", read_auth_mode=read_auth_mode
+    )
+    calls = []
+    monkeypatch.setattr(
+        TwitterCredentials,
+        "get_api",
+        lambda self, app_only=False: calls.append(app_only) or MagicMock(),
+    )
+    await twitter_credentials.call_api(method)
+    assert calls == [app_only]
+
+
+def test_twitter_credentials_auto_read_auth_mode():
+    twitter_credentials = _make_credentials(
+        bearer_token="bearer_token", read_auth_mode="auto"
+    )
+    user_rate_limiter = twitter_credentials.get_rate_limiter()
+    app_rate_limiter = twitter_credentials.get_rate_limiter(app_only=True)
+    user_rate_limiter.update("statuses/show", _rate_limit_headers(100))
+    app_rate_limiter.update("statuses/show", _rate_limit_headers(300))
+    assert twitter_credentials._use_app_auth("get_status")
+    assert twitter_credentials.get_remaining_calls("get_status") == 400
+    app_rate_limiter.update("statuses/show", _rate_limit_headers(50))
+    assert not twitter_credentials._use_app_auth("get_status")
+
+
+async def test_twitter_credentials_app_auth_requires_bearer_token():
+    twitter_credentials = _make_credentials(read_auth_mode="app")
+    with pytest.raises(ValueError, match="A bearer_token is required"):
+        await twitter_credentials.call_api("get_status", 42)
+
+
+async def test_twitter_credentials_call_api_batch_get_status(monkeypatch):
+    twitter_credentials = _make_credentials(batch_get_status=True)
+    api = MagicMock()
+    api.lookup_statuses.side_effect = lambda ids: [MagicMock(id=i) for i in ids]
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    statuses = await asyncio.gather(
+        *(twitter_credentials.call_api("get_status", i) for i in range(5))
+    )
+    assert [status.id for status in statuses] == list(range(5))
+    api.lookup_statuses.assert_called_once_with([0, 1, 2, 3, 4])
+    api.get_status.assert_not_called()
+
+    await twitter_credentials.call_api("get_status", 5, include_my_retweet=True)
+    api.get_status.assert_called_once_with(5, include_my_retweet=True)
+
+
+async def test_twitter_credentials_call_api_deduplicates(monkeypatch):
+    twitter_credentials = _make_credentials()
+    api = MagicMock()
+    # keep the shared call in flight until every caller has joined it
+    api.get_status.side_effect = lambda *args, **kwargs: time.sleep(0.1)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    await asyncio.gather(
+        twitter_credentials.call_api("get_status", 42),
+        twitter_credentials.call_api("get_status", 42),
+        twitter_credentials.call_api("get_status", 42, trim_user=True),
+    )
+    assert api.get_status.call_count == 2
+
+    await asyncio.gather(
+        _make_credentials(deduplicate_requests=False).call_api("get_status", 42),
+        _make_credentials(deduplicate_requests=False).call_api("get_status", 42),
+    )
+    assert api.get_status.call_count == 4
+
+
+async def test_twitter_credentials_call_api_caches_statuses(monkeypatch):
+    twitter_credentials = _make_credentials(cache_statuses=True)
+    api = MagicMock()
+    api.get_status.side_effect = lambda status_id, **kwargs: MagicMock(id=status_id)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    status = await twitter_credentials.call_api("get_status", 42)
+    assert await twitter_credentials.call_api("get_status", "42") is status
+    assert await twitter_credentials.call_api("get_status", 42, max_retries=0) is (
+        status
+    )
+    await twitter_credentials.call_api("get_status", 42, trim_user=True)
+    assert api.get_status.call_count == 2
+
+    status_cache = twitter_credentials.get_status_cache()
+    assert (status_cache.hits, status_cache.misses) == (2, 2)
+
+    await _make_credentials().call_api("get_status", 42)
+    assert api.get_status.call_count == 3
+
+
+async def test_twitter_credentials_status_cache_expires(monkeypatch):
+    twitter_credentials = _make_credentials(cache_statuses=True, status_cache_ttl=0)
+    api = MagicMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    await twitter_credentials.call_api("get_status", 42)
+    await twitter_credentials.call_api("get_status", 42)
+    assert api.get_status.call_count == 2
+
+
+async def test_twitter_credentials_status_store(monkeypatch, tmp_path):
+    path = str(tmp_path / "statuses.db")
+    api = API()
+    api.get_status = MagicMock(
+        side_effect=lambda status_id: Status.parse(api, {"id": status_id})
+    )
+    api.lookup_statuses = MagicMock(
+        side_effect=lambda ids: [Status.parse(api, {"id": i}) for i in ids]
+    )
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    twitter_credentials = _make_credentials(status_store_path=path)
+    assert (await twitter_credentials.call_api("get_status", 1)).id == 1
+    statuses = await twitter_credentials.call_api("lookup_statuses", [1, 2, 3])
+    assert sorted(status.id for status in statuses) == [1, 2, 3]
+    api.lookup_statuses.assert_called_once_with([2, 3])
+
+    # a new process starts with an empty memory but reads the same database
+    TwitterCredentials.clear_api_cache()
+    twitter_credentials = _make_credentials(status_store_path=path)
+    assert (await twitter_credentials.call_api("get_status", 3)).id == 3
+    statuses = await twitter_credentials.call_api("lookup_statuses", [1, 2])
+    assert [status.id for status in statuses] == [1, 2]
+    assert api.get_status.call_count == 1
+    assert api.lookup_statuses.call_count == 1
+
+
+async def test_twitter_credentials_call_api_raw(monkeypatch, tmp_path):
+    api = MagicMock()
+    api.get_status.side_effect = lambda status_id, parser: {"id": status_id}
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    twitter_credentials = _make_credentials(
+        cache_statuses=True, status_store_path=str(tmp_path / "statuses.db")
+    )
+
+    status = await twitter_credentials.call_api("get_status", 42, raw=True)
+    assert status == {"id": 42}
+    api.get_status.assert_called_once_with(42, parser=get_parser(raw=True))
+    assert await twitter_credentials.call_api("get_status", 42, raw=True) is status
+
+    # raw statuses are stored on disk as they were received
+    TwitterCredentials.clear_api_cache()
+    assert await twitter_credentials.call_api("get_status", 42, raw=True) == status
+    assert api.get_status.call_count == 1
@@ -0,0 +1,82 @@
+import io
+
+import pytest
+from PIL import Image
+
+from prefect_twitter.images import ImageOptions, optimize_image
+
+
+def _encode(image, format="PNG", **kwargs):
+    buffer = io.BytesIO()
+    image.save(buffer, format, **kwargs)
+    return buffer.getvalue()
+
+
+def _noise(size, mode="RGB"):
+    return Image.frombytes(
+        mode, size, bytes(range(256)) * (size[0] * size[1] * len(mode) // 256 + 1)
+    )
+
+
+def test_optimize_image_downsizes_to_longest_edge():
+    content = _encode(Image.new("RGB", (4000, 1000), "red"))
+    with Image.open(io.BytesIO(optimize_image(content))) as image:
+        assert image.format == "JPEG"
+        assert image.size == (2048, 512)
+
+
+def test_optimize_image_keeps_small_images():
+    content = _encode(Image.new("RGB", (300, 200), "red"))
+    with Image.open(io.BytesIO(optimize_image(content))) as image:
+        assert image.size == (300, 200)
+
+
+def test_optimize_image_fits_byte_budget():
+    content = _encode(_noise((1000, 1000)))
+    options = ImageOptions(max_bytes=50000)
+    optimized = optimize_image(content, options)
+    assert len(optimized) <= 50000
+
+
+def test_optimize_image_strips_metadata_and_applies_orientation():
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees clockwise
+    exif[0x010F] = "Camera"
+    content = _encode(Image.new("RGB", (200, 100)), "JPEG", exif=exif)
+    with Image.open(io.BytesIO(optimize_image(content))) as image:
+        assert image.size == (100, 200)
+        assert not image.getexif()
+
+
+def test_optimize_image_webp_keeps_transparency():
+    content = _encode(Image.new("RGBA", (100, 100), (255, 0, 0, 0)))
+    optimized = optimize_image(content, ImageOptions(format="WEBP"))
+    with Image.open(io.BytesIO(optimized)) as image:
+        assert image.format == "WEBP"
+        assert image.mode == "RGBA"
+
+
+def test_optimize_image_flattens_transparency_for_jpeg():
+    content = _encode(Image.new("RGBA", (4000, 10), (255, 0, 0, 0)))
+    with Image.open(io.BytesIO(optimize_image(content))) as image:
+        assert image.mode == "RGB"
+        assert image.getpixel((5, 2)) == (255, 255, 255)
+
+
+def test_optimize_image_impossible_budget():
+    content = _encode(_noise((200, 200)))
+    with pytest.raises(ValueError, match="within 10 bytes"):
+        optimize_image(content, ImageOptions(max_bytes=10))
+
+
+def test_optimize_image_keeps_animations():
+    frames = [Image.new("RGB", (4000, 100), color) for color in ("red", "blue")]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, "PNG", save_all=True, append_images=frames[1:])
+    content = buffer.getvalue()
+    assert optimize_image(content) == content
+
+
+def test_optimize_image_keeps_smaller_originals():
+    content = _encode(Image.new("RGB", (300, 200), "red"))
+    assert optimize_image(content) == content
@@ -1,6 +1,28 @@
+import io
+import subprocess
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import requests
 from prefect import flow
+from tweepy.errors import TweepyException, TwitterServerError
 
-from prefect_twitter.media import get_media_upload_status, media_upload
+from prefect_twitter import TwitterCredentials
+from prefect_twitter.images import ImageOptions
+from prefect_twitter.media import (
+    MediaSource,
+    chunked_upload,
+    clear_media_cache,
+    get_chunk_size,
+    get_content_hash,
+    get_media_upload_status,
+    media_upload,
+    media_upload_many,
+)
 
 
 def test_media_upload(twitter_credentials):
@@ -25,3 +47,362 @@ def test_get_media_upload_status(twitter_credentials):
         return media
 
     assert test_flow() == media_id
+
+
+class ChunkedAPIMock:
+    def __init__(self, failures=()):
+        self.segments = {}
+        self.failures = set(failures)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.statuses = ["in_progress", "succeeded"]
+        self._lock = threading.Lock()
+
+    def chunked_upload_init(self, total_bytes, media_type, **kwargs):
+        self.init = (total_bytes, media_type, kwargs)
+        return MagicMock(media_id=7)
+
+    def chunked_upload_append(self, media_id, media, segment_index):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+            if segment_index in self.failures:
+                self.failures.remove(segment_index)
+                response = requests.Response()
+                response.status_code = 503
+                response._content = b"{}"
+                raise TwitterServerError(response)
+            self.segments[segment_index] = media[1]
+
+    def chunked_upload_finalize(self, media_id):
+        return self.get_media_upload_status(media_id)
+
+    def get_media_upload_status(self, media_id):
+        info = {"state": self.statuses.pop(0), "check_after_secs": 0}
+        return MagicMock(media_id=media_id, processing_info=info)
+
+
+@pytest.fixture
+def chunked_credentials(monkeypatch):
+    api = ChunkedAPIMock(failures={2})
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    credentials = TwitterCredentials(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+        retry_backoff_factor=0,
+    )
+    return credentials, api
+
+
+@pytest.mark.parametrize(
+    "total_bytes,chunk_size,expected",
+    [
+        (10, 1024, 1024),
+        (10, 10 * 1024 * 1024, 5 * 1024 * 1024),
+        (2000 * 1024, 1024, 2048),
+        (0, 1024, 1024),
+    ],
+)
+def test_get_chunk_size(total_bytes, chunk_size, expected):
+    assert get_chunk_size(total_bytes, chunk_size) == expected
+
+
+def test_media_source_maps_files(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"0123456789" * 1000)
+    with MediaSource(path) as source:
+        assert len(source) == 10000
+        segment = source.segment(4095, 4105)
+        assert isinstance(segment, memoryview)
+        assert bytes(segment) == b"5678901234"
+        source.release(4095, 4105)
+        assert bytes(source.segment(4095, 4105)) == b"5678901234"
+        segment.release()
+
+
+def test_media_source_starts_at_file_position(tmp_path):
+    path = tmp_path / "video.mp4"
+    path.write_bytes(b"0123456789")
+    with open(path, "rb") as file:
+        file.seek(4)
+        with MediaSource(path, file) as source:
+            assert bytes(source.segment(0, 3)) == b"456"
+
+    buffer = io.BytesIO(b"0123456789")
+    buffer.seek(6)
+    with MediaSource("video.mp4", buffer) as source:
+        assert bytes(source.segment(0, 10)) == b"6789"
+
+
+def test_media_source_reads_unmappable_files(tmp_path):
+    with MediaSource("video.mp4", io.BufferedReader(io.BytesIO(b"abc"))) as source:
+        assert bytes(source.segment(0, 10)) == b"abc"
+
+    path = tmp_path / "empty.mp4"
+    path.touch()
+    with MediaSource(path) as source:
+        assert len(source) == 0
+
+
+async def test_chunked_upload_appends_segments_concurrently(chunked_credentials):
+    credentials, api = chunked_credentials
+    content = bytes(range(256)) * 40
+    media = await chunked_upload(
+        "video.mp4",
+        credentials,
+        file=io.BytesIO(content),
+        chunk_size=1024,
+        max_concurrent_segments=3,
+        media_category="tweet_video",
+    )
+    assert media.processing_info["state"] == "succeeded"
+    assert api.init == (
+        len(content),
+        "video/mp4",
+        {
+            "media_category": "tweet_video",
+            "additional_owners": None,
+        },
+    )
+    assert sorted(api.segments) == list(range(10))
+    assert b"".join(api.segments[i] for i in range(10)) == content
+    assert 1 < api.max_in_flight <= 3
+
+
+async def test_chunked_upload_raises_segment_errors(chunked_credentials):
+    credentials, api = chunked_credentials
+    api.failures = set(range(10))
+    with pytest.raises(TwitterServerError):
+        await chunked_upload(
+            "video.mp4",
+            credentials,
+            file=io.BytesIO(b"x" * 10240),
+            chunk_size=1024,
+            max_retries=0,
+        )
+    assert not api.segments
+
+
+async def test_chunked_upload_requires_file_type(chunked_credentials):
+    credentials, _ = chunked_credentials
+    with pytest.raises(ValueError, match="MIME type"):
+        await chunked_upload("media", credentials, file=io.BytesIO(b"x"))
+
+
+def test_media_upload_chunks_videos(chunked_credentials, tmp_path):
+    credentials, api = chunked_credentials
+    path = tmp_path / "prefection.mp4"
+    path.write_bytes(b"x" * 5000)
+
+    @flow
+    def test_flow():
+        return media_upload(path, credentials, chunk_size=1024)
+
+    assert test_flow() == 7
+    assert len(api.segments) == 5
+
+
+class UploadAPIMock:
+    def __init__(self):
+        self.uploads = 0
+
+    def media_upload(self, filename, file=None, **kwargs):
+        self.uploads += 1
+        return SimpleNamespace(media_id=self.uploads)
+
+
+@pytest.fixture
+def upload_api(monkeypatch):
+    api = UploadAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    yield api
+    clear_media_cache()
+
+
+def test_get_content_hash_keeps_file_position():
+    file = io.BufferedReader(io.BytesIO(b"logo"))
+    assert get_content_hash("logo.png", file) == get_content_hash(
+        "logo.png", io.BytesIO(b"logo")
+    )
+    assert file.read() == b"logo"
+
+
+def test_media_upload_reuses_media(twitter_credentials, upload_api, tmp_path):
+    path = tmp_path / "logo.png"
+    path.write_bytes(b"logo")
+
+    @flow
+    def test_flow(**kwargs):
+        return media_upload(path, twitter_credentials, reuse_media=True, **kwargs)
+
+    assert test_flow() == 1
+    assert test_flow() == 1
+    assert test_flow(media_category="tweet_gif") == 2
+    path.write_bytes(b"new logo")
+    assert test_flow() == 3
+    assert upload_api.uploads == 3
+
+
+def test_media_upload_reuses_stored_media(
+    twitter_credentials, upload_api, tmp_path, monkeypatch
+):
+    path = tmp_path / "logo.png"
+    path.write_bytes(b"logo")
+    media_cache_path = str(tmp_path / "media.db")
+
+    @flow
+    def test_flow():
+        return media_upload(
+            path,
+            twitter_credentials,
+            reuse_media=True,
+            media_cache_path=media_cache_path,
+        )
+
+    assert test_flow() == 1
+    clear_media_cache()
+    assert test_flow() == 1
+    assert upload_api.uploads == 1
+
+    # media IDs expire after a day, so they are not reused for that long
+    now = time.time()
+    monkeypatch.setattr("prefect_twitter.media.time.time", lambda: now + 86400)
+    monkeypatch.setattr("prefect_twitter.store.time.time", lambda: now + 86400)
+    assert test_flow() == 2
+
+
+class GalleryAPIMock:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def media_upload(self, filename, file=None, **kwargs):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        with self._lock:
+            self.in_flight -= 1
+        if str(filename).startswith("missing"):
+            raise TweepyException("Invalid media")
+        content = file.read() if file is not None else str(filename).encode()
+        return SimpleNamespace(media_id=len(content))
+
+
+def test_media_upload_many(twitter_credentials, monkeypatch):
+    api = GalleryAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        return media_upload_many(
+            ["a.png", ("b.png", io.BytesIO(b"bb")), "missing.png", "dddd.png"],
+            twitter_credentials,
+            max_concurrent_uploads=3,
+        )
+
+    media_ids = test_flow()
+    assert media_ids[:2] == [5, 2]
+    assert isinstance(media_ids[2], TweepyException)
+    assert media_ids[3] == 8
+    assert api.max_in_flight == 3
+
+
+def test_media_upload_many_raise_on_error(twitter_credentials, monkeypatch):
+    api = GalleryAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        return media_upload_many(
+            ["a.png", "missing.png", "dddd.png"],
+            twitter_credentials,
+            raise_on_error=True,
+        )
+
+    with pytest.raises(TweepyException, match="Invalid media"):
+        test_flow()
+
+
+class ImageAPIMock:
+    def media_upload(self, filename, file=None, **kwargs):
+        self.filename, self.content = filename, file.read()
+        return SimpleNamespace(media_id=1)
+
+
+def test_media_upload_optimizes_images(twitter_credentials, monkeypatch):
+    from PIL import Image
+
+    api = ImageAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    buffer = io.BytesIO()
+    Image.new("RGB", (3000, 1000), "red").save(buffer, "PNG")
+    buffer.seek(0)
+
+    @flow
+    def test_flow():
+        return media_upload(
+            "chart.png",
+            twitter_credentials,
+            file=buffer,
+            optimize=ImageOptions(max_edge=300, format="WEBP"),
+        )
+
+    assert test_flow() == 1
+    assert api.filename == "chart.webp"
+    with Image.open(io.BytesIO(api.content)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (300, 100)
+
+
+UNGUARDED_FLOW = """
+import io
+from types import SimpleNamespace
+
+from PIL import Image
+from prefect import flow
+
+from prefect_twitter import TwitterCredentials
+from prefect_twitter.media import media_upload
+
+
+class API:
+    def media_upload(self, filename, file=None, **kwargs):
+        return SimpleNamespace(media_id=len(file.read()))
+
+
+TwitterCredentials.get_api = lambda self, app_only=False: API()
+buffer = io.BytesIO()
+Image.new("RGB", (3000, 1000), "red").save(buffer, "PNG")
+buffer.seek(0)
+
+
+@flow
+def unguarded_flow():
+    twitter_credentials = TwitterCredentials(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+    )
+    return media_upload("chart.png", twitter_credentials, file=buffer, optimize=True)
+
+
+print("media_id", unguarded_flow())
+"""
+
+
+def test_media_upload_optimizes_images_without_main_guard(tmp_path):
+    script = tmp_path / "unguarded_flow.py"
+    script.write_text(UNGUARDED_FLOW)
+    result = subprocess.run(
+        [sys.executable, str(script)], capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.count("media_id") == 1
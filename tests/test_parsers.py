@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from tweepy import API
+from tweepy.errors import TweepyException
+from tweepy.parsers import JSONParser, ModelParser
+
+from prefect_twitter import parsers
+from prefect_twitter.parsers import (
+    OrjsonModelParser,
+    OrjsonParser,
+    get_parser,
+    get_payload_id,
+)
+
+STATUS = {
+    "id": 1504591031626571777,
+    "text": "prefection",
+    "created_at": "Thu Mar 17 23:00:00 +0000 2022",
+    "user": {"id": 42, "screen_name": "PrefectIO"},
+}
+
+
+def test_orjson_model_parser_matches_model_parser():
+    api = API()
+    payload = json.dumps([STATUS, STATUS])
+    expected = ModelParser().parse(
+        payload, api=api, payload_type="status", payload_list=True
+    )
+    statuses = OrjsonModelParser().parse(
+        payload.encode(), api=api, payload_type="status", payload_list=True
+    )
+    assert [status._json for status in statuses] == [
+        status._json for status in expected
+    ]
+    assert statuses[0].author.screen_name == "PrefectIO"
+    assert statuses[0].created_at == expected[0].created_at
+
+
+def test_orjson_parser_matches_json_parser():
+    payload = json.dumps({"ids": [1, 2], "next_cursor": 3, "previous_cursor": 0})
+    assert OrjsonParser().parse(payload, return_cursors=True) == JSONParser().parse(
+        payload, return_cursors=True
+    )
+    assert OrjsonParser().parse("") is None
+
+
+def test_orjson_parser_invalid_payload():
+    with pytest.raises(TweepyException, match="Failed to parse JSON payload"):
+        OrjsonParser().parse("{")
+
+
+def test_get_parser(monkeypatch):
+    assert isinstance(get_parser(), OrjsonModelParser)
+    assert isinstance(get_parser(raw=True), OrjsonParser)
+    assert type(get_parser("json", raw=True)) is JSONParser
+
+    monkeypatch.setattr(parsers, "orjson", None)
+    assert type(get_parser()) is ModelParser
+    with pytest.raises(ImportError, match="orjson is required"):
+        get_parser("orjson")
+
+
+def test_get_payload_id():
+    assert get_payload_id({"id": 1}) == 1
+    assert (
+        get_payload_id(ModelParser().parse(json.dumps(STATUS), payload_type="status"))
+        == STATUS["id"]
+    )
@@ -0,0 +1,91 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from prefect_twitter.rate_limits import (
+    RATE_LIMIT_WINDOW,
+    RateLimiter,
+    endpoint_from_url,
+)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+
+    async def sleep(delay):
+        sleeps.append(delay)
+        monkeypatch.setattr(time, "time", lambda: now + delay + 1)
+
+    now = time.time()
+    monkeypatch.setattr("prefect_twitter.rate_limits.anyio.sleep", sleep)
+    monkeypatch.setattr(time, "time", lambda: now)
+    return sleeps
+
+
+def _headers(limit, remaining, reset):
+    return {
+        "x-rate-limit-limit": str(limit),
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-reset": str(reset),
+    }
+
+
+@pytest.mark.parametrize(
+    "url,endpoint",
+    [
+        ("https://api.twitter.com/1.1/statuses/show.json?id=1", "statuses/show"),
+        ("https://upload.twitter.com/1.1/media/upload.json", "media/upload"),
+        ("https://api.twitter.com/2/tweets", None),
+    ],
+)
+def test_endpoint_from_url(url, endpoint):
+    assert endpoint_from_url(url) == endpoint
+
+
+async def test_rate_limiter_unknown_endpoint(sleeps):
+    rate_limiter = RateLimiter()
+    await rate_limiter.acquire("statuses/show")
+    assert rate_limiter.remaining("statuses/show") is None
+    assert sleeps == []
+
+
+async def test_rate_limiter_takes_tokens(sleeps):
+    rate_limiter = RateLimiter()
+    reset = time.time() + 60
+    rate_limiter.update("statuses/show", _headers(900, 2, reset))
+    await rate_limiter.acquire("statuses/show")
+    await rate_limiter.acquire("statuses/show")
+    assert rate_limiter.remaining("statuses/show") == 0
+    assert sleeps == []
+
+
+async def test_rate_limiter_waits_for_reset(sleeps):
+    rate_limiter = RateLimiter()
+    reset = time.time() + 60
+    rate_limiter.update("statuses/show", _headers(900, 0, reset))
+    await rate_limiter.acquire("statuses/show")
+    assert sleeps == [pytest.approx(60)]
+    assert rate_limiter.remaining("statuses/show") == 899
+
+
+def test_rate_limiter_keeps_in_flight_reservations(sleeps):
+    rate_limiter = RateLimiter()
+    reset = time.time() + 60
+    rate_limiter.update("statuses/show", _headers(900, 10, reset))
+    rate_limiter.update("statuses/show", _headers(900, 20, reset))
+    assert rate_limiter.remaining("statuses/show") == 10
+    rate_limiter.update("statuses/show", _headers(900, 20, reset + RATE_LIMIT_WINDOW))
+    assert rate_limiter.remaining("statuses/show") == 20
+
+
+def test_rate_limiter_update_from_response():
+    rate_limiter = RateLimiter()
+    response = MagicMock(
+        url="https://api.twitter.com/1.1/statuses/update.json",
+        headers=_headers(300, 5, time.time() + 60),
+    )
+    rate_limiter.update_from_response(response)
+    rate_limiter.update_from_response(MagicMock(url="https://api.twitter.com/1.1/x"))
+    assert rate_limiter.remaining("statuses/update") == 5
@@ -0,0 +1,47 @@
+import json
+import pickle
+from datetime import datetime, timezone
+
+from tweepy import API
+from tweepy.parsers import ModelParser
+
+from prefect_twitter.records import Tweet
+
+STATUS = {
+    "id": 1504591031626571777,
+    "full_text": "prefection",
+    "created_at": "Thu Mar 17 23:00:00 +0000 2022",
+    "user": {"id": 42, "screen_name": "PrefectIO"},
+    "retweet_count": 3,
+    "favorite_count": 5,
+    "extended_entities": {
+        "media": [{"id_str": "7", "media_key": "3_7"}, {"id_str": "8"}]
+    },
+}
+
+
+def test_tweet_from_status():
+    expected = Tweet(
+        id=1504591031626571777,
+        text="prefection",
+        author_id=42,
+        created_at=datetime(2022, 3, 17, 23, tzinfo=timezone.utc),
+        retweet_count=3,
+        favorite_count=5,
+        media_keys=("3_7", "8"),
+    )
+    assert Tweet.from_status(STATUS) == expected
+    status = ModelParser().parse(json.dumps(STATUS), api=API(), payload_type="status")
+    assert Tweet.from_status(status) == expected
+
+
+def test_tweet_from_minimal_status():
+    tweet = Tweet.from_status({"id": 1, "text": "hi"})
+    assert tweet == Tweet(id=1, text="hi", author_id=None, created_at=None)
+
+
+def test_tweet_serialization():
+    tweet = Tweet.from_status(STATUS)
+    assert pickle.loads(pickle.dumps(tweet)) == tweet
+    assert Tweet.from_dict(tweet.to_dict()) == tweet
+    assert tweet.to_dict()["created_at"] == "2022-03-17T23:00:00+00:00"
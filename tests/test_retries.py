@@ -0,0 +1,113 @@
+import time
+
+import httpx
+import pytest
+import requests
+from tweepy.errors import NotFound, TooManyRequests, TweepyException, TwitterServerError
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from prefect_twitter.retries import get_backoff_delay, get_retry_delay
+
+
+def _response(status_code, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "reason"
+    response.headers.update(headers or {})
+    response._content = b"{}"
+    return response
+
+
+def _connection_error(cause=None):
+    if cause is None:
+        cause = requests.ConnectionError("Connection reset by peer")
+    try:
+        try:
+            raise cause
+        except Exception as exc:
+            raise TweepyException(f"Failed to send request: {exc}")
+    except TweepyException as exc:
+        return exc
+
+
+def _refused_connection():
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, "/", reason))
+
+
+def test_get_retry_delay_waits_for_rate_limit_reset(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    exc = TooManyRequests(_response(429, {"x-rate-limit-reset": "1030"}))
+    assert get_retry_delay(exc, 0, 1, 60) == 31
+
+
+def test_get_retry_delay_uses_retry_after():
+    exc = TooManyRequests(_response(429, {"retry-after": "5"}))
+    assert get_retry_delay(exc, 0, 1, 60) == 5
+
+
+def test_get_retry_delay_uses_retry_after_date(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1445412480.0)
+    exc = TooManyRequests(
+        _response(429, {"retry-after": "Wed, 21 Oct 2015 07:28:10 GMT"})
+    )
+    assert get_retry_delay(exc, 0, 1, 60) == 10
+
+
+def test_get_retry_delay_ignores_malformed_retry_after(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1000.0)
+    exc = TooManyRequests(
+        _response(429, {"retry-after": "soon", "x-rate-limit-reset": "1030"})
+    )
+    assert get_retry_delay(exc, 0, 1, 60) == 31
+
+
+def test_get_retry_delay_backs_off_without_reset_headers():
+    exc = TooManyRequests(_response(429))
+    assert 0 <= get_retry_delay(exc, 0, 1, 60) <= 1
+
+
+@pytest.mark.parametrize(
+    "exc", [TwitterServerError(_response(503)), _connection_error()]
+)
+def test_get_retry_delay_backs_off(exc):
+    assert 0 <= get_retry_delay(exc, 3, 1, 60) <= 8
+
+
+@pytest.mark.parametrize(
+    "exc", [NotFound(_response(404)), TweepyException("Unexpected parameter")]
+)
+def test_get_retry_delay_not_retryable(exc):
+    assert get_retry_delay(exc, 0, 1, 60) is None
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        TooManyRequests(_response(429)),
+        _connection_error(_refused_connection()),
+        _connection_error(requests.ConnectTimeout("Connect timed out")),
+        _connection_error(httpx.ConnectError("Connection refused")),
+    ],
+)
+def test_get_retry_delay_retries_non_idempotent_before_sending(exc):
+    assert get_retry_delay(exc, 0, 1, 60, idempotent=False) is not None
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        TwitterServerError(_response(503)),
+        _connection_error(),
+        _connection_error(requests.ReadTimeout("Read timed out")),
+        _connection_error(httpx.ReadTimeout("Read timed out")),
+        _connection_error(httpx.RemoteProtocolError("Server disconnected")),
+    ],
+)
+def test_get_retry_delay_not_retryable_non_idempotent(exc):
+    assert get_retry_delay(exc, 0, 1, 60) is not None
+    assert get_retry_delay(exc, 0, 1, 60, idempotent=False) is None
+
+
+def test_get_backoff_delay_capped():
+    assert all(0 <= get_backoff_delay(10, 1, 5) <= 5 for _ in range(100))
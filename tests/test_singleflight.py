@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from prefect_twitter.singleflight import SingleFlight
+
+
+async def test_single_flight_shares_in_flight_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "status"
+
+    single_flight = SingleFlight()
+    results = await asyncio.gather(*(single_flight.do("42", fetch) for _ in range(5)))
+    assert results == ["status"] * 5
+    assert calls == [1]
+    assert len(single_flight) == 0
+
+    await single_flight.do("42", fetch)
+    assert calls == [1, 1]
+
+
+async def test_single_flight_distinct_keys():
+    single_flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0)
+        return value
+
+    results = await asyncio.gather(
+        single_flight.do("1", lambda: fetch(1)), single_flight.do("2", lambda: fetch(2))
+    )
+    assert results == [1, 2]
+
+
+async def test_single_flight_shares_errors():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        raise LookupError("not found")
+
+    single_flight = SingleFlight()
+    results = await asyncio.gather(
+        single_flight.do("42", fetch),
+        single_flight.do("42", fetch),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, LookupError) for result in results)
+
+
+async def test_single_flight_cancelled_caller():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "status"
+
+    single_flight = SingleFlight()
+    first = asyncio.ensure_future(single_flight.do("42", fetch))
+    second = asyncio.ensure_future(single_flight.do("42", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "status"
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,95 @@
+import sys
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+from prefect_twitter.snowflake import (
+    bucket_snowflakes,
+    datetime64_to_snowflakes,
+    datetime_to_snowflake,
+    plan_id_shards,
+    snowflake_to_datetime,
+    snowflakes_in_range,
+    snowflakes_to_datetime64,
+)
+
+
+def test_snowflake_round_trip():
+    created_at = snowflake_to_datetime(1504591031626571777)
+    assert created_at == datetime(2022, 3, 17, 22, 50, 30, 546000, tzinfo=timezone.utc)
+    assert datetime_to_snowflake(created_at) <= 1504591031626571777
+    assert datetime_to_snowflake(created_at + timedelta(milliseconds=1)) > (
+        1504591031626571777
+    )
+    assert datetime_to_snowflake(created_at.replace(tzinfo=None)) == (
+        datetime_to_snowflake(created_at)
+    )
+
+
+def test_plan_id_shards():
+    start = datetime(2022, 3, 17)
+    end = datetime(2022, 3, 18)
+    shards = plan_id_shards(start, end, 4)
+    assert len(shards) == 4
+    assert shards[-1][0] == datetime_to_snowflake(start) - 1
+    assert shards[0][1] == datetime_to_snowflake(end) - 1
+    for (since_id, _), (_, max_id) in zip(shards, shards[1:]):
+        assert since_id == max_id
+    status_id = datetime_to_snowflake(datetime(2022, 3, 17, 7))
+    assert [since < status_id <= top for since, top in shards].count(True) == 1
+
+
+def test_plan_id_shards_invalid():
+    with pytest.raises(ValueError, match="shards must be at least 1"):
+        plan_id_shards(datetime(2022, 3, 17), datetime(2022, 3, 18), 0)
+    with pytest.raises(ValueError, match="end must be after start"):
+        plan_id_shards(datetime(2022, 3, 18), datetime(2022, 3, 17), 1)
+
+
+def test_snowflakes_to_datetime64():
+    status_ids = [1504591031626571777, "1504591031626571778"]
+    created_at = snowflakes_to_datetime64(status_ids)
+    assert created_at.dtype == np.dtype("datetime64[ms]")
+    assert created_at[0] == np.datetime64("2022-03-17T22:50:30.546")
+    assert (
+        datetime64_to_snowflakes(created_at) <= np.array(status_ids, dtype=np.int64)
+    ).all()
+    assert datetime64_to_snowflakes([np.datetime64("2022-03-17T22:50:30.546")])[0] == (
+        datetime_to_snowflake(datetime(2022, 3, 17, 22, 50, 30, 546000))
+    )
+
+
+def test_snowflakes_in_range():
+    start = datetime(2022, 3, 17)
+    end = datetime(2022, 3, 18)
+    status_ids = [
+        datetime_to_snowflake(start) - 1,
+        datetime_to_snowflake(start),
+        datetime_to_snowflake(end) - 1,
+        datetime_to_snowflake(end),
+    ]
+    assert snowflakes_in_range(status_ids, start, end).tolist() == [
+        False,
+        True,
+        True,
+        False,
+    ]
+
+
+def test_bucket_snowflakes():
+    origin = datetime(2022, 3, 17)
+    status_ids = [
+        datetime_to_snowflake(origin + timedelta(minutes=minutes))
+        for minutes in (-1, 0, 59, 60, 150)
+    ]
+    buckets = bucket_snowflakes(status_ids, timedelta(hours=1), origin=origin)
+    assert buckets.tolist() == [-1, 0, 0, 1, 2]
+    with pytest.raises(ValueError, match="width must be at least a millisecond"):
+        bucket_snowflakes(status_ids, timedelta(0))
+
+
+def test_numpy_is_optional(monkeypatch):
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    with pytest.raises(ImportError, match="numpy is required"):
+        snowflakes_to_datetime64([1])
@@ -0,0 +1,51 @@
+import time
+
+from prefect_twitter.store import MediaStore, StatusStore
+
+
+def test_status_store_round_trip(tmp_path):
+    store = StatusStore(str(tmp_path / "statuses.db"))
+    store.put_many("owner", "()", [(1, {"id": 1}), (2, {"id": 2})])
+    assert store.get_many("owner", "()", [1, 2, 3]) == {1: {"id": 1}, 2: {"id": 2}}
+    assert store.get_many("other", "()", [1]) == {}
+    assert store.get_many("owner", "(('trim_user', True),)", [1]) == {}
+    store.close()
+
+    reopened = StatusStore(str(tmp_path / "statuses.db"))
+    assert reopened.get_many("owner", "()", [1]) == {1: {"id": 1}}
+    assert len(reopened) == 2
+
+
+def test_status_store_staleness(tmp_path, monkeypatch):
+    store = StatusStore(str(tmp_path / "statuses.db"), max_age=10)
+    store.put_many("owner", "()", [(1, {"id": 1})])
+    now = time.time()
+    monkeypatch.setattr("prefect_twitter.store.time.time", lambda: now + 11)
+    assert store.get_many("owner", "()", [1]) == {}
+    store.prune()
+    assert len(store) == 0
+
+
+def test_status_store_size_cap(tmp_path):
+    store = StatusStore(str(tmp_path / "statuses.db"), max_entries=2)
+    for status_id in range(3):
+        store.put_many("owner", "()", [(status_id, {"id": status_id})])
+    store.prune()
+    assert sorted(store.get_many("owner", "()", range(3))) == [1, 2]
+
+
+def test_media_store_round_trip_and_expiry(tmp_path, monkeypatch):
+    store = MediaStore(str(tmp_path / "media.db"), max_age=10)
+    store.put("owner", "[]", "hash", 42, uploaded_at=1000.0)
+    monkeypatch.setattr("prefect_twitter.store.time.time", lambda: 1005.0)
+    assert store.get("owner", "[]", "hash") == (42, 1000.0)
+    assert store.get("other", "[]", "hash") is None
+    assert store.get("owner", "[('media_category', 'tweet_gif')]", "hash") is None
+    store.close()
+
+    reopened = MediaStore(str(tmp_path / "media.db"), max_age=10)
+    assert len(reopened) == 1
+    monkeypatch.setattr("prefect_twitter.store.time.time", lambda: 1011.0)
+    assert reopened.get("owner", "[]", "hash") is None
+    reopened.prune()
+    assert len(reopened) == 0
@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+from prefect import flow
+
+from prefect_twitter import TwitterCredentials
+from prefect_twitter.sync import CheckpointStore, get_stream_key, sync_timeline
+
+
+class TimelineAPIMock:
+    def __init__(self, newest):
+        self.newest = newest
+        self.requests = 0
+
+    def mentions_timeline(self, count, since_id=None, max_id=None):
+        self.requests += 1
+        top = self.newest if max_id is None else max_id
+        bottom = max(since_id or 0, top - count)
+        return [MagicMock(id=status_id) for status_id in range(top, bottom, -1)]
+
+
+def test_checkpoint_store(tmp_path):
+    path = str(tmp_path / "state.json")
+    checkpoint_store = CheckpointStore(path)
+    assert checkpoint_store.get("mentions") is None
+    checkpoint_store.set("mentions", {"since_id": 1, "gaps": []})
+    checkpoint_store.set("home", {"since_id": 2, "gaps": []})
+    assert CheckpointStore(path).get("mentions") == {"since_id": 1, "gaps": []}
+    assert sorted(tmp_path.iterdir()) == [
+        tmp_path / "state.json",
+        tmp_path / "state.json.lock",
+    ]
+
+
+def test_checkpoint_store_concurrent_writers(tmp_path):
+    path = str(tmp_path / "state.json")
+    keys = [f"stream{index}" for index in range(16)]
+
+    def write(key):
+        CheckpointStore(path).set(key, {"since_id": 1, "gaps": []})
+
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        list(executor.map(write, keys))
+    checkpoint_store = CheckpointStore(path)
+    assert all(checkpoint_store.get(key) is not None for key in keys)
+
+
+def test_get_stream_key(twitter_credentials):
+    other_credentials = twitter_credentials.copy(update={"access_token": "other"})
+    assert get_stream_key(twitter_credentials, "user", user_id=1) != get_stream_key(
+        twitter_credentials, "user", user_id=2
+    )
+    assert get_stream_key(twitter_credentials, "mentions") != get_stream_key(
+        other_credentials, "mentions"
+    )
+
+
+def test_sync_timeline(twitter_credentials, monkeypatch, tmp_path):
+    api = TimelineAPIMock(newest=5)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    state_path = str(tmp_path / "state.json")
+
+    @flow
+    def test_flow():
+        statuses = sync_timeline(twitter_credentials, state_path=state_path, count=3)
+        return [status.id for status in statuses]
+
+    assert test_flow() == [1, 2, 3, 4, 5]
+    api.newest = 7
+    requests = api.requests
+    assert test_flow() == [6, 7]
+    assert api.requests - requests == 2
+    assert test_flow() == []
+
+
+def test_sync_timeline_gaps(twitter_credentials, monkeypatch, tmp_path):
+    api = TimelineAPIMock(newest=2)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    state_path = str(tmp_path / "state.json")
+
+    @flow
+    def test_flow():
+        statuses = sync_timeline(
+            twitter_credentials, state_path=state_path, count=2, max_pages=2
+        )
+        return [status.id for status in statuses]
+
+    assert test_flow() == [1, 2]
+    api.newest = 12
+    assert test_flow() == [9, 10, 11, 12]
+    key = get_stream_key(twitter_credentials, "mentions")
+    assert CheckpointStore(state_path).get(key) == {"since_id": 12, "gaps": [[2, 8]]}
+
+    # confirming there is nothing newer costs a page, leaving one for the gap
+    api.newest = 13
+    assert test_flow() == [13]
+    assert test_flow() == [7, 8]
+    assert CheckpointStore(state_path).get(key) == {"since_id": 13, "gaps": [[2, 6]]}
+    assert test_flow() == [5, 6]
+    assert test_flow() == [3, 4]
+    assert test_flow() == []
+    assert CheckpointStore(state_path).get(key) == {"since_id": 13, "gaps": []}
+
+
+def test_sync_timeline_no_phantom_gaps(twitter_credentials, monkeypatch, tmp_path):
+    api = TimelineAPIMock(newest=1)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    state_path = str(tmp_path / "state.json")
+
+    @flow
+    def test_flow():
+        statuses = sync_timeline(
+            twitter_credentials, state_path=state_path, max_pages=1
+        )
+        return [status.id for status in statuses]
+
+    assert test_flow() == [1]
+    for newest in range(2, 5):
+        api.newest = newest
+        assert test_flow() == [newest]
+    key = get_stream_key(twitter_credentials, "mentions")
+    assert CheckpointStore(state_path).get(key) == {"since_id": 4, "gaps": []}
@@ -1,7 +1,21 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock
+
 import pytest
-from prefect import flow
+from conftest import APIMock
+from prefect import flow, unmapped
+from tweepy.errors import TweepyException
 
-from prefect_twitter.tweets import get_status, update_status
+from prefect_twitter import TwitterCredentials, TwitterCredentialsPool
+from prefect_twitter.records import Tweet
+from prefect_twitter.tweets import (
+    get_status,
+    get_statuses,
+    stream_timeline,
+    update_status,
+)
 
 
 def test_update_status(twitter_credentials):
@@ -36,6 +50,91 @@ def test_update_status_media(twitter_credentials):
     assert test_flow() == media_ids[0]
 
 
+def test_get_status_mapped_shares_worker_threads(monkeypatch):
+    twitter_credentials = TwitterCredentials(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+        max_worker_threads=1,
+    )
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def fake_get_status(status_id, **kwargs):
+        with lock:
+            running.append(status_id)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(status_id)
+        return status_id
+
+    api = MagicMock()
+    api.get_status.side_effect = fake_get_status
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        futures = get_status.map(range(6), unmapped(twitter_credentials))
+        return [future.result() for future in futures]
+
+    assert test_flow() == list(range(6))
+    assert max(peak) == 1
+
+
+def test_get_status_mapped_batches_lookups(monkeypatch):
+    twitter_credentials = TwitterCredentials(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+        batch_get_status=True,
+        batch_window=0.5,
+    )
+    api = MagicMock()
+    api.lookup_statuses.side_effect = lambda ids, **kwargs: [
+        MagicMock(id=status_id) for status_id in ids
+    ]
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        futures = get_status.map(range(8), unmapped(twitter_credentials))
+        return [future.result().id for future in futures]
+
+    assert test_flow() == list(range(8))
+    api.lookup_statuses.assert_called_once()
+    assert sorted(api.lookup_statuses.call_args.args[0]) == list(range(8))
+    api.get_status.assert_not_called()
+
+
+def test_get_status_mapped_deduplicates_requests(monkeypatch):
+    twitter_credentials = TwitterCredentials(
+        consumer_key="consumer_key",
+        consumer_secret="consumer_secret",
+        access_token="access_token",
+        access_token_secret="access_token_secret",
+    )
+
+    def fake_get_status(status_id, **kwargs):
+        time.sleep(0.5)
+        return status_id
+
+    api = MagicMock()
+    api.get_status.side_effect = fake_get_status
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        futures = get_status.map([42] * 6, unmapped(twitter_credentials))
+        return [future.result() for future in futures]
+
+    assert test_flow() == [42] * 6
+    api.get_status.assert_called_once_with(42)
+
+
 def test_get_status(twitter_credentials):
     status_id = 42
 
@@ -45,3 +144,158 @@ def test_get_status(twitter_credentials):
         return status
 
     assert test_flow() == status_id
+
+
+def test_get_status_credentials_pool(twitter_credentials):
+    status_id = 42
+    pool = TwitterCredentialsPool(credentials=[twitter_credentials])
+
+    @flow
+    def test_flow():
+        status = get_status(status_id, pool)
+        return status
+
+    assert test_flow() == status_id
+
+
+def test_get_statuses(twitter_credentials):
+    status_ids = list(range(1, 251)) + [3]
+
+    @flow
+    def test_flow():
+        statuses = get_statuses(status_ids, twitter_credentials)
+        return statuses
+
+    statuses = test_flow()
+    assert len(statuses) == len(status_ids)
+    for status_id, status in zip(status_ids, statuses):
+        if status_id % 7:
+            assert status.id == status_id
+        else:
+            assert status is None
+
+
+def test_get_statuses_batches(twitter_credentials, monkeypatch):
+    batches = []
+    api = APIMock()
+    lookup_statuses = api.lookup_statuses
+
+    def record_batch(id, **kwargs):
+        batches.append(id)
+        return lookup_statuses(id, **kwargs)
+
+    monkeypatch.setattr(api, "lookup_statuses", record_batch)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        return get_statuses([str(i) for i in range(1, 251)], twitter_credentials)
+
+    test_flow()
+    assert sorted(len(batch) for batch in batches) == [50, 100, 100]
+
+
+def test_get_statuses_raises_batch_errors(twitter_credentials, monkeypatch):
+    api = APIMock()
+    lookup_statuses = api.lookup_statuses
+
+    def fail_batch(id, **kwargs):
+        if 150 in id:
+            raise TweepyException("Invalid batch")
+        return lookup_statuses(id, **kwargs)
+
+    monkeypatch.setattr(api, "lookup_statuses", fail_batch)
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        return get_statuses(list(range(1, 251)), twitter_credentials)
+
+    with pytest.raises(TweepyException, match="Invalid batch"):
+        test_flow()
+
+
+def test_get_statuses_raw(twitter_credentials):
+    @flow
+    def test_flow():
+        return get_statuses([1, 7, 2], twitter_credentials, raw=True)
+
+    assert test_flow() == [{"id": 1}, None, {"id": 2}]
+
+
+def test_get_statuses_compact(twitter_credentials, monkeypatch):
+    api = APIMock()
+    monkeypatch.setattr(
+        api,
+        "lookup_statuses",
+        lambda id, parser: [{"id": status_id, "text": "hi"} for status_id in id],
+    )
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+
+    @flow
+    def test_flow():
+        return get_statuses([1, 2], twitter_credentials, compact=True)
+
+    assert test_flow() == [
+        Tweet(id=1, text="hi", author_id=None, created_at=None),
+        Tweet(id=2, text="hi", author_id=None, created_at=None),
+    ]
+
+
+class TimelineAPIMock:
+    def __init__(self, newest=10):
+        self.newest = newest
+        self.calls = []
+
+    def mentions_timeline(self, count, since_id=None, max_id=None):
+        self.calls.append(max_id)
+        top = self.newest if max_id is None else max_id
+        bottom = max(since_id or 0, top - count)
+        return [MagicMock(id=status_id) for status_id in range(top, bottom, -1)]
+
+
+async def test_stream_timeline(twitter_credentials, monkeypatch):
+    api = TimelineAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    statuses = [
+        status.id
+        async for status in stream_timeline(
+            twitter_credentials, "mentions", count=4, since_id=1
+        )
+    ]
+    assert statuses == list(range(10, 1, -1))
+    assert api.calls == [None, 6, 2, 1]
+
+
+async def test_stream_timeline_prefetches(twitter_credentials, monkeypatch):
+    api = TimelineAPIMock()
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    timeline = stream_timeline(twitter_credentials, "mentions", count=4, max_pages=2)
+    assert (await timeline.__anext__()).id == 10
+    await asyncio.sleep(0.1)
+    assert api.calls == [None, 6]
+    await timeline.aclose()
+
+    statuses = stream_timeline(twitter_credentials, "mentions", count=4, max_pages=2)
+    assert len([status async for status in statuses]) == 8
+
+
+async def test_stream_timeline_compact(twitter_credentials, monkeypatch):
+    api = MagicMock()
+    api.user_timeline.return_value = [{"id": 1, "text": "hi"}]
+    monkeypatch.setattr(TwitterCredentials, "get_api", lambda self, app_only=False: api)
+    statuses = [
+        status
+        async for status in stream_timeline(
+            twitter_credentials, user_id=42, compact=True, max_pages=1
+        )
+    ]
+    assert statuses == [Tweet(id=1, text="hi", author_id=None, created_at=None)]
+    assert api.user_timeline.call_args.kwargs["user_id"] == 42
+
+
+async def test_stream_timeline_credentials_pool(twitter_credentials):
+    pool = TwitterCredentialsPool(credentials=[twitter_credentials])
+    with pytest.raises(ValueError, match="reads the authenticating account"):
+        async for _ in stream_timeline(pool, "home"):
+            pass